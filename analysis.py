@@ -0,0 +1,254 @@
+"""
+Análises de uma GLC, montadas uma vez e compartilhadas pelas fases que
+olham a mesma gramática: anuláveis, geradoras, alcançáveis, úteis, fecho
+das unitárias e fecho dos cantos à esquerda.
+
+Os conjuntos são conjuntos de ids de SYMBOLS. Anuláveis e geradoras usam
+um índice reverso (símbolo -> produções onde aparece) com um contador por
+produção, em tempo linear. As relações entre variáveis (unitárias, cantos
+à esquerda) numeram as variáveis 0..n-1 (posição em `names`) e são
+matrizes booleanas guardadas por linhas em bits (um inteiro Python por
+linha), então "A alcança tudo o que B alcança" é um único OR de linha; os
+fechos condensam o grafo em componentes fortemente conexas e propagam as
+linhas uma vez, em ordem topológica reversa.
+"""
+
+from typing import Dict, List, Optional, Set
+
+from models import GLC, SYMBOLS, EPSILON_ID
+from utils_graph import strongly_connected_components
+
+Symbol = str
+
+
+def iter_bits(bits: int):
+    """Índices dos bits ligados em `bits`, do menor para o maior."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+def transitive_closure(rows: List[int], reflexive: bool = False) -> List[int]:
+    """
+    Fecho transitivo de uma matriz booleana n x n dada por linhas em bits.
+    Cada componente fortemente conexa recebe uma única linha, calculada
+    depois das linhas das componentes que ela alcança.
+    """
+    n = len(rows)
+    successors = {i: list(iter_bits(rows[i])) for i in range(n) if rows[i]}
+    closure = [(1 << i) if reflexive else 0 for i in range(n)]
+    for component in strongly_connected_components(range(n), successors):
+        bits = 0
+        for v in component:
+            bits |= closure[v] | rows[v]
+            for w in successors.get(v, ()):
+                bits |= closure[w]
+        if len(component) > 1:
+            for v in component:
+                bits |= 1 << v
+        for v in component:
+            closure[v] = bits
+    return closure
+
+
+class GrammarAnalysis:
+    """
+    Análises de uma GLC. Variáveis são as declaradas e os lados esquerdos,
+    na ordem de `names` (`ids` e `position` traduzem entre ids e posições).
+    Os resultados são calculados sob demanda e guardados: a gramática não
+    deve mudar depois de montada a análise.
+    """
+
+    def __init__(self, glc: GLC):
+        self._setup(glc.variables, glc.alphabet, glc.start, glc.productions)
+
+    @classmethod
+    def from_productions(cls, productions, start: Symbol = None) -> "GrammarAnalysis":
+        """Análise de uma lista de produções, sem montar uma GLC (alfabeto vazio)."""
+        analysis = cls.__new__(cls)
+        analysis._setup([], [], start, productions)
+        return analysis
+
+    def _setup(self, variables, alphabet, start, productions):
+        ids = [SYMBOLS.intern(v) for v in variables]
+        ids.extend(p.lhs_id for p in productions)
+        self.ids = list(dict.fromkeys(ids))
+        self.names = [SYMBOLS.name(i) for i in self.ids]
+        self.position = {sid: i for i, sid in enumerate(self.ids)}
+        self.start_id: Optional[int] = SYMBOLS.lookup(start) if start is not None else None
+        self.productions = productions
+        self._alphabet = alphabet
+        self._cache: Dict[str, object] = {}
+
+    def _cached(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    # ------------------ Conjuntos (ids) ------------------
+
+    def _counter_closure(self, base_ids: Set[int]) -> Set[int]:
+        """
+        Fecho de ponto fixo com um contador por produção (algoritmo de worklist).
+        Uma variável entra no conjunto assim que alguma produção sua tiver
+        todos os símbolos do corpo em `base_ids` ou já no conjunto.
+        """
+        productions = self.productions
+        remaining = []
+        waiting = {}
+        result = set()
+        worklist = []
+
+        for i, p in enumerate(productions):
+            count = 0
+            for s in p.rhs_ids:
+                if s not in base_ids:
+                    count += 1
+                    waiting.setdefault(s, []).append(i)
+            remaining.append(count)
+            if count == 0 and p.lhs_id not in result:
+                result.add(p.lhs_id)
+                worklist.append(p.lhs_id)
+
+        while worklist:
+            for i in waiting.get(worklist.pop(), ()):
+                remaining[i] -= 1
+                if remaining[i] == 0:
+                    lhs = productions[i].lhs_id
+                    if lhs not in result:
+                        result.add(lhs)
+                        worklist.append(lhs)
+
+        return result
+
+    def nullable(self) -> Set[int]:
+        """Variáveis que derivam & direta ou indiretamente."""
+        return self._cached("nullable", lambda: self._counter_closure({EPSILON_ID}))
+
+    def generating(self) -> Set[int]:
+        """Variáveis que derivam alguma cadeia de terminais."""
+        def compute():
+            base = {SYMBOLS.intern(a) for a in self._alphabet}
+            base.add(EPSILON_ID)
+            return self._counter_closure(base)
+        return self._cached("generating", compute)
+
+    def _reach(self, productions) -> Set[int]:
+        """Símbolos alcançáveis a partir do inicial pelas `productions`."""
+        if self.start_id is None:
+            return set()
+        by_lhs = {}
+        for p in productions:
+            by_lhs.setdefault(p.lhs_id, []).append(p)
+        reached = {self.start_id}
+        stack = [self.start_id]
+        while stack:
+            for p in by_lhs.get(stack.pop(), ()):
+                for s in p.rhs_ids:
+                    if s not in reached:
+                        reached.add(s)
+                        stack.append(s)
+        return reached
+
+    def reachable(self) -> Set[int]:
+        """Símbolos (variáveis e terminais) alcançáveis a partir do inicial."""
+        return self._cached("reachable", lambda: self._reach(self.productions))
+
+    def _useful(self):
+        """
+        Poda em duas etapas: produções de variáveis geradoras cujo corpo só
+        tem terminais, & e geradoras; depois, dessas, as de variáveis
+        alcançáveis a partir do inicial.
+        """
+        generating = self.generating()
+        if self.start_id not in generating:
+            return set(), []
+        allowed = set(generating)
+        allowed.update(SYMBOLS.intern(a) for a in self._alphabet)
+        allowed.add(EPSILON_ID)
+        step1 = [p for p in self.productions
+                 if p.lhs_id in generating and allowed.issuperset(p.rhs_ids)]
+        reached = self._reach(step1)
+        # Todo corpo que sobrou só usa símbolos úteis: basta filtrar pelo lado esquerdo
+        return reached, [p for p in step1 if p.lhs_id in reached]
+
+    def useful(self) -> Set[int]:
+        """Símbolos úteis (variáveis, terminais e &) que sobram da poda."""
+        return self._cached("useful", self._useful)[0]
+
+    def useful_productions(self) -> list:
+        """Produções que sobram da remoção de símbolos inúteis, na ordem original."""
+        return self._cached("useful", self._useful)[1]
+
+    # ------------------ Relações (posições, linhas em bits) ------------------
+
+    @property
+    def start(self) -> Optional[int]:
+        """Posição do inicial, ou None se ele não é variável."""
+        return self.position.get(self.start_id)
+
+    def _first_variable_rows(self, unit_only: bool) -> List[int]:
+        position = self.position
+        rows = [0] * len(self.names)
+        for p in self.productions:
+            rhs = p.rhs_ids
+            if rhs and (len(rhs) == 1 or not unit_only):
+                B = position.get(rhs[0])
+                if B is not None:
+                    rows[position[p.lhs_id]] |= 1 << B
+        return rows
+
+    def unit_rows(self) -> List[int]:
+        """unit[A]: B para cada unitária A -> B."""
+        return self._cached("unit_rows", lambda: self._first_variable_rows(True))
+
+    def left_rows(self) -> List[int]:
+        """left[A]: B para cada A -> B... (B é canto à esquerda de A)."""
+        return self._cached("left_rows", lambda: self._first_variable_rows(False))
+
+    def unit_closure(self) -> List[int]:
+        """Para cada A, as variáveis alcançáveis só com unitárias (incluindo A)."""
+        return self._cached("unit", lambda: transitive_closure(self.unit_rows(), reflexive=True))
+
+    def left_corner_closure(self) -> List[int]:
+        """Para cada A, as variáveis B com A ⇒+ B... (um ou mais passos)."""
+        return self._cached("left", lambda: transitive_closure(self.left_rows()))
+
+    def left_corner_components(self) -> List[List[int]]:
+        """
+        Componentes fortemente conexas do grafo de cantos à esquerda, em
+        ordem topológica da condensação: se A pode começar com B e os dois
+        estão em componentes diferentes, a de A vem antes. A busca começa
+        pelo inicial e segue a ordem de `names`; dentro da componente vale
+        a mesma ordem, com o inicial primeiro.
+        """
+        def compute():
+            start = self.start
+            roots = list(range(len(self.names)))
+            if start is not None:
+                roots.remove(start)
+                roots.insert(0, start)
+            successors = {A: list(iter_bits(row)) for A, row in enumerate(self.left_rows()) if row}
+            components = strongly_connected_components(roots, successors)
+            first = lambda i: (i != start, i)
+            return [sorted(component, key=first) for component in reversed(components)]
+        return self._cached("left_components", compute)
+
+    def left_recursive_bits(self) -> int:
+        """Variáveis com recursão à esquerda (A ⇒+ A...)."""
+        def compute():
+            closure = self.left_corner_closure()
+            return sum(1 << A for A in range(len(self.names)) if closure[A] >> A & 1)
+        return self._cached("left_recursive", compute)
+
+    # ------------------ Nomes ------------------
+
+    def names_of(self, bits: int) -> Set[Symbol]:
+        """Nomes das variáveis numa linha em bits."""
+        return {self.names[i] for i in iter_bits(bits)}
+
+
+def symbol_names(ids) -> Set[Symbol]:
+    """Nomes de um conjunto de ids de SYMBOLS."""
+    return {SYMBOLS.name(i) for i in ids}
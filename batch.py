@@ -0,0 +1,212 @@
+"""
+Processamento em lote: normaliza muitas gramáticas (CNF ou GNF) em paralelo
+com um ProcessPoolExecutor, sem pagar a inicialização do interpretador a
+cada arquivo.
+
+Cada gramática roda isolada em um processo trabalhador com limite de tempo.
+Erros, estouros de tempo ou de orçamento (Budget) e trabalhadores que morrem
+(ex.: falta de memória) viram uma linha de falha no resumo em vez de derrubar
+o lote inteiro.
+"""
+
+import glob
+import json
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from cache import NormalizationCache, cached_normalize
+from models import SYMBOLS
+from parser import create_grammar
+from utils_log import StepLogger, FileSink, LOG_SUMMARY
+from utils_budget import Budget, BudgetExceeded
+
+SUMMARY_FILE = "summary.jsonl"
+
+
+def collect_inputs(spec: str) -> List[str]:
+    """
+    Resolve a entrada do lote:
+    - diretório: todos os .txt dentro dele
+    - padrão glob (contém *, ? ou [): os arquivos que casam
+    - qualquer outro arquivo: manifesto com um caminho por linha
+      (linhas vazias e iniciadas por # são ignoradas; caminhos relativos
+      são relativos ao manifesto)
+    """
+    if os.path.isdir(spec):
+        return sorted(glob.glob(os.path.join(spec, "*.txt")))
+    if any(ch in spec for ch in "*?["):
+        return sorted(p for p in glob.glob(spec) if os.path.isfile(p))
+
+    base = os.path.dirname(os.path.abspath(spec))
+    paths = []
+    with open(spec, "r", encoding="utf-8") as manifest:
+        for line in manifest:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            paths.append(line if os.path.isabs(line) else os.path.join(base, line))
+    return paths
+
+
+def log_names(paths: List[str]) -> List[str]:
+    """
+    Nome do log de cada entrada, sem extensão: o caminho relativo ao
+    diretório comum a todas (a/g.txt e b/g.txt viram a/g e b/g). Uma
+    entrada repetida ganha um sufixo com sua posição no lote.
+    """
+    if not paths:
+        return []
+    absolute = [os.path.abspath(p) for p in paths]
+    base = os.path.commonpath([os.path.dirname(p) for p in absolute])
+    names, seen = [], set()
+    for index, path in enumerate(absolute):
+        name = os.path.splitext(os.path.relpath(path, base))[0]
+        if name in seen:
+            name = f"{name}.{index}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def _on_alarm(signum, frame):
+    raise TimeoutError("tempo limite excedido")
+
+
+def normalize_one(path: str, mode: str, out_dir: str, options: Dict, timeout: Optional[float] = None,
+                  log_level: int = LOG_SUMMARY, cache: Optional[NormalizationCache] = None,
+                  budget: Optional[Budget] = None, log_delta: bool = False,
+                  log_name: Optional[str] = None) -> Dict:
+    """
+    Converte uma gramática e grava seu log em out_dir, como
+    <log_name>.<modo>.log (padrão: o nome do arquivo). Roda no processo
+    trabalhador; nunca levanta exceção, devolve sempre um registro de resumo.
+    O limite de tempo usa SIGALRM (indisponível no Windows, onde é ignorado).
+    Com `cache`, resultados já calculados são lidos do cache em disco.
+    Com `budget`, a conversão é interrompida ao passar dos limites e o
+    registro sai com status "budget" e os detalhes do estouro.
+    Os símbolos da gramática (e os Z, Y, C_n, T_n criados para ela) saem da
+    tabela SYMBOLS ao final, para o trabalhador não acumular os de todo o lote.
+    """
+    with SYMBOLS.scope():
+        return _normalize_one(path, mode, out_dir, options, timeout, log_level, cache, budget, log_delta,
+                              log_name)
+
+
+def _normalize_one(path, mode, out_dir, options, timeout, log_level, cache, budget, log_delta,
+                   log_name) -> Dict:
+    record = {"file": path, "mode": mode}
+    use_alarm = bool(timeout) and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+
+    start = time.perf_counter()
+    try:
+        glc = create_grammar(path)
+        record["productions_in"] = len(glc.productions)
+
+        name = log_name or os.path.splitext(os.path.basename(path))[0]
+        log_path = os.path.join(out_dir, f"{name}.{mode}.log")
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        with FileSink(log_path) as sink:
+            log = StepLogger(sink, log_level, log_delta)
+            result = cached_normalize(glc, mode, options, cache, log, budget=budget)
+
+        record["status"] = "ok"
+        record["log"] = log_path
+        record["productions_out"] = len(result.productions)
+        record["variables_out"] = len(result.variables)
+    except TimeoutError:
+        record["status"] = "timeout"
+        record["error"] = f"excedeu {timeout}s"
+    except BudgetExceeded as e:
+        record["status"] = "budget"
+        record["error"] = str(e)
+        record["budget"] = e.to_dict()
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+def _run_pool(entries, workers, mode, out_dir, options, timeout, log_level, log_delta, cache, budget, emit):
+    """
+    Roda um conjunto de pares (arquivo, nome do log) em um pool; devolve
+    os pares que perderam o trabalhador.
+    """
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(normalize_one, path, mode, out_dir, options, timeout, log_level, cache, budget,
+                        log_delta, name): (path, name)
+            for path, name in entries
+        }
+        for future in as_completed(futures):
+            try:
+                emit(future.result())
+            except BrokenProcessPool:
+                broken.append(futures[future])
+    return broken
+
+
+def run_batch(spec: str, mode: str, out_dir: str, workers: Optional[int] = None,
+              timeout: Optional[float] = None, options: Optional[Dict] = None,
+              log_level: int = LOG_SUMMARY, cache: Optional[NormalizationCache] = None,
+              budget: Optional[Budget] = None, log_delta: bool = False) -> List[Dict]:
+    """
+    Normaliza todas as gramáticas de `spec` (ver collect_inputs).
+
+    Cada resultado é acrescentado a out_dir/summary.jsonl assim que termina.
+    Se um trabalhador morrer, o pool é refeito e os arquivos afetados são
+    reexecutados, cada um sozinho, para isolar o culpado, que é registrado
+    com status "crashed". O `cache` é compartilhado entre os trabalhadores
+    (as escritas são atômicas). O `budget` vale para cada gramática.
+    Os logs seguem o caminho relativo de cada entrada (ver log_names).
+    """
+    if mode not in ("cnf", "gnf"):
+        raise ValueError(f"Modo inválido: {mode}")
+    options = dict(options or {})
+    os.makedirs(out_dir, exist_ok=True)
+    paths = collect_inputs(spec)
+    entries = list(zip(paths, log_names(paths)))
+    records = []
+
+    with open(os.path.join(out_dir, SUMMARY_FILE), "w", encoding="utf-8") as summary:
+        def emit(record):
+            records.append(record)
+            summary.write(json.dumps(record, ensure_ascii=False) + "\n")
+            summary.flush()
+
+        broken = _run_pool(entries, workers, mode, out_dir, options, timeout, log_level, log_delta, cache,
+                           budget, emit)
+
+        # Reexecuta isoladamente o que estava no pool que quebrou
+        for path, name in broken:
+            if _run_pool([(path, name)], 1, mode, out_dir, options, timeout, log_level, log_delta, cache,
+                         budget, emit):
+                emit({"file": path, "mode": mode, "status": "crashed",
+                      "error": "o processo trabalhador terminou inesperadamente"})
+
+    return records
+
+
+def summarize(records: List[Dict]) -> str:
+    """Resumo em texto: contagens por status, tempo total e falhas."""
+    ok = [r for r in records if r["status"] == "ok"]
+    failed = [r for r in records if r["status"] != "ok"]
+    total_time = sum(r.get("seconds", 0) for r in records)
+    lines = [
+        f"Gramáticas: {len(records)}  ok: {len(ok)}  falhas: {len(failed)}",
+        f"Tempo somado: {total_time:.3f}s",
+    ]
+    for r in failed:
+        lines.append(f"  [{r['status']}] {r['file']}: {r.get('error', '')}")
+    return "\n".join(lines)
@@ -0,0 +1,354 @@
+"""
+Benchmark das conversões CNF e GNF sobre famílias de gramáticas sintéticas.
+
+Cada família é gerada de forma determinística a partir de uma semente e de
+um parâmetro de tamanho. Para cada caso são medidos, por fase do pipeline,
+o tempo de parede, o pico de memória (tracemalloc) e o número de produções
+e variáveis na saída da fase, a partir do PipelineMetrics dos pipelines. Os resultados podem ser salvos como linha de
+base e comparados depois para detectar regressões.
+
+Uso:
+    python benchmark.py [--preset quick|full] [--family nome ...] [--mode cnf|gnf ...]
+                        [--epsilon classic|bin] [--binarize chain|shared]
+                        [--gnf-method classic|rosenkrantz] [--compare-gnf-methods]
+                        [--save-baseline base.json] [--compare base.json]
+                        [--no-memory] [--output bench_output.txt]
+
+Com --compare-gnf-methods, os casos de GNF rodam com cada método de
+construção (gnf.GNF_METHODS) e o relatório traz tempo e tamanho da saída
+lado a lado.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Dict, List, Optional
+
+from models import GLC, Production
+from cnf import cnf_from_glc, EPSILON_MODES, BINARIZE_MODES
+from gnf import gnf_from_glc, GNF_METHODS
+from utils_metrics import PipelineMetrics
+
+
+# ------------------ Geradores ------------------
+
+def _var(i: int) -> str:
+    return f"V{i}"
+
+
+def _terminals(k: int) -> List[str]:
+    return [f"t{i}" for i in range(k)]
+
+
+def _grammar(variables, alphabet, productions) -> GLC:
+    return GLC(variables, alphabet, variables[0], productions)
+
+
+def gen_many_variables(n: int, seed: int = 0) -> GLC:
+    """n variáveis, cada uma com poucos corpos curtos e aleatórios."""
+    rng = random.Random(seed)
+    variables = [_var(i) for i in range(n)]
+    alphabet = _terminals(4)
+    prods = []
+    for v in variables:
+        for _ in range(2):
+            body = [rng.choice(variables + alphabet) for _ in range(rng.randint(1, 3))]
+            prods.append(Production(v, body))
+        prods.append(Production(v, [rng.choice(alphabet)]))
+    return _grammar(variables, alphabet, prods)
+
+
+def gen_long_rhs(n: int, seed: int = 0) -> GLC:
+    """Poucas variáveis com corpos de tamanho n, misturando variáveis e terminais."""
+    rng = random.Random(seed)
+    variables = [_var(i) for i in range(6)]
+    alphabet = _terminals(3)
+    prods = []
+    for v in variables:
+        for _ in range(3):
+            prods.append(Production(v, [rng.choice(variables + alphabet) for _ in range(n)]))
+        prods.append(Production(v, [rng.choice(alphabet)]))
+    return _grammar(variables, alphabet, prods)
+
+
+def gen_dense_nullable(n: int, seed: int = 0) -> GLC:
+    """Corpos com n variáveis anuláveis (pior caso 2^n da remoção de vazias)."""
+    rng = random.Random(seed)
+    nullable = [_var(i) for i in range(1, 5)]
+    variables = [_var(0)] + nullable
+    alphabet = _terminals(4)
+    prods = []
+    for v, a in zip(nullable, alphabet):
+        prods.append(Production(v, [a]))
+        prods.append(Production(v, ["&"]))
+    for _ in range(3):
+        prods.append(Production(variables[0], [rng.choice(nullable) for _ in range(n)]))
+    return _grammar(variables, alphabet, prods)
+
+
+def gen_unit_chain(n: int, seed: int = 0) -> GLC:
+    """Cadeia de unitárias de profundidade n, com ciclos e atalhos aleatórios."""
+    rng = random.Random(seed)
+    variables = [_var(i) for i in range(n)]
+    alphabet = _terminals(4)
+    prods = []
+    for i, v in enumerate(variables):
+        if i + 1 < n:
+            prods.append(Production(v, [variables[i + 1]]))
+        if rng.random() < 0.2:
+            prods.append(Production(v, [rng.choice(variables[:i + 1])]))
+        prods.append(Production(v, [rng.choice(alphabet), rng.choice(variables)]))
+        prods.append(Production(v, [rng.choice(alphabet)]))
+    return _grammar(variables, alphabet, prods)
+
+
+def gen_left_recursive(n: int, seed: int = 0) -> GLC:
+    """n variáveis com recursão à esquerda direta e indireta (Vi -> Vj ... para j >= i)."""
+    rng = random.Random(seed)
+    variables = [_var(i) for i in range(n)]
+    alphabet = _terminals(3)
+    prods = []
+    for i, v in enumerate(variables):
+        prods.append(Production(v, [v, rng.choice(alphabet)]))
+        j = rng.randint(i, n - 1)
+        prods.append(Production(v, [variables[j], rng.choice(variables)]))
+        prods.append(Production(v, [rng.choice(alphabet)]))
+    # Fecha ciclos indiretos de volta para o início
+    prods.append(Production(variables[-1], [variables[0], rng.choice(alphabet)]))
+    return _grammar(variables, alphabet, prods)
+
+
+FAMILIES = {
+    "many-variables": gen_many_variables,
+    "long-rhs": gen_long_rhs,
+    "dense-nullable": gen_dense_nullable,
+    "unit-chain": gen_unit_chain,
+    "left-recursive": gen_left_recursive,
+}
+
+# Tamanhos por família. A GNF recebe tamanhos menores: em many-variables,
+# por exemplo, 30 variáveis já esgotam a memória na substituição de volta.
+PRESETS = {
+    "quick": {
+        "cnf": {"many-variables": [50, 200], "long-rhs": [10, 40], "dense-nullable": [6, 10],
+                "unit-chain": [50, 200], "left-recursive": [20, 80]},
+        "gnf": {"many-variables": [8, 12], "long-rhs": [4, 8], "dense-nullable": [4, 8],
+                "unit-chain": [20, 80], "left-recursive": [10, 40]},
+    },
+    "full": {
+        "cnf": {"many-variables": [100, 500, 2000], "long-rhs": [20, 100, 400],
+                "dense-nullable": [8, 12, 14], "unit-chain": [100, 500, 2000],
+                "left-recursive": [50, 200, 800]},
+        "gnf": {"many-variables": [12, 16, 22], "long-rhs": [8, 12, 16],
+                "dense-nullable": [6, 8, 10], "unit-chain": [40, 80, 150],
+                "left-recursive": [20, 50, 100]},
+    },
+}
+
+
+# ------------------ Medição ------------------
+
+def _run_pipeline(glc: GLC, mode: str, options: Dict, track_memory: bool) -> List[Dict]:
+    """
+    Fases de uma conversão, lidas do PipelineMetrics do próprio pipeline
+    (na GNF, inclusive as fases da CNF interna).
+    """
+    metrics = PipelineMetrics(track_memory)
+    if mode == "cnf":
+        cnf_from_glc(glc, None, metrics=metrics, **options)
+    else:
+        gnf_from_glc(glc, None, metrics=metrics, **options)
+
+    phases = []
+    for record in metrics.phases:
+        entry = {
+            "phase": record["phase"],
+            "seconds": record["seconds"],
+            "productions": record["productions_out"],
+            "variables": record["variables_out"],
+        }
+        if "peak_kb" in record:
+            entry["peak_kb"] = record["peak_kb"]
+        phases.append(entry)
+    return phases
+
+
+def run_case(family: str, size: int, mode: str, options: Optional[Dict] = None,
+             seed: int = 0, track_memory: bool = True) -> Dict:
+    """
+    Mede uma gramática da família. Tempos vêm de uma execução sem
+    tracemalloc (que distorce o tempo); o pico de memória, de uma segunda.
+    """
+    options = dict(options or {})
+    glc = FAMILIES[family](size, seed)
+    start = time.perf_counter()
+    phases = _run_pipeline(glc, mode, options, False)
+    total = time.perf_counter() - start
+
+    if track_memory:
+        for entry, mem in zip(phases, _run_pipeline(glc, mode, options, True)):
+            entry["peak_kb"] = mem["peak_kb"]
+
+    return {
+        "family": family, "size": size, "mode": mode, "seed": seed, "options": options,
+        "productions_in": len(glc.productions), "seconds": total, "phases": phases,
+    }
+
+
+def run_suite(preset: str = "quick", families=None, modes=("cnf", "gnf"), options=None,
+              seed: int = 0, track_memory: bool = True, progress=None,
+              gnf_method: str = "classic") -> List[Dict]:
+    results = []
+    for mode in modes:
+        # O método de GNF só vale para os casos de GNF
+        mode_options = dict(options or {}, gnf_method=gnf_method) if mode == "gnf" else options
+        for family, sizes in PRESETS[preset][mode].items():
+            if families and family not in families:
+                continue
+            for size in sizes:
+                result = run_case(family, size, mode, mode_options, seed, track_memory)
+                results.append(result)
+                if progress:
+                    progress(result)
+    return results
+
+
+def run_gnf_methods(preset: str = "quick", families=None, options=None, seed: int = 0,
+                    progress=None) -> List[Dict]:
+    """Roda cada caso de GNF do preset com todos os métodos de GNF_METHODS."""
+    rows = []
+    for family, sizes in PRESETS[preset]["gnf"].items():
+        if families and family not in families:
+            continue
+        for size in sizes:
+            row = {"family": family, "size": size, "methods": {}}
+            for method in GNF_METHODS:
+                case_options = dict(options or {}, gnf_method=method)
+                result = run_case(family, size, "gnf", case_options, seed, track_memory=False)
+                row["methods"][method] = {
+                    "seconds": result["seconds"],
+                    "productions": result["phases"][-1]["productions"],
+                    "variables": result["phases"][-1]["variables"],
+                }
+            rows.append(row)
+            if progress:
+                progress(row)
+    return rows
+
+
+# ------------------ Relatório e comparação ------------------
+
+def _case_key(r: Dict) -> str:
+    return f"{r['mode']}/{r['family']}/{r['size']}"
+
+
+def format_results(results: List[Dict]) -> str:
+    lines = [f"{'caso':32} {'fase':20} {'tempo(s)':>10} {'pico(KB)':>10} {'produções':>10} {'variáveis':>10}"]
+    for r in results:
+        for p in r["phases"]:
+            peak = p.get("peak_kb", "-")
+            lines.append(f"{_case_key(r):32} {p['phase']:20} {p['seconds']:10.4f} {peak!s:>10} "
+                         f"{p['productions']:10d} {p['variables']:10d}")
+        lines.append(f"{_case_key(r):32} {'total':20} {r['seconds']:10.4f}")
+    return "\n".join(lines)
+
+
+def format_gnf_methods(rows: List[Dict]) -> str:
+    header = f"{'caso':24}"
+    for method in GNF_METHODS:
+        header += f" {method + ' tempo(s)':>22} {method + ' produções':>22}"
+    lines = [header]
+    for row in rows:
+        line = f"{row['family'] + '/' + str(row['size']):24}"
+        for method in GNF_METHODS:
+            m = row["methods"][method]
+            line += f" {m['seconds']:22.4f} {m['productions']:22d}"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def compare(results: List[Dict], baseline: List[Dict], time_ratio: float = 1.5,
+            min_seconds: float = 0.01) -> List[str]:
+    """
+    Regressões em relação à linha de base: fase com tempo maior que
+    time_ratio vezes o anterior (ignorando fases abaixo de min_seconds) ou
+    com número de produções diferente.
+    """
+    previous = {(_case_key(r), p["phase"]): p for r in baseline for p in r["phases"]}
+    problems = []
+    for r in results:
+        for p in r["phases"]:
+            old = previous.get((_case_key(r), p["phase"]))
+            if old is None:
+                continue
+            name = f"{_case_key(r)} [{p['phase']}]"
+            if p["productions"] != old["productions"]:
+                problems.append(f"{name}: produções {old['productions']} -> {p['productions']}")
+            if p["seconds"] >= min_seconds and p["seconds"] > time_ratio * max(old["seconds"], min_seconds):
+                problems.append(f"{name}: tempo {old['seconds']:.4f}s -> {p['seconds']:.4f}s")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark das conversões CNF/GNF")
+    parser.add_argument("--preset", choices=list(PRESETS), default="quick")
+    parser.add_argument("--family", action="append", choices=list(FAMILIES), help="restringe às famílias dadas")
+    parser.add_argument("--mode", action="append", choices=["cnf", "gnf"], help="restringe aos modos dados")
+    parser.add_argument("--epsilon", choices=EPSILON_MODES, default="classic")
+    parser.add_argument("--binarize", choices=BINARIZE_MODES, default="chain")
+    parser.add_argument("--gnf-method", choices=GNF_METHODS, default="classic")
+    parser.add_argument("--compare-gnf-methods", action="store_true",
+                        help="compara tempo e tamanho da GNF entre os métodos de construção")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="não mede o pico de memória")
+    parser.add_argument("--output", default="bench_output.txt", help="relatório em texto")
+    parser.add_argument("--save-baseline", default=None, help="salva os resultados em JSON")
+    parser.add_argument("--compare", default=None, help="compara com uma linha de base em JSON")
+    parser.add_argument("--time-ratio", type=float, default=1.5, help="limite de piora de tempo na comparação")
+    args = parser.parse_args(argv)
+
+    options = {"epsilon_mode": args.epsilon, "binarize_mode": args.binarize}
+
+    if args.compare_gnf_methods:
+        rows = run_gnf_methods(args.preset, args.family, options, args.seed,
+                               progress=lambda r: print(f"{r['family']}/{r['size']}", flush=True))
+        report = format_gnf_methods(rows)
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(report)
+        print(f"Relatório salvo em {args.output}")
+        return 0
+
+    results = run_suite(
+        args.preset, args.family, args.mode or ("cnf", "gnf"), options, args.seed, not args.no_memory,
+        progress=lambda r: print(f"{_case_key(r):32} {r['seconds']:.4f}s", flush=True),
+        gnf_method=args.gnf_method,
+    )
+
+    report = format_results(results)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(report + "\n")
+    print(f"Relatório salvo em {args.output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=1)
+        print(f"Linha de base salva em {args.save_baseline}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        problems = compare(results, baseline, args.time_ratio)
+        if problems:
+            print("Regressões:")
+            for line in problems:
+                print("  " + line)
+            return 1
+        print("Sem regressões em relação à linha de base.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
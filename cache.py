@@ -0,0 +1,231 @@
+"""
+Cache em disco dos resultados de normalização, endereçado pelo conteúdo.
+
+A chave é um hash canônico da GLC já lida (variáveis, alfabeto e produções
+ordenados, mais o símbolo inicial) junto com o modo (cnf/gnf) e as opções,
+então arquivos com formatação ou ordem de regras diferentes, mas com a
+mesma gramática, compartilham a entrada. A chave inclui CACHE_VERSION, de
+modo que uma mudança nos algoritmos não serve resultados antigos. O
+resultado é guardado como JSON compactado com zlib; a remoção é LRU (pelo
+mtime) com limite de tamanho.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import zlib
+from typing import Dict, Optional
+
+from models import GLC, Production, SYMBOLS
+from cnf import cnf_from_glc
+from gnf import gnf_from_glc
+from utils_log import log_step, LOG_SUMMARY
+from utils_metrics import metrics_start, metrics_finish, metrics_phase
+
+CACHE_SUFFIX = ".glc.z"
+TMP_SUFFIX = ".tmp"
+
+# Versão dos pipelines: aumente sempre que uma mudança em cnf.py/gnf.py
+# alterar a saída para a mesma entrada e opções
+CACHE_VERSION = 3
+
+# Arquivos .tmp mais velhos que isso são sobras de escritas interrompidas
+# (ex.: timeout do lote no meio do put) e são apagados na remoção
+TMP_MAX_AGE = 600
+
+# A remoção LRU desce até esta fração do limite, para não varrer o
+# diretório de novo a cada put logo acima dele
+EVICT_TARGET = 0.9
+
+
+def canonical_hash(glc: GLC, mode: str, options: Optional[Dict] = None) -> str:
+    """Hash SHA-256 da gramática em forma canônica + modo + opções + versão."""
+    productions = sorted({(p.lhs, tuple(p.rhs)) for p in glc.productions})
+    canonical = {
+        "version": CACHE_VERSION,
+        "variables": sorted(set(glc.variables)),
+        "alphabet": sorted(set(glc.alphabet)),
+        "start": glc.start,
+        "productions": productions,
+        "mode": mode,
+        "options": sorted((options or {}).items()),
+    }
+    data = json.dumps(canonical, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def serialize_grammar(glc: GLC) -> bytes:
+    """GLC -> JSON compacto (símbolos numerados localmente) comprimido."""
+    symbols = {}
+
+    def sid(s):
+        if s not in symbols:
+            symbols[s] = len(symbols)
+        return symbols[s]
+
+    data = {
+        "v": [sid(v) for v in glc.variables],
+        "a": [sid(a) for a in glc.alphabet],
+        "s": sid(glc.start),
+        "p": [[sid(p.lhs)] + [sid(s) for s in p.rhs] for p in glc.productions],
+    }
+    data["t"] = list(symbols)
+    return zlib.compress(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize_grammar(blob: bytes) -> GLC:
+    data = json.loads(zlib.decompress(blob).decode("utf-8"))
+    names = data["t"]
+    # Numeração local -> ids da tabela global, uma vez por símbolo
+    ids = [SYMBOLS.intern(n) for n in names]
+    return GLC(
+        [names[i] for i in data["v"]],
+        [names[i] for i in data["a"]],
+        names[data["s"]],
+        [Production.from_ids(ids[row[0]], tuple([ids[i] for i in row[1:]])) for row in data["p"]],
+    )
+
+
+class NormalizationCache:
+    """
+    Diretório de resultados, um arquivo por chave, com remoção LRU.
+
+    O tamanho total é lido do diretório uma vez e depois mantido a cada
+    put; o diretório só é varrido de novo quando o total passa do limite.
+    Com vários processos, cada um conta só as próprias escritas até a
+    próxima varredura, que corrige o total.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._total = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_SUFFIX)
+
+    def get(self, key: str) -> Optional[GLC]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            glc = deserialize_grammar(blob)
+        except (ValueError, KeyError, IndexError, zlib.error):
+            # Entrada corrompida: descarta e trata como ausente
+            self._remove(path, len(blob))
+            return None
+        # Marca como usada recentemente
+        try:
+            os.utime(path, None)
+        except FileNotFoundError:
+            pass
+        return glc
+
+    def put(self, key: str, glc: GLC):
+        blob = serialize_grammar(glc)
+        path = self._path(key)
+        if self._total is None:
+            self._total = self._scan()[1]
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+
+        # Escrita atômica: vários processos podem usar o mesmo cache. Se a
+        # escrita for interrompida (ex.: SIGALRM do lote), o .tmp é apagado
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=TMP_SUFFIX)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+        except BaseException:
+            self._remove(tmp)
+            raise
+
+        self._total += len(blob) - replaced
+        if self._total > self.max_bytes:
+            self.evict()
+
+    def _scan(self):
+        """Entradas (mtime, tamanho, caminho) e total; apaga .tmp abandonados."""
+        entries = []
+        total = 0
+        stale = time.time() - TMP_MAX_AGE
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.endswith(TMP_SUFFIX):
+                try:
+                    if os.stat(path).st_mtime < stale:
+                        os.remove(path)
+                except FileNotFoundError:
+                    pass
+                continue
+            if not name.endswith(CACHE_SUFFIX):
+                continue
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        return entries, total
+
+    def evict(self):
+        """Remove as entradas menos usadas até caber em max_bytes (com folga)."""
+        entries, total = self._scan()
+        if total > self.max_bytes:
+            target = self.max_bytes * EVICT_TARGET
+            entries.sort()
+            for _, size, path in entries:
+                if total <= target:
+                    break
+                self._remove(path)
+                total -= size
+        self._total = total
+
+    def _remove(self, path: str, size: int = 0):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        if self._total is not None:
+            self._total -= size
+
+
+def cached_normalize(glc: GLC, mode: str, options: Optional[Dict] = None,
+                     cache: Optional[NormalizationCache] = None, log=None, metrics=None, budget=None) -> GLC:
+    """
+    Converte `glc` para CNF ou GNF consultando o cache antes. Em caso de
+    acerto a conversão não roda, o log recebe só a gramática do cache e
+    `metrics` registra uma única fase "cache". O `budget` só vale para a
+    conversão (resultados que estouraram o limite nunca chegam ao cache).
+    """
+    if mode not in ("cnf", "gnf"):
+        raise ValueError(f"Modo inválido: {mode}")
+    options = dict(options or {})
+
+    key = None
+    if cache is not None:
+        key = canonical_hash(glc, mode, options)
+        hit = cache.get(key)
+        if hit is not None:
+            log_step(log, "Resultado recuperado do cache", hit, LOG_SUMMARY)
+            metrics_start(metrics, glc)
+            metrics_phase(metrics, "cache", hit)
+            metrics_finish(metrics, hit)
+            return hit
+
+    if mode == "cnf":
+        result = cnf_from_glc(glc, log, metrics=metrics, budget=budget, **options)
+    else:
+        result = gnf_from_glc(glc, log, metrics=metrics, budget=budget, **options)
+
+    if cache is not None:
+        cache.put(key, result)
+    return result
@@ -6,14 +6,30 @@ Realiza as etapas:
 3. Binarização de produções longas
 """
 
-from models import GLC, Production
+from models import GLC, Production, SYMBOLS, EPSILON_ID
 from parser import create_grammar
-from utils_log import log_step
+from utils_log import log_step, LOG_SUMMARY
+from utils_metrics import metrics_start, metrics_finish, metrics_phase
+from utils_budget import budget_start, budget_finish, budget_check, budget_check_estimate, budget_check_running
+from analysis import GrammarAnalysis, iter_bits, symbol_names
 from itertools import combinations
+from typing import List, Set
 
 Symbol = str
 
-def convert_to_cnf(src_file: str, log: list):
+# Modos de remoção de vazias:
+# "classic" -> expande todas as combinações de anuláveis (2^k por corpo)
+# "bin"     -> binariza antes (BIN antes de DEL), saída linear
+EPSILON_MODES = ("classic", "bin")
+
+# Modos de binarização:
+# "chain"  -> uma cadeia C_n nova para cada produção longa
+# "shared" -> cada sufixo distinto ganha uma única variável
+BINARIZE_MODES = ("chain", "shared")
+
+
+def convert_to_cnf(src_file: str, log: list, epsilon_mode: str = "classic", binarize_mode: str = "chain",
+                   metrics=None, budget=None):
     """
     Controlador principal que lê o arquivo, aplica as transformações CNF
     e registra os passos no log.
@@ -21,70 +37,146 @@ def convert_to_cnf(src_file: str, log: list):
     Args:
         src_file (str): Caminho do arquivo de entrada.
         log (list): Lista para armazenar o log de execução.
+        epsilon_mode (str): "classic" ou "bin" (ver EPSILON_MODES).
+        binarize_mode (str): "chain" ou "shared" (ver BINARIZE_MODES).
+        metrics (PipelineMetrics): coletor opcional de métricas por fase.
+        budget (Budget): limites opcionais; ao passar de um, BudgetExceeded.
     """
-    
     glc = create_grammar(src_file)
-    log_step(log, "Gramática Original", glc)
+    return cnf_from_glc(glc, log, epsilon_mode, binarize_mode, metrics, budget)
+
 
-    new_prods = remove_empty_productions(glc.productions)
-    glc.productions = remove_duplicate_productions(new_prods)
+def cnf_from_glc(glc: GLC, log, epsilon_mode: str = "classic", binarize_mode: str = "chain",
+                 metrics=None, budget=None) -> GLC:
+    """
+    Aplica as transformações CNF a uma gramática já carregada em memória.
+    A gramática recebida não é alterada. Com log=None nada é registrado;
+    com metrics=None nada é medido; com budget=None nada é limitado.
+    """
+    if epsilon_mode not in EPSILON_MODES:
+        raise ValueError(f"Modo de remoção de vazias inválido: {epsilon_mode}")
+    if binarize_mode not in BINARIZE_MODES:
+        raise ValueError(f"Modo de binarização inválido: {binarize_mode}")
+    share_suffixes = binarize_mode == "shared"
+
+    log_step(log, "Gramática Original", glc, LOG_SUMMARY)
+    metrics_start(metrics, glc)
+    budget_start(budget, glc)
+
+    # Poda antes das vazias: a expansão 2^k não chega a ver as inúteis.
+    # A poda não muda quem é anulável entre as variáveis que ficam, então
+    # a mesma análise serve à remoção clássica de vazias
+    analysis = GrammarAnalysis(glc)
+    glc = remove_useless_symbols(glc, analysis)
+    log_step(log, "Após remoção inicial de símbolos inúteis", glc)
+    metrics_phase(metrics, "useless-initial", glc)
+
+    if epsilon_mode == "bin":
+        glc = remove_empty_productions_binarized(glc, share_suffixes, budget)
+    else:
+        # A expansão clássica é exponencial: estima a saída antes de rodar
+        nullable = analysis.nullable()
+        budget_check_estimate(budget, "epsilon", glc, estimate_empty_expansion(glc, nullable))
+        new_prods = remove_empty_productions(glc.productions, glc.start, nullable)
+        glc = GLC(glc.variables, glc.alphabet, glc.start, remove_duplicate_productions(new_prods))
     
     log_step(log, "Após remoção de produções vazias", glc)
+    metrics_phase(metrics, "epsilon", glc)
+    budget_check(budget, "epsilon", glc)
 
-    glc = remove_unit_productions(glc)
+    glc = remove_unit_productions(glc, budget)
     log_step(log, "Após remoção de produções unitárias", glc)
+    metrics_phase(metrics, "unit", glc)
+    budget_check(budget, "unit", glc)
 
-    #glc = remove_useless_symbols(glc)
-    #log_step(log, "Após remoção de símbolos inúteis", glc)
+    # A remoção de unitárias pode deixar variáveis inalcançáveis
+    glc = remove_useless_symbols(glc)
+    log_step(log, "Após remoção de símbolos inúteis", glc)
+    metrics_phase(metrics, "useless", glc)
 
-    glc = convert_terminals_and_binarize(glc)
-    log_step(log, "Forma Normal de Chomsky (Final)", glc)
+    glc = convert_terminals_and_binarize(glc, share_suffixes)
+    log_step(log, "Forma Normal de Chomsky (Final)", glc, LOG_SUMMARY)
+    metrics_phase(metrics, "terminals+binarize", glc)
+    metrics_finish(metrics, glc)
+    budget_check(budget, "terminals+binarize", glc)
+    budget_finish(budget)
 
     return glc
 
 
-def remove_empty_productions(productions):
+# ------------------ Análises ------------------
 
-    nullable = []
+def nullable_set(glc: GLC) -> Set[Symbol]:
+    """Variáveis anuláveis (que derivam & direta ou indiretamente)."""
+    analysis = GrammarAnalysis(glc)
+    return symbol_names(analysis.nullable())
 
-    for p in productions:
-        if p.is_epsilon():
-            nullable.append(p.lhs)
-    
-    changed = True
-    while changed:
-        changed = False
-        for p in productions:
-            if all(sym in nullable for sym in p.rhs):
-                if p.lhs not in nullable:
-                    nullable.append(p.lhs)
-                    changed = True
+
+def generating_set(glc: GLC) -> Set[Symbol]:
+    """Variáveis geradoras (que derivam alguma cadeia de terminais)."""
+    analysis = GrammarAnalysis(glc)
+    return symbol_names(analysis.generating())
+
+
+def estimate_empty_expansion(glc: GLC, nullable: Set[int] = None) -> int:
+    """
+    Limite superior, sem expandir nada, do número de produções após a
+    remoção clássica de vazias: cada corpo com k anuláveis gera até 2^k.
+    `nullable` são os ids das anuláveis, se já calculados.
+    """
+    if nullable is None:
+        analysis = GrammarAnalysis(glc)
+        nullable = analysis.nullable()
+    total = 0
+    for p in glc.productions:
+        if not p.is_epsilon():
+            total += 1 << sum(1 for s in p.rhs_ids if s in nullable)
+    return total
+
+
+def reachable_set(glc: GLC) -> Set[Symbol]:
+    """Símbolos (variáveis e terminais) alcançáveis a partir do inicial."""
+    return symbol_names(GrammarAnalysis(glc).reachable()) | {glc.start}
+
+
+# ------------------ Transformações ------------------
+
+def remove_empty_productions(productions, start: Symbol = None, nullable: Set[int] = None):
+    """
+    Expande as ocorrências de anuláveis e descarta todas as produções
+    vazias. A única que sobra é `start -> &`, quando o inicial é anulável
+    (sem `start`, nenhuma sobra e a palavra vazia sai da linguagem).
+    `nullable` são os ids das anuláveis, se já calculados.
+    """
+    if nullable is None:
+        analysis = GrammarAnalysis.from_productions(productions, start)
+        nullable = analysis.nullable()
     
     new_productions = []
 
     for p in productions:
         rhs = p.rhs
-        nullable_positions = [i for i, s in enumerate(rhs) if s in nullable]
+        nullable_positions = [i for i, s in enumerate(p.rhs_ids) if s in nullable]
 
         for r in range(1, len(nullable_positions) + 1):
             for cm in combinations(nullable_positions, r):
-                new_rhs = [rhs[i] for i in range(len(rhs)) if i not in cm]
+                removed = set(cm)
+                new_rhs = [s for i, s in enumerate(rhs) if i not in removed]
 
                 if new_rhs:
                     new_productions.append(
                         Production(p.lhs, new_rhs)
                     )
-                else:
-                    new_productions.append(
-                        Production(p.lhs, ["&"])
-                    )
+
+    if start is not None and SYMBOLS.lookup(start) in nullable:
+        new_productions.append(Production(start, ["&"]))
         
     final_productions = []
 
     for p in productions:
         if not p.is_epsilon():
             final_productions.append(
-                Production(p.lhs, list(p.rhs))
+                Production.from_ids(p.lhs_id, p.rhs_ids)
             )
 
     final_productions.extend(new_productions)
@@ -96,7 +188,7 @@ def remove_duplicate_productions(productions):
     unique = []
 
     for p in productions:
-        key = (p.lhs, tuple(p.rhs))
+        key = p.key
         if key not in seen:
             seen.add(key)
             unique.append(p)
@@ -104,111 +196,175 @@ def remove_duplicate_productions(productions):
     return unique
 
 
-def remove_unit_productions(glc: GLC) -> GLC:
+def _variable_ids(glc: GLC) -> Set[int]:
+    """Ids das variáveis declaradas e de todo lado esquerdo de produção."""
+    ids = {SYMBOLS.intern(v) for v in glc.variables}
+    ids.update(p.lhs_id for p in glc.productions)
+    return ids
+
+
+def unit_closure(glc: GLC, analysis: GrammarAnalysis = None):
+    """
+    Fecho transitivo das produções unitárias sobre bitsets (inteiros Python),
+    calculado por GrammarAnalysis. Retorna a lista de variáveis (posição =
+    bit) e, para cada uma, o bitset das variáveis que ela alcança só com
+    unitárias (incluindo ela mesma).
+    """
+    if analysis is None:
+        analysis = GrammarAnalysis(glc)
+    return analysis.names, analysis.unit_closure()
+
+
+def remove_unit_productions(glc: GLC, budget=None) -> GLC:
     """
     Elimina produções unitárias do tipo A -> B.
     Substitui pela regra de produção de B.
+    Com `budget`, o total emitido e o tempo são conferidos a cada variável.
     """
-    
-    dependencies = {v: set() for v in glc.variables}
-    
-    for p in glc.productions:
-        if p.is_unit():
-            dependencies[p.lhs].add(p.rhs[0])
+    names, reach = unit_closure(glc)
+    declared = len(set(glc.variables))
+    variable_ids = _variable_ids(glc)
 
-    final_unit_reach = {v: {v} for v in glc.variables}
-    
-    for v in glc.variables:
-        # BFS
-        queue = [v]
-        visited = {v}
-        while queue:
-            curr = queue.pop(0)
-            if curr != v:
-                final_unit_reach[v].add(curr)
-            
-            if curr in dependencies:
-                for neighbor in dependencies[curr]:
-                    if neighbor not in visited:
-                        visited.add(neighbor)
-                        queue.append(neighbor)
+    # Corpos não unitários de cada variável, lidos do índice por lado esquerdo
+    bodies = [
+        [p.rhs_ids for p in glc.productions_of(B) if not p.is_unit(variable_ids)]
+        for B in names
+    ]
 
     new_productions = []
-    
-    # Coletar todas as produções NÃO unitárias
-    non_unit_productions = []
-    for p in glc.productions:
-        if not p.is_unit():
-            non_unit_productions.append(p)
+    start_id = SYMBOLS.lookup(glc.start)
+
+    for i in range(declared):
+        A_id = SYMBOLS.intern(names[i])
+        # Repetidas são descartadas aqui mesmo, para o orçamento contar só as que ficam
+        seen = set()
+        for b in iter_bits(reach[i]):
+            for rhs in bodies[b]:
+                # A -> B com B -> &: as ocorrências de A já foram expandidas
+                # na remoção de vazias, então só o inicial herda o &
+                if rhs == (EPSILON_ID,) and A_id != start_id:
+                    continue
+                if rhs not in seen:
+                    seen.add(rhs)
+                    new_productions.append(Production.from_ids(A_id, rhs))
+        budget_check_running(budget, "unit", glc, len(new_productions))
+
+    return GLC(glc.variables, glc.alphabet, glc.start, new_productions)
+
+
+def remove_useless_symbols(glc: GLC, analysis: GrammarAnalysis = None) -> GLC:
+    """
+    Elimina símbolos inúteis: ficam as produções de variáveis alcançáveis
+    a partir de S cujo corpo só tem terminais e variáveis geradoras (ver
+    GrammarAnalysis.useful_productions). `analysis`, se dada, deve ser da
+    própria `glc`.
+    """
+    if analysis is None:
+        analysis = GrammarAnalysis(glc)
+    final_productions = analysis.useful_productions()
+    final_vars = {p.lhs for p in final_productions}
+    useful = analysis.useful()
+    final_terms = {a for a in glc.alphabet if SYMBOLS.intern(a) in useful}
 
-    for A in glc.variables:
-        reachable_vars = final_unit_reach.get(A, set())
-        for B in reachable_vars:
-            for p in non_unit_productions:
-                if p.lhs == B:
-                    new_productions.append(Production(A, list(p.rhs)))
+    return GLC(sorted(final_vars), sorted(final_terms), glc.start, final_productions)
 
-    return GLC(glc.variables, glc.alphabet, glc.start, remove_duplicate_productions(new_productions))
 
+def _new_var_namer(variables: Set[Symbol]):
+    """Gera nomes novos (T_1, C_2, ...) que não colidem com `variables`."""
+    new_var_counter = 1
 
-def remove_useless_symbols(glc: GLC) -> GLC:
+    def get_new_var_name(prefix="X"):
+        nonlocal new_var_counter
+        while True:
+            name = f"{prefix}{new_var_counter}"
+            if name not in variables:
+                variables.add(name)
+                new_var_counter += 1
+                return name
+            new_var_counter += 1
+
+    return get_new_var_name
+
+
+def _binarize_body(lhs: Symbol, rhs: List[Symbol], get_new_var_name, out: List[Production], suffix_vars=None):
+    """
+    Quebra A -> X1 X2 ... Xn (n > 2) em A -> X1 C_k, C_k -> X2 ..., etc.
+
+    Se `suffix_vars` (sufixo -> variável) for passado, cada sufixo distinto
+    ganha uma única variável, compartilhada entre todas as produções: ao
+    encontrar um sufixo já visto, a cadeia termina reaproveitando-o.
     """
-    Elimina símbolos inúteis em duas etapas:
-    1. Variáveis que geram terminais (Generating).
-    2. Variáveis alcançáveis a partir de S (Reachable).
+    current_lhs = lhs
+    current_rhs = rhs
+
+    while len(current_rhs) > 2:
+        left_sym = current_rhs[0]
+        rest = current_rhs[1:]
+
+        if suffix_vars is not None:
+            key = tuple(rest)
+            if key in suffix_vars:
+                out.append(Production(current_lhs, [left_sym, suffix_vars[key]]))
+                return
+            new_var = get_new_var_name("C_")
+            suffix_vars[key] = new_var
+        else:
+            new_var = get_new_var_name("C_")
+
+        out.append(Production(current_lhs, [left_sym, new_var]))
+
+        current_lhs = new_var
+        current_rhs = rest
+
+    out.append(Production(current_lhs, current_rhs))
+
+
+def binarize_long_productions(glc: GLC, share_suffixes: bool = False) -> GLC:
     """
-    generating = set(glc.alphabet) 
-    generating.add('&') 
-
-    changed = True
-    while changed:
-        changed = False
-        for p in glc.productions:
-            if p.lhs not in generating:
-                if all(s in generating for s in p.rhs):
-                    generating.add(p.lhs)
-                    changed = True
-    
-    step1_productions = []
+    Quebra corpos com mais de dois símbolos em cadeias de variáveis C_n,
+    sem mexer em terminais. Usada antes da remoção de vazias no modo "bin".
+    Com share_suffixes, sufixos iguais reutilizam a mesma variável.
+    """
+    variables = set(glc.variables)
+    get_new_var_name = _new_var_namer(variables)
+    suffix_vars = {} if share_suffixes else None
+    productions = []
+
     for p in glc.productions:
-        if p.lhs in generating:
-            if all(s in generating for s in p.rhs):
-                step1_productions.append(p)
-                
-    reachable = {glc.start}
-    changed = True
-    while changed:
-        changed = False
-        for p in step1_productions:
-            if p.lhs in reachable:
-                for s in p.rhs:
-                    if s not in reachable:
-                        reachable.add(s)
-                        changed = True
+        if len(p.rhs_ids) <= 2:
+            productions.append(p)
+        else:
+            _binarize_body(p.lhs, p.rhs, get_new_var_name, productions, suffix_vars)
 
-    final_productions = []
-    final_vars = set()
-    final_terms = set()
+    new_vars = sorted(variables - set(glc.variables))
+    return GLC(list(glc.variables) + new_vars, glc.alphabet, glc.start, productions)
 
-    for p in step1_productions:
-        if p.lhs in reachable:
-            if all(s in reachable or s in glc.alphabet or s == '&' for s in p.rhs):
-                final_productions.append(p)
-                final_vars.add(p.lhs)
-                for s in p.rhs:
-                    if s in glc.variables and s in reachable:
-                        final_vars.add(s)
-                    elif s in glc.alphabet:
-                        final_terms.add(s)
 
-    return GLC(sorted(list(final_vars)), sorted(list(final_terms)), glc.start, final_productions)
+def remove_empty_productions_binarized(glc: GLC, share_suffixes: bool = False, budget=None) -> GLC:
+    """
+    Remoção de vazias na ordem BIN antes de DEL: binariza primeiro e só
+    então expande as anuláveis. Como cada corpo fica com no máximo dois
+    símbolos, cada produção gera no máximo três variantes e a saída cresce
+    de forma linear, em vez de 2^k para k anuláveis no mesmo corpo.
+    Com `budget`, a saída é estimada sobre a gramática binarizada antes
+    da expansão.
+    """
+    binarized = binarize_long_productions(glc, share_suffixes)
+    analysis = GrammarAnalysis(binarized)
+    nullable = analysis.nullable()
+    budget_check_estimate(budget, "epsilon", binarized, estimate_empty_expansion(binarized, nullable))
+    new_prods = remove_empty_productions(binarized.productions, glc.start, nullable)
+    return GLC(binarized.variables, glc.alphabet, glc.start, remove_duplicate_productions(new_prods))
 
 
-def convert_terminals_and_binarize(glc: GLC) -> GLC:
+def convert_terminals_and_binarize(glc: GLC, share_suffixes: bool = False) -> GLC:
     """
     Aplica as regras finais de CNF:
     1. Corpos com tamanho >= 2 devem ser compostos apenas por variáveis.
     2. Corpos com tamanho > 2 devem ser quebrados (binarização).
+
+    Com share_suffixes, cada sufixo distinto (ex.: T_1 T_2 B C) recebe uma
+    única variável C_n em vez de uma cadeia nova por produção.
     """
     productions = glc.productions
     variables = set(glc.variables)
@@ -216,17 +372,7 @@ def convert_terminals_and_binarize(glc: GLC) -> GLC:
     
     term_to_var = {}
     
-    new_var_counter = 1
-
-    def get_new_var_name(prefix="X"):
-        nonlocal new_var_counter
-        while True:
-            name = f"{prefix}{new_var_counter}"
-            if name not in variables:
-                variables.add(name)
-                new_var_counter += 1
-                return name
-            new_var_counter += 1
+    get_new_var_name = _new_var_namer(variables)
 
     temp_productions = []
     
@@ -254,6 +400,7 @@ def convert_terminals_and_binarize(glc: GLC) -> GLC:
         temp_productions.append(Production(p.lhs, new_rhs))
 
     final_productions_list = list(new_productions) 
+    suffix_vars = {} if share_suffixes else None
     
     for p in temp_productions:
         rhs = p.rhs
@@ -261,21 +408,7 @@ def convert_terminals_and_binarize(glc: GLC) -> GLC:
         if len(rhs) <= 2:
             final_productions_list.append(p)
         else:
-            current_lhs = p.lhs
-            current_rhs = rhs
-            
-            while len(current_rhs) > 2:
-                left_sym = current_rhs[0]
-                rest = current_rhs[1:]
-                
-                new_var = get_new_var_name("C_") 
-                
-                final_productions_list.append(Production(current_lhs, [left_sym, new_var]))
-                
-                current_lhs = new_var
-                current_rhs = rest
-            
-            final_productions_list.append(Production(current_lhs, current_rhs))
+            _binarize_body(p.lhs, rhs, get_new_var_name, final_productions_list, suffix_vars)
 
     return GLC(
         sorted(list(variables)), 
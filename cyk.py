@@ -0,0 +1,176 @@
+"""
+Reconhecimento e análise de palavras pelo algoritmo CYK sobre uma gramática
+em CNF (saída de convert_to_cnf / cnf_from_glc).
+
+As regras binárias A -> BC são indexadas pelo par (B, C) e cada célula da
+tabela é um bitset (inteiro Python) sobre os ids das variáveis. Em vez de
+percorrer cada ponto de corte j da célula (i, k), o reconhecedor mantém,
+para cada variável, o bitset das posições onde terminam as subpalavras que
+ela gera a partir de i (`ends`) e onde começam as que ela gera até k
+(`begins`). Uma regra A -> BC vale em (i, k) se ends[i][B] & begins[k][C]
+não é zero: todos os cortes são testados em uma única operação de bits.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from models import GLC, SYMBOLS, EPSILON_ID
+from parser import SymbolTrie
+from cnf import cnf_from_glc
+from analysis import iter_bits
+
+Symbol = str
+Word = Union[str, Sequence[Symbol]]
+
+
+class CYKParser:
+    """
+    Reconhecedor/analisador CYK para uma GLC em CNF. O índice das regras é
+    montado uma vez e reaproveitado por todas as palavras.
+    """
+
+    def __init__(self, glc: GLC):
+        names = list(dict.fromkeys(list(glc.variables) + [p.lhs for p in glc.productions]))
+        self.variables = names
+        position = {SYMBOLS.intern(v): i for i, v in enumerate(names)}
+        self._start = position.get(SYMBOLS.lookup(glc.start)) if glc.start else None
+
+        terminal_ids = {SYMBOLS.intern(a) for a in glc.alphabet}
+        self._by_terminal: Dict[Symbol, int] = {}
+        pairs: Dict[tuple, int] = {}
+        self.accepts_empty = False
+
+        for p in glc.productions:
+            A = position[p.lhs_id]
+            rhs = p.rhs_ids
+            if len(rhs) == 2 and rhs[0] in position and rhs[1] in position:
+                key = (position[rhs[0]], position[rhs[1]])
+                pairs[key] = pairs.get(key, 0) | (1 << A)
+            elif len(rhs) == 1 and rhs[0] == EPSILON_ID:
+                if A != self._start:
+                    raise ValueError(f"Produção vazia fora do símbolo inicial: {p}")
+                self.accepts_empty = True
+            elif len(rhs) == 1 and rhs[0] not in position:
+                a = SYMBOLS.name(rhs[0])
+                self._by_terminal[a] = self._by_terminal.get(a, 0) | (1 << A)
+                terminal_ids.add(rhs[0])
+            else:
+                raise ValueError(f"Produção fora da CNF: {p}")
+
+        # Índice por (B, C), agrupado por B: B -> [(C, bitset dos A)]
+        self._pairs = pairs
+        by_left: Dict[int, List[tuple]] = {}
+        for (B, C), heads in pairs.items():
+            by_left.setdefault(B, []).append((C, heads))
+        self._by_left = sorted(by_left.items())
+
+        self._tokenizer = SymbolTrie(SYMBOLS.name(t) for t in terminal_ids)
+
+    @classmethod
+    def from_grammar(cls, glc: GLC, **cnf_options) -> "CYKParser":
+        """Converte `glc` para CNF (sem log) e monta o analisador."""
+        return cls(cnf_from_glc(glc, None, **cnf_options))
+
+    # ------------------ Tabela ------------------
+
+    def _tokens(self, word: Word) -> List[Symbol]:
+        if isinstance(word, str):
+            return self._tokenizer.tokenize(word.replace(" ", ""))
+        return list(word)
+
+    def table(self, word: Word) -> Optional[Dict[tuple, int]]:
+        """
+        Preenche a tabela CYK: {(i, k): bitset das variáveis que geram
+        w[i:k]}. Retorna None se algum símbolo não for terminal da gramática.
+        """
+        tokens = self._tokens(word)
+        n = len(tokens)
+        cells: Dict[tuple, int] = {}
+        ends = [[0] * len(self.variables) for _ in range(n + 1)]
+        begins = [[0] * len(self.variables) for _ in range(n + 1)]
+
+        def mark(i, k, bits):
+            cells[(i, k)] = bits
+            for A in iter_bits(bits):
+                ends[i][A] |= 1 << k
+                begins[k][A] |= 1 << i
+
+        for i, a in enumerate(tokens):
+            bits = self._by_terminal.get(a)
+            if bits is None:
+                return None
+            mark(i, i + 1, bits)
+
+        by_left = self._by_left
+        for length in range(2, n + 1):
+            for i in range(0, n - length + 1):
+                k = i + length
+                ends_i = ends[i]
+                begins_k = begins[k]
+                bits = 0
+                for B, rules in by_left:
+                    left = ends_i[B]
+                    if not left:
+                        continue
+                    for C, heads in rules:
+                        if left & begins_k[C]:
+                            bits |= heads
+                if bits:
+                    mark(i, k, bits)
+        return cells
+
+    # ------------------ Consultas ------------------
+
+    def recognize(self, word: Word) -> bool:
+        """Indica se a gramática gera a palavra (string ou lista de símbolos)."""
+        if self._start is None:
+            return False
+        tokens = self._tokens(word)
+        if not tokens:
+            return self.accepts_empty
+        cells = self.table(tokens)
+        if cells is None:
+            return False
+        return bool(cells.get((0, len(tokens)), 0) >> self._start & 1)
+
+    def recognize_many(self, words: Iterable[Word]) -> List[bool]:
+        """Testa várias palavras contra a mesma gramática (índice montado uma vez)."""
+        seen: Dict[tuple, bool] = {}
+        results = []
+        for w in words:
+            key = tuple(self._tokens(w))
+            if key not in seen:
+                seen[key] = self.recognize(key)
+            results.append(seen[key])
+        return results
+
+    def parse(self, word: Word):
+        """
+        Uma árvore de derivação da palavra, ou None se ela não é gerada.
+        Folhas são (A, a); nós internos são (A, esquerda, direita). A
+        palavra vazia aceita devolve (S, "&").
+        """
+        if self._start is None:
+            return None
+        tokens = self._tokens(word)
+        if not tokens:
+            return (self.variables[self._start], "&") if self.accepts_empty else None
+        cells = self.table(tokens)
+        if cells is None or not cells.get((0, len(tokens)), 0) >> self._start & 1:
+            return None
+        return self._build(cells, tokens, self._start, 0, len(tokens))
+
+    def _build(self, cells, tokens, A, i, k):
+        if k == i + 1:
+            return (self.variables[A], tokens[i])
+        for j in range(i + 1, k):
+            left = cells.get((i, j), 0)
+            right = cells.get((j, k), 0)
+            if not left or not right:
+                continue
+            for B in iter_bits(left):
+                for C in iter_bits(right):
+                    if self._pairs.get((B, C), 0) >> A & 1:
+                        return (self.variables[A],
+                                self._build(cells, tokens, B, i, j),
+                                self._build(cells, tokens, C, j, k))
+        raise AssertionError("tabela CYK inconsistente")
@@ -0,0 +1,191 @@
+"""
+Formato binário da GLC, para trocar gramáticas grandes entre etapas sem
+reinterpretar texto linha a linha.
+
+Layout (inteiros sem sinal de 32 bits, little-endian, tudo alinhado a 4):
+
+    cabeçalho   MAGIC, versão, n_símbolos, n_variáveis, n_alfabeto,
+                início, n_produções, n_símbolos_nos_corpos, tamanho_nomes
+    nomes       offsets (n_símbolos + 1) e os nomes em UTF-8, concatenados
+    variables   ids locais das variáveis
+    alphabet    ids locais dos terminais
+    lhs         id local do lado esquerdo de cada produção
+    rhs_offsets início de cada corpo em `rhs` (n_produções + 1)
+    rhs         símbolos de todos os corpos, concatenados
+
+Os ids são locais ao arquivo (posição na tabela de nomes). A leitura mapeia
+o arquivo com mmap e copia cada bloco de uma vez para um array; com NumPy
+instalado, read_arrays(..., use_numpy=True) devolve visões frombuffer sobre
+o próprio mmap, sem cópia.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+
+from models import GLC, Production, SYMBOLS
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+MAGIC = b"GLCB"
+VERSION = 1
+BINARY_SUFFIX = ".glcb"
+
+_HEADER = struct.Struct("<4s8I")
+_U32 = "I" if array("I").itemsize == 4 else "L"
+
+
+def is_binary_grammar(path: str) -> bool:
+    """Indica se o arquivo começa com o MAGIC do formato binário."""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def _u32(values) -> bytes:
+    arr = array(_U32, values)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _pad4(data: bytes) -> bytes:
+    return data + b"\0" * (-len(data) % 4)
+
+
+def save_grammar(glc: GLC, path: str):
+    """Grava a GLC no formato binário."""
+    local = {}
+
+    def lid(sid):
+        if sid not in local:
+            local[sid] = len(local)
+        return local[sid]
+
+    variables = [lid(SYMBOLS.intern(v)) for v in glc.variables]
+    alphabet = [lid(SYMBOLS.intern(a)) for a in glc.alphabet]
+    start = lid(SYMBOLS.intern(glc.start)) if glc.start else 0xFFFFFFFF
+
+    lhs = []
+    rhs_offsets = [0]
+    rhs = []
+    for p in glc.productions:
+        lhs.append(lid(p.lhs_id))
+        rhs.extend(lid(s) for s in p.rhs_ids)
+        rhs_offsets.append(len(rhs))
+
+    encoded = [SYMBOLS.name(sid).encode("utf-8") for sid in local]
+    name_offsets = [0]
+    for e in encoded:
+        name_offsets.append(name_offsets[-1] + len(e))
+    names = _pad4(b"".join(encoded))
+
+    header = _HEADER.pack(MAGIC, VERSION, len(encoded), len(variables), len(alphabet),
+                          start, len(lhs), len(rhs), len(names))
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(_u32(name_offsets))
+        f.write(names)
+        for block in (variables, alphabet, lhs, rhs_offsets, rhs):
+            f.write(_u32(block))
+
+
+class BinaryGrammar:
+    """
+    Conteúdo de um arquivo .glcb como arrays planos (ids locais), para quem
+    quer iterar direto sobre inteiros. to_glc() monta a GLC.
+    """
+
+    def __init__(self, names, variables, alphabet, start, lhs, rhs_offsets, rhs):
+        self.names = names
+        self.variables = variables
+        self.alphabet = alphabet
+        self.start = start
+        self.lhs = lhs
+        self.rhs_offsets = rhs_offsets
+        self.rhs = rhs
+
+    def __len__(self):
+        return len(self.lhs)
+
+    def to_glc(self) -> GLC:
+        names = self.names
+        # Ids locais -> ids da tabela global, um por símbolo
+        ids = [SYMBOLS.intern(n) for n in names]
+        rhs = [ids[s] for s in self.rhs.tolist()]
+        offsets = self.rhs_offsets.tolist()
+        productions = [
+            Production.from_ids(ids[a], tuple(rhs[offsets[i]:offsets[i + 1]]))
+            for i, a in enumerate(self.lhs.tolist())
+        ]
+        start = names[self.start] if self.start < len(names) else ""
+        return GLC(
+            [names[v] for v in self.variables.tolist()],
+            [names[a] for a in self.alphabet.tolist()],
+            start,
+            productions,
+        )
+
+
+def read_arrays(path: str, use_numpy: bool = False) -> BinaryGrammar:
+    """
+    Lê um arquivo .glcb sem interpretar produção a produção. Com
+    use_numpy=True (e NumPy disponível) os arrays são np.frombuffer sobre o
+    mmap do arquivo; senão, cada bloco é copiado de uma vez para um array.
+    """
+    if use_numpy and np is None:
+        raise ImportError("use_numpy=True requer o pacote numpy")
+
+    with open(path, "rb") as f:
+        size = f.seek(0, 2)
+        if size < _HEADER.size:
+            raise ValueError(f"{path}: arquivo binário truncado")
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, n_sym, n_var, n_alpha, start, n_prod, n_rhs, names_len = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: não é uma gramática binária")
+    if version != VERSION:
+        raise ValueError(f"{path}: versão {version} não suportada")
+
+    expected = _HEADER.size + 4 * (n_sym + 1) + names_len + 4 * (n_var + n_alpha + n_prod + (n_prod + 1) + n_rhs)
+    if size != expected:
+        raise ValueError(f"{path}: tamanho inesperado ({size} bytes, esperado {expected})")
+
+    view = memoryview(buf)
+    pos = _HEADER.size
+
+    def take(count):
+        nonlocal pos
+        chunk = view[pos:pos + 4 * count]
+        pos += 4 * count
+        if use_numpy:
+            return np.frombuffer(chunk, dtype="<u4")
+        arr = array(_U32)
+        arr.frombytes(chunk)
+        if sys.byteorder == "big":
+            arr.byteswap()
+        return arr
+
+    name_offsets = take(n_sym + 1).tolist()
+    blob = bytes(view[pos:pos + names_len])
+    pos += names_len
+    names = [blob[name_offsets[i]:name_offsets[i + 1]].decode("utf-8") for i in range(n_sym)]
+
+    grammar = BinaryGrammar(names, take(n_var), take(n_alpha), start, take(n_prod), take(n_prod + 1), take(n_rhs))
+    if not use_numpy:
+        # Os arrays já são cópias; o mapeamento pode ser fechado
+        view.release()
+        buf.close()
+    return grammar
+
+
+def load_grammar(path: str) -> GLC:
+    """Lê um arquivo .glcb e devolve a GLC."""
+    return read_arrays(path).to_glc()
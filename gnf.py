@@ -1,25 +1,54 @@
-from typing import List, Dict, Set
-from models import GLC, Production
+import heapq
+from typing import List, Dict, Set, Tuple
+from models import GLC, Production, RhsTrie, SYMBOLS, EPSILON_ID
 from parser import create_grammar
-from utils_log import log_step
+from utils_log import log_step, LOG_SUMMARY, LOG_SUBSTITUTION
+from utils_metrics import metrics_start, metrics_finish, metrics_phase, metrics_substitution
+from utils_budget import budget_start, budget_finish, budget_check, budget_check_estimate, budget_check_running
+from analysis import GrammarAnalysis, iter_bits
 
 from cnf import (
     remove_empty_productions,
     remove_duplicate_productions,
     remove_unit_productions,
-    convert_to_cnf,
+    remove_useless_symbols,
+    cnf_from_glc,
 )
 
 Symbol = str
 
+# Métodos de construção da GNF:
+# "classic"     -> ordem A1..An com substituições e variáveis Z (saída
+#                  exponencial no pior caso)
+# "rosenkrantz" -> sistema de equações sobre os cantos à esquerda com
+#                  variáveis Y, saída polinomial
+GNF_METHODS = ("classic", "rosenkrantz")
+
+# Ordem das variáveis A1..An no método clássico (ver variable_order). Todas
+# respeitam a ordem topológica das componentes do grafo de cantos à esquerda.
+# "topological"        -> componentes em ordem topológica, membros na ordem
+#                         de glc.variables (inicial primeiro)
+# "fewest-productions" -> dentro de cada componente, menos produções primeiro
+# "reverse-postorder"  -> pós-ordem reversa de uma busca em profundidade
+#                         a partir do inicial
+# "best"               -> estima o tamanho da GNF com cada uma (ver
+#                         estimate_gnf_size) e fica com a menor
+ORDERING_STRATEGIES = ("topological", "fewest-productions", "reverse-postorder", "best")
+
 # ------------------ Funções auxiliares ------------------
 
-def rename_variables_to_Ai(glc: GLC):
-    """Renomeia variáveis para A1, A2, A3, ..."""
-    orig_vars = list(glc.variables)
-    if glc.start in orig_vars:
-        orig_vars.remove(glc.start)
-    ordered = [glc.start] + orig_vars
+def rename_variables_to_Ai(glc: GLC, order: List[Symbol] = None):
+    """
+    Renomeia variáveis para A1, A2, A3, ... Sem `order`, o inicial vem
+    primeiro e as demais seguem a ordem de glc.variables.
+    """
+    if order is not None:
+        ordered = list(order)
+    else:
+        orig_vars = list(glc.variables)
+        if glc.start in orig_vars:
+            orig_vars.remove(glc.start)
+        ordered = [glc.start] + orig_vars
     Ai_names = [f"A{i+1}" for i in range(len(ordered))]
     original_to_Ai = {orig: Ai for orig, Ai in zip(ordered, Ai_names)}
     Ai_to_original = {Ai: orig for orig, Ai in original_to_Ai.items()}
@@ -31,135 +60,573 @@ def rename_variables_to_Ai(glc: GLC):
     return GLC(Ai_names, list(glc.alphabet), original_to_Ai[glc.start], new_prods), original_to_Ai, Ai_to_original
 
 
+def left_corner_graph(glc: GLC, analysis: GrammarAnalysis = None) -> Dict[Symbol, Set[Symbol]]:
+    """Grafo "A pode começar com B": A -> B para cada produção A -> B..."""
+    if analysis is None:
+        analysis = GrammarAnalysis(glc)
+    names = analysis.names
+    return {names[A]: analysis.names_of(row) for A, row in enumerate(analysis.left_rows()) if row}
+
+
+def left_recursive_components(glc: GLC, analysis: GrammarAnalysis = None) -> List[Tuple[List[Symbol], bool]]:
+    """
+    Componentes fortemente conexas (Tarjan) do grafo de cantos à esquerda,
+    em ordem topológica da condensação: se A pode começar com B e os dois
+    estão em componentes diferentes, a de A vem antes. Cada componente vem
+    com um indicador de recursão à esquerda (mais de uma variável, ou uma
+    só com A -> A...). Dentro da componente vale a ordem de glc.variables,
+    com o inicial primeiro.
+    """
+    if analysis is None:
+        analysis = GrammarAnalysis(glc)
+    names = analysis.names
+    recursive = analysis.left_recursive_bits()
+    result = [([names[A] for A in component], bool(recursive >> component[0] & 1))
+              for component in analysis.left_corner_components()]
+    if analysis.start is None:
+        # Inicial sem produções: componente isolada, sem arestas
+        result.append(([glc.start], False))
+    return result
+
+
+def _reverse_postorder(glc: GLC, graph: Dict[Symbol, Set[Symbol]]) -> List[Symbol]:
+    """Pós-ordem reversa de uma DFS iterativa, começando pelo inicial."""
+    names = list(dict.fromkeys([glc.start] + list(glc.variables) + [p.lhs for p in glc.productions]))
+    visited = set()
+    postorder = []
+    for root in names:
+        if root in visited:
+            continue
+        visited.add(root)
+        work = [(root, iter(sorted(graph.get(root, ()))))]
+        while work:
+            node, it = work[-1]
+            for succ in it:
+                if succ not in visited:
+                    visited.add(succ)
+                    work.append((succ, iter(sorted(graph.get(succ, ())))))
+                    break
+            else:
+                work.pop()
+                postorder.append(node)
+    postorder.reverse()
+    return postorder
+
+
+def estimate_gnf_size(glc: GLC, order: List[Symbol]) -> int:
+    """
+    Estima quantas produções o método clássico gera com a ordem `order`,
+    sem montar nenhuma. Cada variável guarda só quantos corpos começam por
+    cada par (primeiro, segundo símbolo) — o segundo é o que vira início de
+    um corpo de Z — e as substituições multiplicam contagens, sem descartar
+    repetidas: o resultado é um limite superior aproximado, calculado em
+    tempo proporcional ao número de pares distintos.
+    """
+    variables = set(order)
+    rank = {v: k for k, v in enumerate(order)}
+    pairs: Dict[Symbol, Dict[tuple, int]] = {}
+    z_pairs: List[Dict[tuple, int]] = []
+
+    def add(counter, key, c):
+        counter[key] = counter.get(key, 0) + c
+
+    for i, A in enumerate(order):
+        current: Dict[tuple, int] = {}
+        for p in glc.productions_of(A):
+            rhs = p.rhs
+            add(current, (rhs[0], rhs[1] if len(rhs) > 1 else None), 1)
+
+        # Substituições dos Aj (j < i) que iniciam corpos de A
+        heap = sorted({rank[x] for x, _ in current if x in variables and rank[x] < i})
+        seen = set(heap)
+        while heap:
+            B = order[heapq.heappop(heap)]
+            targets = {g: c for (x, g), c in current.items() if x == B}
+            for g in targets:
+                del current[(B, g)]
+            for (x, y), d in pairs[B].items():
+                for g, c in targets.items():
+                    add(current, (x, y if y is not None else g), c * d)
+                if x in variables and rank[x] < i and rank[x] not in seen:
+                    seen.add(rank[x])
+                    heapq.heappush(heap, rank[x])
+
+        # Recursão imediata: A -> βZ | β e Z -> αZ | α
+        alphas = {g: c for (x, g), c in current.items() if x == A}
+        if alphas:
+            betas = {k: c for k, c in current.items() if k[0] != A}
+            current = {}
+            for (x, y), c in betas.items():
+                add(current, (x, y if y is not None else "Z"), c)
+                add(current, (x, y), c)
+            z_pairs.append({(g, None): 2 * c for g, c in alphas.items()})
+        pairs[A] = current
+
+    # Substituição de volta, de An para A1, e depois nas variáveis Z
+    total: Dict[Symbol, int] = {}
+    for A in reversed(order):
+        total[A] = sum(c * total.get(x, 1) for (x, _), c in pairs[A].items())
+    size = sum(total.values())
+    for z in z_pairs:
+        size += sum(c * total.get(x, 1) for (x, _), c in z.items())
+    return size
+
+
+def variable_order(glc: GLC, strategy: str = "topological", components=None,
+                   analysis: GrammarAnalysis = None) -> List[Symbol]:
+    """
+    Ordem das variáveis para rename_variables_to_Ai segundo `strategy`
+    (ver ORDERING_STRATEGIES). Toda ordem devolvida põe A antes de B quando
+    A pode começar com B e os dois estão em componentes diferentes, como
+    exige o laço de _ordered_gnf.
+    """
+    if strategy not in ORDERING_STRATEGIES:
+        raise ValueError(f"Estratégia de ordenação inválida: {strategy}")
+    if analysis is None:
+        analysis = GrammarAnalysis(glc)
+    if components is None:
+        components = left_recursive_components(glc, analysis)
+
+    if strategy == "topological":
+        return [v for component, _ in components for v in component]
+    if strategy == "fewest-productions":
+        # sorted é estável: empates mantêm a ordem de glc.variables
+        return [v for component, _ in components
+                for v in sorted(component, key=lambda v: len(glc.productions_of(v)))]
+    if strategy == "reverse-postorder":
+        return _reverse_postorder(glc, left_corner_graph(glc, analysis))
+
+    best = None
+    for candidate in ORDERING_STRATEGIES[:-1]:
+        order = variable_order(glc, candidate, components, analysis)
+        size = estimate_gnf_size(glc, order)
+        if best is None or size < best[0]:
+            best = (size, order)
+    return best[1]
+
+
+def new_var_generator_factory(existing_vars: Set[Symbol], prefix: str = "Z"):
+    """
+    Cria um gerador de nomes novos (Z1, Z2, ...) com contador próprio,
+    para não recomeçar a busca do Z1 a cada variável criada.
+    """
+    counter = 0
+
+    def new_var() -> Symbol:
+        nonlocal counter
+        while True:
+            counter += 1
+            name = f"{prefix}{counter}"
+            if name not in existing_vars:
+                existing_vars.add(name)
+                return name
+
+    return new_var
+
+
+def _expand_leading(glc: GLC, targets: List[Production], bodies, budget=None, phase: str = None) -> Set[int]:
+    """
+    Troca o primeiro símbolo de cada produção em `targets` por cada corpo de
+    `bodies`, mexendo só nos grupos dessas produções. Produções repetidas são
+    descartadas pelo conjunto de chaves da GLC. Retorna os ids dos primeiros
+    símbolos das produções adicionadas. Com `budget`, o tamanho e o tempo
+    são conferidos a cada produção expandida.
+    """
+    glc.remove_productions(targets)
+    firsts = set()
+    for p in targets:
+        tail = p.rhs_ids[1:]
+        for body in bodies:
+            new_p = Production.from_ids(p.lhs_id, body + tail)
+            if not glc.has_production(new_p):
+                glc.add_production(new_p)
+                firsts.add(new_p.rhs_ids[0])
+        budget_check_running(budget, phase, glc, glc.production_count)
+    return firsts
+
+
+def substitute_in_glc(glc: GLC, Ai: Symbol, Aj: Symbol) -> bool:
+    """
+    Substitui Aj no início das produções de Ai, alterando apenas o grupo
+    de produções de Ai. Retorna False se nenhuma produção começava com Aj.
+    """
+    Aj_id = SYMBOLS.intern(Aj)
+    targets = [p for p in glc.productions_of(Ai) if p.rhs_ids and p.rhs_ids[0] == Aj_id]
+    if not targets:
+        return False
+    _expand_leading(glc, targets, [p.rhs_ids for p in glc.productions_of(Aj)])
+    return True
+
+
 def substitute_Aj_into_Ai(productions: List[Production], Ai: Symbol, Aj: Symbol) -> List[Production]:
     """Substitui Aj no início das produções de Ai"""
-    new_prods: List[Production] = []
-    Aj_prods = [p for p in productions if p.lhs == Aj]
-    for p in productions:
-        if p.lhs != Ai:
-            new_prods.append(p)
-            continue
-        rhs = p.rhs
-        if rhs and rhs[0] == Aj:
-            for ajp in Aj_prods:
-                new_prods.append(Production(Ai, ajp.rhs + rhs[1:]))
-        else:
-            new_prods.append(p)
-    return remove_duplicate_productions(new_prods)
+    glc = GLC([], [], None, remove_duplicate_productions(productions))
+    substitute_in_glc(glc, Ai, Aj)
+    return glc.productions
 
 
-def eliminate_immediate_left_recursion(productions: List[Production], A: Symbol, existing_vars: Set[Symbol]):
-    """Elimina recursão à esquerda imediata usando variável Z"""
-    prods_A = [p for p in productions if p.lhs == A]
-    others = [p for p in productions if p.lhs != A]
+def eliminate_left_recursion_in_glc(glc: GLC, A: Symbol, existing_vars: Set[Symbol], new_var=None) -> List[Symbol]:
+    """
+    Elimina a recursão à esquerda imediata de A na própria gramática,
+    criando uma variável Z. Retorna a lista de variáveis criadas.
+    `new_var` é um gerador de new_var_generator_factory; se omitido, o
+    primeiro Zn livre em existing_vars é usado.
+    """
+    A_id = SYMBOLS.intern(A)
+    prods_A = list(glc.productions_of(A))
 
     alphas, betas = [], []
     for p in prods_A:
-        if p.rhs and p.rhs[0] == A:
-            alphas.append(p.rhs[1:])
+        if p.rhs_ids and p.rhs_ids[0] == A_id:
+            alphas.append(p.rhs_ids[1:])
         else:
-            betas.append(p.rhs)
+            betas.append(p.rhs_ids)
 
     if not alphas:
-        return productions, []
+        return []
 
-    counter = 1
-    while f"Z{counter}" in existing_vars:
-        counter += 1
-    Z = f"Z{counter}"
-    existing_vars.add(Z)
+    if new_var is None:
+        new_var = new_var_generator_factory(existing_vars)
+    Z = new_var()
+    Z_id = SYMBOLS.intern(Z)
+
+    glc.remove_productions(prods_A)
 
-    new_prods = []
     # A -> βZ | β para cada β
     for beta in betas:
-        if beta == ['&']:
-            new_prods.append(Production(A, [Z]))
+        if beta == (EPSILON_ID,):
+            glc.add_production(Production.from_ids(A_id, (Z_id,)))
         else:
-            new_prods.append(Production(A, beta + [Z]))
-            new_prods.append(Production(A, beta))
+            glc.add_production(Production.from_ids(A_id, beta + (Z_id,)))
+            glc.add_production(Production.from_ids(A_id, beta))
     
     # Z -> αZ | α para cada α
     for alpha in alphas:
-        new_prods.append(Production(Z, alpha + [Z]))
-        new_prods.append(Production(Z, alpha))
+        glc.add_production(Production.from_ids(Z_id, alpha + (Z_id,)))
+        glc.add_production(Production.from_ids(Z_id, alpha))
+
+    return [Z]
+
 
-    return others + new_prods, [Z]
+def eliminate_immediate_left_recursion(productions: List[Production], A: Symbol, existing_vars: Set[Symbol]):
+    """Elimina recursão à esquerda imediata usando variável Z"""
+    glc = GLC([], [], None, productions)
+    new_vars = eliminate_left_recursion_in_glc(glc, A, existing_vars)
+    if not new_vars:
+        return productions, []
+    return glc.productions, new_vars
 
 
 # ------------------ Função principal ------------------
 
-def convert_to_gnf(src_file: str, log: List) -> GLC:
+def convert_to_gnf(src_file: str, log: List, epsilon_mode: str = "classic", binarize_mode: str = "chain",
+                   metrics=None, budget=None, gnf_method: str = "classic",
+                   gnf_order: str = "topological") -> GLC:
+    """
+    Lê o arquivo e converte a gramática para GNF (ver gnf_from_glc).
+    epsilon_mode e binarize_mode são repassados para a etapa de CNF.
+    """
+    glc = create_grammar(src_file)
+    return gnf_from_glc(glc, log, epsilon_mode, binarize_mode, metrics, budget, gnf_method, gnf_order)
+
+
+def gnf_from_glc(glc: GLC, log, epsilon_mode: str = "classic", binarize_mode: str = "chain",
+                 metrics=None, budget=None, gnf_method: str = "classic",
+                 gnf_order: str = "topological") -> GLC:
     """
     Converte gramática para Forma Normal de Greibach seguindo os passos:
-    1. Converter para CNF
+    1. Converter para CNF (reaproveitando a gramática já lida)
     2. Renomear variáveis para A1, A2, ...
     3. Eliminar recursão à esquerda
     4. Garantir que todas as produções comecem com terminal
+
+    Com gnf_method="rosenkrantz", os passos 2 a 4 dão lugar à construção
+    por cantos à esquerda (ver left_corner_gnf), de saída polinomial.
+    `gnf_order` escolhe a ordem A1..An do método clássico (ver
+    ORDERING_STRATEGIES).
+
+    Com `metrics` (PipelineMetrics), as fases da CNF e da GNF são medidas
+    em um único registro. Com `budget` (Budget), cada fase e cada
+    substituição conferem os limites, e a saída de cada substituição é
+    estimada antes de ser gerada.
     """
+    if gnf_method not in GNF_METHODS:
+        raise ValueError(f"Método de GNF inválido: {gnf_method}")
+    if gnf_order not in ORDERING_STRATEGIES:
+        raise ValueError(f"Estratégia de ordenação inválida: {gnf_order}")
+
     # Passo 1: Converter para CNF primeiro
-    glc = create_grammar(src_file)
-    log_step(log, "Gramática Original", glc)
+    log_step(log, "Gramática Original", glc, LOG_SUMMARY)
+    metrics_start(metrics, glc)
+    budget_start(budget, glc)
     
-    cnf_glc = convert_to_cnf(src_file, [])  # Converte para CNF
+    # Os passos internos da CNF não entram no log da GNF
+    cnf_glc = cnf_from_glc(glc, None, epsilon_mode, binarize_mode, metrics, budget)
     log_step(log, "Após conversão para CNF", cnf_glc)
 
+    if gnf_method == "rosenkrantz":
+        glc = left_corner_gnf(cnf_glc, log, metrics, budget)
+    else:
+        glc = _ordered_gnf(cnf_glc, log, metrics, budget, gnf_order)
+
+    # Remove produções epsilon se houver
+    glc.remove_productions([p for p in glc.productions if p.is_epsilon()])
+    
+    log_step(log, "GNF final", glc, LOG_SUMMARY)
+    metrics_phase(metrics, "back-substitution", glc)
+    metrics_finish(metrics, glc)
+    budget_finish(budget)
+    return glc
+
+
+def _ordered_gnf(cnf_glc: GLC, log, metrics, budget, gnf_order: str = "topological") -> GLC:
+    """
+    Passos 2 a 4 do método clássico, sobre a gramática em CNF.
+
+    A ordem A1..An segue a ordem topológica das componentes do grafo de
+    cantos à esquerda: toda produção que começa por variável de outra
+    componente já começa por um Ak de índice maior. Assim, só as variáveis
+    de componentes com recursão à esquerda passam pelas substituições e
+    pela criação de variáveis Z; as demais esperam a substituição de volta.
+    A ordem dentro dessa restrição vem da estratégia `gnf_order`.
+    """
     # Passo 2: Renomear variáveis para A1, A2, A3, ...
-    renamed_glc, _, _ = rename_variables_to_Ai(cnf_glc)
+    analysis = GrammarAnalysis(cnf_glc)
+    components = left_recursive_components(cnf_glc, analysis)
+    order = variable_order(cnf_glc, gnf_order, components, analysis)
+    renamed_glc, original_to_Ai, _ = rename_variables_to_Ai(cnf_glc, order)
+    recursive = {original_to_Ai[v] for component, is_recursive in components if is_recursive
+                 for v in component}
     log_step(log, "Após renomear variáveis para A1..An", renamed_glc)
+    metrics_phase(metrics, "rename", renamed_glc)
 
     # Passo 3: Eliminar recursão à esquerda
-    productions = list(renamed_glc.productions)
+    # A gramática de trabalho é alterada no lugar, grupo a grupo
+    glc = renamed_glc
     Ai_vars = list(renamed_glc.variables)
+    Ai_ids = [SYMBOLS.intern(v) for v in Ai_vars]
+    rank = {v_id: k for k, v_id in enumerate(Ai_ids)}
     existing_vars = set(Ai_vars)
+    new_var = new_var_generator_factory(existing_vars)
     z_vars = []
 
     for i, Ai in enumerate(Ai_vars):
-        # Substitui Aj em Ai para j < i
-        for j in range(i):
-            Aj = Ai_vars[j]
-            productions = substitute_Aj_into_Ai(productions, Ai, Aj)
-            log_step(log, f"Substituindo {Aj} em {Ai}", 
-                    GLC(Ai_vars + z_vars, renamed_glc.alphabet, renamed_glc.start, productions))
+        if Ai not in recursive:
+            continue
+
+        # Substitui Aj em Ai para j < i, mas só os Aj que de fato iniciam
+        # alguma produção de Ai, em ordem crescente de j. Após substituir Aj,
+        # os novos inícios têm índice > j, então cada Aj é visitado uma vez.
+        pending = {rank[p.rhs_ids[0]] for p in glc.productions_of(Ai)
+                   if p.rhs_ids and rank.get(p.rhs_ids[0], i) < i}
+        heap = list(pending)
+        heapq.heapify(heap)
+        while heap:
+            j = heapq.heappop(heap)
+            Aj_id = Ai_ids[j]
+            targets = [p for p in glc.productions_of(Ai) if p.rhs_ids and p.rhs_ids[0] == Aj_id]
+            if not targets:
+                continue
+            bodies = [p.rhs_ids for p in glc.productions_of(Ai_vars[j])]
+            budget_check_estimate(budget, "left-recursion", glc,
+                                  glc.production_count + len(targets) * (len(bodies) - 1))
+            firsts = _expand_leading(glc, targets, bodies, budget, "left-recursion")
+            for f in firsts:
+                k = rank.get(f, i)
+                if k < i and k not in pending:
+                    pending.add(k)
+                    heapq.heappush(heap, k)
+            log_step(log, f"Substituindo {Ai_vars[j]} em {Ai}", glc, LOG_SUBSTITUTION)
+            metrics_substitution(metrics, "substitute", Ai, Ai_vars[j], glc)
+            budget_check(budget, "left-recursion", glc)
         
         # Elimina recursão à esquerda imediata em Ai
-        productions, new_vars = eliminate_immediate_left_recursion(productions, Ai, existing_vars)
+        new_vars = eliminate_left_recursion_in_glc(glc, Ai, existing_vars, new_var)
         if new_vars:
             z_vars.extend(new_vars)
-            log_step(log, f"Eliminada recursão à esquerda em {Ai}, criadas: {', '.join(new_vars)}",
-                     GLC(Ai_vars + z_vars, renamed_glc.alphabet, renamed_glc.start, productions))
+            glc.variables = Ai_vars + z_vars
+            log_step(log, f"Eliminada recursão à esquerda em {Ai}, criadas: {', '.join(new_vars)}", glc,
+                     LOG_SUBSTITUTION)
+            metrics_substitution(metrics, "left-recursion", Ai, Ai, glc, len(new_vars))
+            budget_check(budget, "left-recursion", glc)
 
-    log_step(log, "Após eliminar toda recursão à esquerda", 
-             GLC(Ai_vars + z_vars, renamed_glc.alphabet, renamed_glc.start, productions))
+    log_step(log, "Após eliminar toda recursão à esquerda", glc)
+    metrics_phase(metrics, "left-recursion", glc)
 
     # Passo 4: Converter para GNF
-    # Processa variáveis em ordem reversa (An, An-1, ..., A1)
-    all_vars = Ai_vars + z_vars
-    alphabet = set(renamed_glc.alphabet)
+    # Processa variáveis em ordem reversa (An, An-1, ..., A1). As produções
+    # a reescrever vêm direto do índice por primeiro símbolo.
+    alphabet = set(SYMBOLS.lookup(a) for a in glc.alphabet)
+    z_ids = {SYMBOLS.intern(z) for z in z_vars}
     
     for i in range(len(Ai_vars) - 1, -1, -1):
         Ai = Ai_vars[i]
-        Ai_prods = [p for p in productions if p.lhs == Ai]
+        Ai_prods = glc.productions_of(Ai)
         
         # Verifica se Ai já está em GNF
-        is_gnf = all(p.rhs and p.rhs[0] in alphabet for p in Ai_prods)
+        is_gnf = all(p.rhs_ids and p.rhs_ids[0] in alphabet for p in Ai_prods)
         
         if is_gnf:
-            # Substitui Ai em todas as variáveis Aj onde j < i
-            for j in range(i):
-                Aj = Ai_vars[j]
-                productions = substitute_Aj_into_Ai(productions, Aj, Ai)
-            
-            # Substitui Ai em todas as variáveis Z
-            for z_var in z_vars:
-                productions = substitute_Aj_into_Ai(productions, z_var, Ai)
-            
-            log_step(log, f"Substituindo {Ai} (em GNF) nas outras variáveis", 
-                     GLC(all_vars, renamed_glc.alphabet, renamed_glc.start, productions))
-    
-    # Remove produções epsilon se houver
-    productions = [p for p in productions if p.rhs != ['&']]
-    productions = remove_duplicate_productions(productions)
-    
-    final_glc = GLC(all_vars, renamed_glc.alphabet, renamed_glc.start, productions)
-    log_step(log, "GNF final", final_glc)
-    return final_glc
\ No newline at end of file
+            # Substitui Ai nas variáveis Aj (j < i) e nas variáveis Z
+            targets = [p for p in glc.productions_starting_with(Ai)
+                       if p.lhs_id in z_ids or rank.get(p.lhs_id, i) < i]
+            if targets:
+                budget_check_estimate(budget, "back-substitution", glc,
+                                      glc.production_count + len(targets) * (len(Ai_prods) - 1))
+                _expand_leading(glc, targets, [p.rhs_ids for p in Ai_prods], budget, "back-substitution")
+                log_step(log, f"Substituindo {Ai} (em GNF) nas outras variáveis", glc, LOG_SUBSTITUTION)
+                metrics_substitution(metrics, "back-substitute", "*", Ai, glc)
+                budget_check(budget, "back-substitution", glc)
+
+    return glc
+
+
+# ------------------ Construção por cantos à esquerda ------------------
+
+def left_corner_system(glc: GLC, new_var=None) -> Tuple[GLC, List[Symbol]]:
+    """
+    Monta o sistema de Rosenkrantz para uma gramática em CNF (sem
+    unitárias; produções vazias são ignoradas). Escrevendo as variáveis como vetor, A = A·R + S, onde
+    R[B][A] são os C de cada A -> B C (B é canto à esquerda de A) e S[A]
+    os terminais de A -> a. A solução é A = S + S·Y com Y = R + R·Y:
+
+        A  -> a | a Y[B][A]           para B -> a e A ⇒+ B ... à esquerda
+        Y[B][A] -> C | C Y[D][A]      para D -> B C
+
+    Y[B][A] só existe se A alcança B no grafo de cantos à esquerda, então
+    a saída é polinomial. As produções de A já começam por terminal; as de
+    Y ainda começam pela variável C (ver left_corner_gnf). Retorna a
+    gramática e as variáveis Y criadas.
+    """
+    analysis = GrammarAnalysis(glc)
+    variable_ids = analysis.position
+    terminal_bodies: Dict[int, List[tuple]] = {}
+    corners: Dict[int, List[Tuple[int, int]]] = {}   # B -> [(A, C)] para A -> B C
+
+    for p in glc.productions:
+        rhs = p.rhs_ids
+        if rhs == (EPSILON_ID,):
+            # Como no método clássico, as vazias não entram na GNF
+            continue
+        if len(rhs) == 2 and rhs[0] in variable_ids and rhs[1] in variable_ids:
+            corners.setdefault(rhs[0], []).append((p.lhs_id, rhs[1]))
+        elif len(rhs) == 1 and rhs[0] not in variable_ids:
+            terminal_bodies.setdefault(p.lhs_id, []).append(rhs)
+        else:
+            raise ValueError(f"Produção fora da CNF: {p}")
+
+    if new_var is None:
+        new_var = new_var_generator_factory(set(glc.variables), "Y")
+    y_names: Dict[Tuple[int, int], int] = {}
+    y_vars: List[Symbol] = []
+
+    def y(B, A):
+        key = (B, A)
+        if key not in y_names:
+            name = new_var()
+            y_vars.append(name)
+            y_names[key] = SYMBOLS.intern(name)
+        return y_names[key]
+
+    productions = []
+    ids = analysis.ids
+    closure = analysis.left_corner_closure()
+    for i, A in enumerate(ids):
+        # Cantos à esquerda alcançáveis a partir de A em um ou mais passos
+        corner_ids = [ids[j] for j in iter_bits(closure[i])]
+        reach = set(corner_ids)
+
+        for body in terminal_bodies.get(A, ()):
+            productions.append(Production.from_ids(A, body))
+        for B in corner_ids:
+            for body in terminal_bodies.get(B, ()):
+                productions.append(Production.from_ids(A, body + (y(B, A),)))
+            for D, C in corners.get(B, ()):
+                if D == A:
+                    productions.append(Production.from_ids(y(B, A), (C,)))
+                if D in reach:
+                    productions.append(Production.from_ids(y(B, A), (C, y(D, A))))
+
+    return GLC(list(glc.variables) + y_vars, glc.alphabet, glc.start, productions), y_vars
+
+
+def left_corner_gnf(cnf_glc: GLC, log=None, metrics=None, budget=None) -> GLC:
+    """
+    GNF pela construção de Rosenkrantz: monta o sistema de cantos à esquerda
+    (left_corner_system) e troca a variável inicial de cada produção de Y
+    pelos corpos dela, que já começam por terminal. Sem recursão à esquerda
+    a eliminar e sem a substituição em cadeia A1..An, o tamanho da saída é
+    polinomial no da CNF. Os Y que não levam a nada são podados no fim.
+    """
+    glc, y_vars = left_corner_system(cnf_glc)
+    log_step(log, "Após montar o sistema de cantos à esquerda", glc)
+    metrics_phase(metrics, "left-corner", glc)
+    budget_check(budget, "left-corner", glc)
+
+    # Só as produções de Y começam por variável, e essas variáveis são as da
+    # CNF, cujas produções já estão em GNF: uma única passada basta
+    alphabet = {SYMBOLS.intern(a) for a in glc.alphabet}
+    leads = {p.rhs_ids[0] for p in glc.productions if p.rhs_ids[0] not in alphabet}
+    estimated = glc.production_count
+    for B in leads:
+        B_name = SYMBOLS.name(B)
+        estimated += len(glc.productions_starting_with(B_name)) * (len(glc.productions_of(B_name)) - 1)
+    budget_check_estimate(budget, "back-substitution", glc, estimated)
+
+    for B in leads:
+        B_name = SYMBOLS.name(B)
+        targets = list(glc.productions_starting_with(B_name))
+        _expand_leading(glc, targets, [p.rhs_ids for p in glc.productions_of(B_name)], budget,
+                        "back-substitution")
+        log_step(log, f"Substituindo {B_name} (em GNF) nas variáveis Y", glc, LOG_SUBSTITUTION)
+        metrics_substitution(metrics, "back-substitute", "Y", B_name, glc)
+        budget_check(budget, "back-substitution", glc)
+
+    return remove_useless_symbols(glc)
+
+
+# ------------------ Saída fatorada à esquerda ------------------
+
+def left_factor(glc: GLC, prefix: str = "F") -> GLC:
+    """
+    Fatoração à esquerda da gramática (modo de saída opcional, em geral
+    sobre a GNF). Os corpos de cada variável vão para uma RhsTrie, o que já
+    descarta as repetidas; cada ponto onde corpos com o mesmo prefixo se
+    separam vira uma variável nova F:
+
+        A -> aBC | aBD | aB    =>    A -> aB | aB F1,  F1 -> C | D
+
+    Não cria produções vazias (quando um corpo termina no ponto de
+    separação, ele é mantido inteiro). A saída gera a mesma linguagem, mas
+    as produções de F começam por variável: não está mais em GNF.
+    """
+    tries: Dict[int, RhsTrie] = {}
+    for p in glc.productions:
+        tries.setdefault(p.lhs_id, RhsTrie()).add(p.rhs_ids)
+
+    new_var = new_var_generator_factory(set(glc.variables), prefix)
+    created = []
+    productions = []
+    work = [(lhs, trie.root) for lhs, trie in tries.items()]
+    k = 0
+    while k < len(work):
+        lhs, node = work[k]
+        k += 1
+        for s, child in RhsTrie.children(node):
+            # Desce enquanto o caminho não se ramifica nem termina um corpo
+            path = [s]
+            branches = RhsTrie.children(child)
+            while not RhsTrie.ends_here(child) and len(branches) == 1:
+                (sym, child), = branches
+                path.append(sym)
+                branches = RhsTrie.children(child)
+            if RhsTrie.ends_here(child):
+                productions.append(Production.from_ids(lhs, tuple(path)))
+            if branches:
+                F = new_var()
+                created.append(F)
+                F_id = SYMBOLS.intern(F)
+                productions.append(Production.from_ids(lhs, tuple(path) + (F_id,)))
+                work.append((F_id, child))
+
+    return GLC(list(glc.variables) + created, list(glc.alphabet), glc.start, productions)
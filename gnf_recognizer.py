@@ -0,0 +1,208 @@
+"""
+Reconhecedor da esquerda para a direita sobre uma gramática em GNF (saída
+de convert_to_gnf / gnf_from_glc).
+
+Em GNF toda produção é A -> a B1 ... Bk, então cada passo da derivação
+consome exatamente um terminal. O reconhecedor simula o autômato de pilha
+não determinístico correspondente: ler `a` com A no topo troca A por
+B1 ... Bk. As pilhas possíveis ficam em uma pilha com estrutura de grafo
+(GSS): os nós são compartilhados entre configurações e, a cada posição, as
+configurações com o mesmo topo são fundidas em um único nó. Em gramáticas
+pouco ambíguas o custo por token depende só da gramática e do número de
+topos ativos, não do tamanho da entrada já lida; em gramáticas muito
+ambíguas os conjuntos de nós de baixo crescem com a entrada.
+
+O estado de cada prefixo é guardado, então uma entrada recebida aos poucos
+(ex.: um editor) pode voltar alguns tokens com truncate() e seguir
+alimentando sem reprocessar o início.
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from models import GLC, SYMBOLS, EPSILON_ID
+from parser import SymbolTrie
+from gnf import gnf_from_glc
+
+Symbol = str
+Word = Union[str, Sequence[Symbol]]
+
+
+class _Node:
+    """Nó da GSS: símbolo no topo e os nós abaixo dele (None = fundo da pilha)."""
+    __slots__ = ("symbol", "parents")
+
+    def __init__(self, symbol: int, parents):
+        self.symbol = symbol
+        self.parents = parents
+
+
+class _State:
+    """Configurações após um prefixo: topos ativos por símbolo e se a pilha pode estar vazia."""
+    __slots__ = ("tops", "accepts")
+
+    def __init__(self, tops: Dict[int, _Node], accepts: bool):
+        self.tops = tops
+        self.accepts = accepts
+
+
+class GNFRecognizer:
+    """
+    Reconhecedor para uma GLC em GNF. As produções são indexadas por
+    (lado esquerdo, terminal inicial) -> restos do corpo.
+    """
+
+    def __init__(self, glc: GLC):
+        variable_ids = {SYMBOLS.intern(v) for v in glc.variables}
+        variable_ids.update(p.lhs_id for p in glc.productions)
+        self._start = SYMBOLS.lookup(glc.start) if glc.start else None
+
+        index: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
+        terminals: Set[int] = {SYMBOLS.intern(a) for a in glc.alphabet}
+        accepts_empty = False
+
+        for p in glc.productions:
+            rhs = p.rhs_ids
+            if rhs == (EPSILON_ID,):
+                if p.lhs_id != self._start:
+                    raise ValueError(f"Produção vazia fora do símbolo inicial: {p}")
+                accepts_empty = True
+                continue
+            if not rhs or rhs[0] in variable_ids:
+                raise ValueError(f"Produção fora da GNF: {p}")
+            terminals.add(rhs[0])
+            index.setdefault((p.lhs_id, rhs[0]), []).append(rhs[1:])
+
+        # Terminais no meio de um corpo são casados com a entrada e saem da pilha
+        for t in terminals:
+            index.setdefault((t, t), []).append(())
+
+        self._index = index
+        self._accepts_empty = accepts_empty
+        self._tokenizer = SymbolTrie(SYMBOLS.name(t) for t in terminals)
+
+    @classmethod
+    def from_grammar(cls, glc: GLC, **cnf_options) -> "GNFRecognizer":
+        """Converte `glc` para GNF (sem log) e monta o reconhecedor."""
+        return cls(gnf_from_glc(glc, None, **cnf_options))
+
+    # ------------------ Transição ------------------
+
+    def initial_state(self) -> _State:
+        if self._start is None:
+            return _State({}, False)
+        return _State({self._start: _Node(self._start, frozenset((None,)))}, self._accepts_empty)
+
+    def advance(self, state: _State, token: Symbol) -> _State:
+        """Estado após ler `token` a partir de `state` (o estado dado não muda)."""
+        token_id = SYMBOLS.lookup(token)
+        # Conjuntos de nós de baixo que chegam a cada novo topo. Os conjuntos
+        # nunca são alterados depois de criados, então um topo com uma única
+        # origem reaproveita o conjunto sem copiá-lo.
+        incoming: Dict[int, List] = {}
+        accepts = False
+
+        index = self._index
+        for symbol, node in state.tops.items():
+            for tail in index.get((symbol, token_id), ()):
+                if not tail:
+                    # A -> a: desempilha; os nós de baixo viram topos
+                    for parent in node.parents:
+                        if parent is None:
+                            accepts = True
+                        else:
+                            incoming.setdefault(parent.symbol, []).append(parent.parents)
+                    continue
+                parents = node.parents
+                for s in reversed(tail[1:]):
+                    parents = frozenset((_Node(s, parents),))
+                incoming.setdefault(tail[0], []).append(parents)
+
+        tops = {}
+        for symbol, sources in incoming.items():
+            parents = sources[0] if len(sources) == 1 else frozenset().union(*sources)
+            tops[symbol] = _Node(symbol, parents)
+        return _State(tops, accepts)
+
+    # ------------------ Consultas ------------------
+
+    def _tokens(self, word: Word) -> List[Symbol]:
+        if isinstance(word, str):
+            return self._tokenizer.tokenize(word.replace(" ", ""))
+        return list(word)
+
+    def stream(self) -> "GNFStream":
+        return GNFStream(self)
+
+    def recognize(self, word: Word) -> bool:
+        """Indica se a gramática gera a palavra (string ou lista de símbolos)."""
+        stream = self.stream()
+        for token in self._tokens(word):
+            if not stream.feed(token):
+                return False
+        return stream.accepted
+
+    def recognize_many(self, words: Iterable[Word]) -> List[bool]:
+        """
+        Testa várias palavras. Elas são processadas em ordem lexicográfica e
+        cada uma reaproveita os estados do prefixo comum com a anterior.
+        """
+        token_lists = [tuple(self._tokens(w)) for w in words]
+        results: List[Optional[bool]] = [None] * len(token_lists)
+        stream = self.stream()
+        for pos in sorted(range(len(token_lists)), key=lambda k: token_lists[k]):
+            tokens = token_lists[pos]
+            common = 0
+            fed = stream.tokens
+            while common < len(fed) and common < len(tokens) and fed[common] == tokens[common]:
+                common += 1
+            stream.truncate(common)
+            for token in tokens[common:]:
+                stream.feed(token)
+            results[pos] = stream.accepted
+        return results
+
+
+class GNFStream:
+    """
+    Reconhecimento incremental: feed() recebe um token por vez. Os estados
+    de todos os prefixos ficam guardados para que truncate() desfaça tokens
+    sem recomeçar do início.
+    """
+
+    def __init__(self, recognizer: GNFRecognizer):
+        self._recognizer = recognizer
+        self._states = [recognizer.initial_state()]
+        self.tokens: List[Symbol] = []
+
+    def feed(self, token: Symbol) -> bool:
+        """Consome um token; retorna False se nenhuma continuação é mais possível."""
+        state = self._states[-1]
+        if state.tops:
+            state = self._recognizer.advance(state, token)
+        else:
+            state = _State({}, False)
+        self._states.append(state)
+        self.tokens.append(token)
+        return self.alive
+
+    def feed_text(self, text: str) -> bool:
+        alive = True
+        for token in self._recognizer._tokens(text):
+            alive = self.feed(token)
+        return alive
+
+    def truncate(self, length: int):
+        """Volta ao estado após os primeiros `length` tokens."""
+        del self._states[length + 1:]
+        del self.tokens[length:]
+
+    @property
+    def accepted(self) -> bool:
+        """O que foi lido até agora é uma palavra da linguagem."""
+        return self._states[-1].accepts
+
+    @property
+    def alive(self) -> bool:
+        """O que foi lido ainda é prefixo de alguma palavra (ou palavra)."""
+        state = self._states[-1]
+        return bool(state.tops) or state.accepts
@@ -1,28 +1,191 @@
 import sys
-from cnf import convert_to_cnf
-from gnf import convert_to_gnf
+import json
+import argparse
+from cnf import EPSILON_MODES, BINARIZE_MODES
+from gnf import GNF_METHODS, ORDERING_STRATEGIES, left_factor
+from parser import create_grammar, write_grammar
+from glc_binary import save_grammar
+from utils_log import StepLogger, FileSink, LOG_LEVELS, LOG_SUMMARY, log_step
+from batch import run_batch, summarize
+from cache import NormalizationCache, cached_normalize
+from cyk import CYKParser
+from gnf_recognizer import GNFRecognizer
+from utils_metrics import PipelineMetrics
+from utils_budget import Budget, BudgetExceeded
+
+USAGE = ("python main.py <arquivo.txt> <cnf|gnf> <saida.log> [--epsilon classic|bin] "
+         "[--binarize chain|shared] [--gnf-method classic|rosenkrantz] "
+         "[--gnf-order topological|fewest-productions|reverse-postorder|best] [--log-level off|summary|phase|substitution] [--log-delta] "
+         "[--save <gramatica.txt>] [--save-binary <gramatica.glcb>] [--words <palavras.txt>] "
+         "[--stats <metricas.json>] [--stats-memory] [--stats-substitutions] [--left-factor]\n"
+         "       python main.py --batch <diretório|glob|manifesto> <cnf|gnf> <pasta_saida> "
+         "[--workers N] [--timeout S]\n"
+         "       (ambos aceitam --cache <diretório> [--cache-size MB] e os limites "
+         "--max-productions N --max-variables N --max-seconds S)")
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(usage=USAGE)
+    parser.add_argument("src", help="arquivo da gramática (ou entrada do lote com --batch)")
+    parser.add_argument("mode", help="cnf ou gnf")
+    parser.add_argument("out", help="arquivo de log (ou pasta de saída com --batch)")
+    parser.add_argument(
+        "--epsilon", choices=EPSILON_MODES, default="classic",
+        help="remoção de vazias: classic (todas as combinações) ou bin (binariza antes, saída linear)"
+    )
+    parser.add_argument(
+        "--binarize", choices=BINARIZE_MODES, default="chain",
+        help="binarização: chain (cadeia nova por produção) ou shared (um C_n por sufixo distinto)"
+    )
+    parser.add_argument(
+        "--gnf-method", choices=GNF_METHODS, default="classic",
+        help="construção da GNF: classic (ordem A1..An, pode explodir) ou rosenkrantz (saída polinomial)"
+    )
+    parser.add_argument(
+        "--gnf-order", choices=ORDERING_STRATEGIES, default="topological",
+        help="ordem A1..An da GNF clássica; best estima o tamanho da saída com cada ordem e usa a menor"
+    )
+    parser.add_argument(
+        "--log-level", choices=list(LOG_LEVELS), default=None,
+        help="detalhe do log: off, summary, phase (padrão; summary no lote) ou substitution (cada passo da GNF)"
+    )
+    parser.add_argument(
+        "--log-delta", action="store_true",
+        help="registra só as produções adicionadas/removidas em cada passo"
+    )
+    parser.add_argument(
+        "--save", default=None,
+        help="grava a gramática resultante em formato de entrada (pode ser lida de novo)"
+    )
+    parser.add_argument(
+        "--save-binary", default=None,
+        help="grava a gramática resultante no formato binário (.glcb), de leitura rápida"
+    )
+    parser.add_argument(
+        "--words", default=None,
+        help="testa cada palavra do arquivo (uma por linha, & = vazia) contra a gramática resultante"
+    )
+    parser.add_argument(
+        "--left-factor", action="store_true",
+        help="fatora à esquerda a gramática salva com --save/--save-binary (deixa de estar em CNF/GNF)"
+    )
+    parser.add_argument(
+        "--stats", default=None,
+        help="grava em JSON as métricas de cada fase (tempo, produções, variáveis criadas)"
+    )
+    parser.add_argument(
+        "--stats-memory", action="store_true",
+        help="inclui nas métricas o pico de memória de cada fase (mais lento)"
+    )
+    parser.add_argument(
+        "--stats-substitutions", action="store_true",
+        help="inclui nas métricas cada substituição do laço da GNF"
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="processa em lote um diretório, glob ou manifesto (um caminho por linha)"
+    )
+    parser.add_argument("--workers", type=int, default=None, help="processos trabalhadores do lote")
+    parser.add_argument("--timeout", type=float, default=None, help="tempo limite por gramática, em segundos")
+    parser.add_argument("--max-productions", type=int, default=None,
+                        help="interrompe a conversão se a gramática passar de N produções")
+    parser.add_argument("--max-variables", type=int, default=None,
+                        help="interrompe a conversão se forem criadas mais de N variáveis")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="interrompe a conversão depois de S segundos")
+    parser.add_argument("--cache", default=None, help="diretório do cache de resultados")
+    parser.add_argument("--cache-size", type=float, default=256, help="tamanho máximo do cache, em MB")
+    return parser
+
+def check_words(glc, mode, words_file):
+    """Reconhece em lote as palavras do arquivo: CYK sobre a CNF, pilha sobre a GNF."""
+    with open(words_file, "r", encoding="utf-8") as f:
+        words = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    try:
+        parser = CYKParser(glc) if mode == "cnf" else GNFRecognizer(glc)
+    except ValueError as e:
+        print(f"Não foi possível testar as palavras: {e}")
+        return
+    results = parser.recognize_many("" if w in ("&", "ε") else w for w in words)
+    for word, accepted in zip(words, results):
+        print(f"{word}: {'aceita' if accepted else 'rejeitada'}")
+    print(f"Aceitas: {sum(results)} de {len(words)}")
 
 def main():
     if len(sys.argv) < 4:
-        print("Uso: python main.py <arquivo.txt> <cnf|gnf> <saida.log>")
+        print("Uso: " + USAGE)
         return
 
-    src = sys.argv[1]
-    mode = sys.argv[2].lower()
-    out = sys.argv[3]
-
-    log = []
+    args = build_arg_parser().parse_args()
+    src = args.src
+    mode = args.mode.lower()
+    out = args.out
 
-    if mode == "cnf":
-        convert_to_cnf(src, log)
-    elif mode == "gnf":
-        convert_to_gnf(src, log)
-    else:
+    if mode not in ("cnf", "gnf"):
         print("Modo inválido. Use cnf ou gnf.")
         return
 
-    with open(out, "w", encoding="utf-8") as f:
-        f.write("\n".join(log))
+    options = {"epsilon_mode": args.epsilon, "binarize_mode": args.binarize}
+    if mode == "gnf":
+        options["gnf_method"] = args.gnf_method
+        options["gnf_order"] = args.gnf_order
+    # No lote o padrão é registrar só a gramática original e a final
+    log_level = args.log_level or ("summary" if args.batch else "phase")
+
+    cache = None
+    if args.cache:
+        cache = NormalizationCache(args.cache, int(args.cache_size * 1024 * 1024))
+
+    budget = None
+    if args.max_productions is not None or args.max_variables is not None or args.max_seconds is not None:
+        budget = Budget(args.max_productions, args.max_variables, args.max_seconds)
+
+    if args.batch:
+        records = run_batch(src, mode, out, args.workers, args.timeout, options, LOG_LEVELS[log_level], cache,
+                            budget, args.log_delta)
+        print(summarize(records))
+        print(f"Resumo salvo em {out}")
+        return
+
+    metrics = None
+    if args.stats:
+        metrics = PipelineMetrics(args.stats_memory, args.stats_substitutions)
+
+    # O log é escrito no arquivo à medida que os passos acontecem
+    with FileSink(out) as sink:
+        log = None
+        if log_level != "off":
+            log = StepLogger(sink, LOG_LEVELS[log_level], args.log_delta)
+
+        try:
+            result = cached_normalize(create_grammar(src), mode, options, cache, log, metrics, budget)
+        except BudgetExceeded as e:
+            print(f"Conversão interrompida: {e}")
+            print(json.dumps(e.to_dict(), ensure_ascii=False))
+            result = None
+
+        # As palavras continuam sendo testadas na forma normal; só a saída é fatorada
+        output = result
+        if result is not None and args.left_factor:
+            output = left_factor(result)
+            log_step(log, "Saída fatorada à esquerda", output, LOG_SUMMARY)
+
+    # As métricas das fases concluídas são gravadas mesmo se o limite estourou
+    if metrics is not None:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(metrics.to_dict(), f, ensure_ascii=False, indent=1)
+        print(f"Métricas salvas em {args.stats}")
+    if result is None:
+        return
+
+    if args.words:
+        check_words(result, mode, args.words)
+
+    if args.save:
+        write_grammar(output, args.save)
+        print(f"Gramática resultante salva em {args.save}")
+    if args.save_binary:
+        save_grammar(output, args.save_binary)
+        print(f"Gramática resultante salva em {args.save_binary}")
 
     print(f"Processo concluído. Log salvo em {out}")
 
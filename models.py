@@ -1,41 +1,372 @@
-from typing import List
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Tuple
 
 Symbol = str
+SymbolId = int
+
+EPSILON = "&"
+
+
+class SymbolTable:
+    """
+    Tabela de símbolos: associa cada variável/terminal a um inteiro pequeno.
+    Cada nome é guardado uma única vez; as produções guardam apenas os ids.
+    """
+    __slots__ = ("_ids", "_names")
+
+    def __init__(self):
+        self._ids: Dict[Symbol, SymbolId] = {}
+        self._names: List[Symbol] = []
+
+    def intern(self, sym: Symbol) -> SymbolId:
+        sid = self._ids.get(sym)
+        if sid is None:
+            sid = len(self._names)
+            self._ids[sym] = sid
+            self._names.append(sym)
+        return sid
+
+    def lookup(self, sym: Symbol):
+        """Retorna o id de um símbolo já internado, ou None."""
+        return self._ids.get(sym)
+
+    def name(self, sid: SymbolId) -> Symbol:
+        return self._names[sid]
+
+    def encode(self, symbols: Iterable[Symbol]) -> Tuple[SymbolId, ...]:
+        return tuple([self.intern(s) for s in symbols])
+
+    def decode(self, ids: Iterable[SymbolId]) -> List[Symbol]:
+        names = self._names
+        return [names[i] for i in ids]
+
+    def __contains__(self, sym: Symbol) -> bool:
+        return sym in self._ids
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def truncate(self, size: int):
+        """Esquece os símbolos internados depois dos `size` primeiros."""
+        for sym in self._names[size:]:
+            del self._ids[sym]
+        del self._names[size:]
+
+    @contextmanager
+    def scope(self):
+        """
+        Símbolos internados dentro do bloco são esquecidos ao sair dele.
+        Nenhuma produção criada no bloco pode ser usada depois: seus ids
+        passam a valer para outros nomes.
+        """
+        size = len(self._names)
+        try:
+            yield self
+        finally:
+            self.truncate(size)
+
+
+# Tabela compartilhada por todas as gramáticas do processo
+SYMBOLS = SymbolTable()
+EPSILON_ID = SYMBOLS.intern(EPSILON)
+
 
 class Production:
+    """
+    Produção A -> α com lado esquerdo e corpo codificados como inteiros.
+    O corpo é uma tupla imutável, então cópias podem compartilhá-la.
+    """
+    __slots__ = ("lhs_id", "rhs_ids")
+
     def __init__(self, lhs: Symbol, rhs: List[Symbol]):
-        self.lhs =  lhs
-        self.rhs = rhs
+        self.lhs_id = SYMBOLS.intern(lhs)
+        self.rhs_ids = SYMBOLS.encode(rhs)
+
+    @classmethod
+    def from_ids(cls, lhs_id: SymbolId, rhs_ids: Tuple[SymbolId, ...]) -> "Production":
+        """Cria a produção direto dos ids, sem passar pelos nomes."""
+        p = cls.__new__(cls)
+        p.lhs_id = lhs_id
+        p.rhs_ids = rhs_ids
+        return p
+
+    @property
+    def lhs(self) -> Symbol:
+        return SYMBOLS.name(self.lhs_id)
+
+    @lhs.setter
+    def lhs(self, value: Symbol):
+        self.lhs_id = SYMBOLS.intern(value)
+
+    @property
+    def rhs(self) -> List[Symbol]:
+        return SYMBOLS.decode(self.rhs_ids)
+
+    @rhs.setter
+    def rhs(self, value: List[Symbol]):
+        self.rhs_ids = SYMBOLS.encode(value)
+
+    @property
+    def key(self) -> Tuple[SymbolId, Tuple[SymbolId, ...]]:
+        """Chave hashable usada para detectar produções duplicadas."""
+        return (self.lhs_id, self.rhs_ids)
 
     def __repr__(self):
-        if not self.rhs or (len(self.rhs) == 1 and self.rhs[0] == "&"):
+        if not self.rhs_ids or self.is_epsilon():
             rhs_str = "&"
         else:
             rhs_str = ''.join(self.rhs)
         return f"{self.lhs} -> {rhs_str}"
-    
+
     def is_epsilon(self):
-        return len(self.rhs) == 1 and self.rhs[0] == "&"
-    
-    def is_unit(self):
-        return len(self.rhs) == 1 and self.rhs[0].isupper()
+        return self.rhs_ids == (EPSILON_ID,)
+
+    def is_unit(self, variable_ids=None):
+        """
+        A -> B. Com `variable_ids` (ids das variáveis da gramática), B precisa
+        estar nesse conjunto; sem ele, vale a convenção de variável maiúscula.
+        """
+        if len(self.rhs_ids) != 1:
+            return False
+        if variable_ids is not None:
+            return self.rhs_ids[0] in variable_ids
+        return SYMBOLS.name(self.rhs_ids[0]).isupper()
+
+# Marca de fim de corpo nos nós da RhsTrie (ids de símbolo são >= 0)
+_END = -1
+
+
+class RhsTrie:
+    """
+    Corpos de um mesmo lado esquerdo em uma trie sobre os ids dos símbolos:
+    corpos com o mesmo prefixo compartilham os nós desse prefixo, e inserir
+    ou procurar um corpo custa O(tamanho do corpo). Cada nó é um dict
+    símbolo -> nó; a chave _END marca que um corpo termina ali. Para
+    percorrer a trie a partir de `root`, use children() e ends_here().
+    """
+    __slots__ = ("root", "_size")
+
+    def __init__(self, bodies: Iterable[Tuple[SymbolId, ...]] = ()):
+        self.root: Dict[SymbolId, dict] = {}
+        self._size = 0
+        for body in bodies:
+            self.add(body)
+
+    def add(self, rhs_ids: Tuple[SymbolId, ...]) -> bool:
+        """Insere o corpo; retorna False se ele já estava na trie."""
+        node = self.root
+        for s in rhs_ids:
+            node = node.setdefault(s, {})
+        if _END in node:
+            return False
+        node[_END] = None
+        self._size += 1
+        return True
+
+    @staticmethod
+    def children(node) -> List[Tuple[SymbolId, dict]]:
+        """Pares (símbolo, nó filho) de `node`, em ordem de inserção."""
+        return [(s, child) for s, child in node.items() if s != _END]
+
+    @staticmethod
+    def ends_here(node) -> bool:
+        """Indica se algum corpo termina em `node`."""
+        return _END in node
+
+    def __contains__(self, rhs_ids) -> bool:
+        node = self.root
+        for s in rhs_ids:
+            node = node.get(s)
+            if node is None:
+                return False
+        return _END in node
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self):
+        """Corpos em pré-ordem: um corpo vem antes dos que o estendem."""
+        stack = [((), self.root)]
+        while stack:
+            prefix, node = stack.pop()
+            if _END in node:
+                yield prefix
+            stack.extend(reversed([(prefix + (s,), child) for s, child in self.children(node)]))
+
+    def node_count(self) -> int:
+        count = 0
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(child for _, child in self.children(node))
+        return count
+
 
 # set -> não ordenado {}
 # list  -> ordenado []
 
 class GLC:
+    """
+    Gramática livre de contexto.
+
+    As produções ficam agrupadas por lado esquerdo, e os índices por primeiro
+    símbolo e por ocorrência são montados sob demanda e mantidos a cada
+    add_production/remove_production. Use esses métodos (ou reatribua
+    `productions`) em vez de alterar a lista retornada por `productions`.
+    """
     def __init__(self, variables : List[Symbol], alphabet: List[str], start: Symbol, productions: List[Production]):
         self.variables = variables
         self.alphabet = alphabet
         self.start = start
         self.productions = productions
 
+    @property
+    def productions(self) -> List[Production]:
+        if self._flat is None:
+            self._flat = [p for bucket in self._by_lhs.values() for p in bucket]
+        return self._flat
+
+    @productions.setter
+    def productions(self, productions: List[Production]):
+        self._by_lhs: Dict[SymbolId, List[Production]] = {}
+        # Corpos de cada lado esquerdo -> quantas cópias há. A chave é a
+        # própria tupla do corpo: detectar repetidas não aloca nada
+        self._keys: Dict[SymbolId, Dict[Tuple[SymbolId, ...], int]] = {}
+        self._by_first = None
+        self._occurrences = None
+        self._count = 0
+        for p in productions:
+            self._by_lhs.setdefault(p.lhs_id, []).append(p)
+            bodies = self._keys.setdefault(p.lhs_id, {})
+            bodies[p.rhs_ids] = bodies.get(p.rhs_ids, 0) + 1
+            self._count += 1
+        self._flat = None
+
+    @property
+    def production_count(self) -> int:
+        """Número de produções, sem montar a lista `productions`."""
+        return self._count
+
+    # ------------------ Índices ------------------
+
+    def _first_index(self) -> Dict[SymbolId, List[Production]]:
+        if self._by_first is None:
+            self._by_first = {}
+            for bucket in self._by_lhs.values():
+                for p in bucket:
+                    if p.rhs_ids:
+                        self._by_first.setdefault(p.rhs_ids[0], []).append(p)
+        return self._by_first
+
+    def _occurrence_index(self) -> Dict[SymbolId, List[Tuple[Production, int]]]:
+        if self._occurrences is None:
+            self._occurrences = {}
+            for bucket in self._by_lhs.values():
+                for p in bucket:
+                    for pos, s in enumerate(p.rhs_ids):
+                        self._occurrences.setdefault(s, []).append((p, pos))
+        return self._occurrences
+
+    def productions_of(self, lhs: Symbol) -> List[Production]:
+        """Produções com lado esquerdo `lhs` (lista interna: não modifique)."""
+        return self._by_lhs.get(SYMBOLS.lookup(lhs), [])
+
+    def productions_starting_with(self, sym: Symbol) -> List[Production]:
+        """Produções cujo corpo começa por `sym` (lista interna: não modifique)."""
+        return self._first_index().get(SYMBOLS.lookup(sym), [])
+
+    def occurrences_of(self, sym: Symbol) -> List[Tuple[Production, int]]:
+        """Pares (produção, posição) onde `sym` aparece no corpo."""
+        return self._occurrence_index().get(SYMBOLS.lookup(sym), [])
+
+    def has_production(self, p: Production) -> bool:
+        bodies = self._keys.get(p.lhs_id)
+        return bodies is not None and p.rhs_ids in bodies
+
+    def add_production(self, p: Production):
+        self._by_lhs.setdefault(p.lhs_id, []).append(p)
+        bodies = self._keys.setdefault(p.lhs_id, {})
+        bodies[p.rhs_ids] = bodies.get(p.rhs_ids, 0) + 1
+        self._count += 1
+        if self._by_first is not None and p.rhs_ids:
+            self._by_first.setdefault(p.rhs_ids[0], []).append(p)
+        if self._occurrences is not None:
+            for pos, s in enumerate(p.rhs_ids):
+                self._occurrences.setdefault(s, []).append((p, pos))
+        self._flat = None
+
+    def remove_production(self, p: Production):
+        self.remove_productions([p])
+
+    def remove_productions(self, ps: List[Production]):
+        """
+        Remove várias produções com um único filtro por grupo afetado.
+        A remoção é por valor: cada item tira uma cópia de A -> α, de
+        preferência o próprio objeto; itens que não estão na gramática são
+        ignorados.
+        """
+        groups: Dict[SymbolId, List[Production]] = {}
+        for p in ps:
+            groups.setdefault(p.lhs_id, []).append(p)
+
+        removed: List[Production] = []
+        for lhs, group in groups.items():
+            bucket = self._by_lhs.get(lhs)
+            if bucket is None:
+                continue
+            present = {id(q) for q in bucket}
+            taken = set()
+            pending: Dict[Tuple[SymbolId, ...], int] = {}
+            for p in group:
+                if id(p) in present and id(p) not in taken:
+                    taken.add(id(p))
+                else:
+                    pending[p.rhs_ids] = pending.get(p.rhs_ids, 0) + 1
+
+            kept = []
+            for q in bucket:
+                if id(q) in taken:
+                    removed.append(q)
+                elif pending.get(q.rhs_ids):
+                    pending[q.rhs_ids] -= 1
+                    removed.append(q)
+                else:
+                    kept.append(q)
+            if kept:
+                self._by_lhs[lhs] = kept
+            else:
+                del self._by_lhs[lhs]
+
+        if not removed:
+            return
+        for p in removed:
+            bodies = self._keys[p.lhs_id]
+            count = bodies[p.rhs_ids] - 1
+            if count:
+                bodies[p.rhs_ids] = count
+            else:
+                del bodies[p.rhs_ids]
+                if not bodies:
+                    del self._keys[p.lhs_id]
+        self._count -= len(removed)
+
+        doomed = {id(p) for p in removed}
+        if self._by_first is not None:
+            for first in {p.rhs_ids[0] for p in removed if p.rhs_ids}:
+                self._by_first[first] = [q for q in self._by_first[first] if id(q) not in doomed]
+        if self._occurrences is not None:
+            for s in {s for p in removed for s in p.rhs_ids}:
+                self._occurrences[s] = [o for o in self._occurrences[s] if id(o[0]) not in doomed]
+        self._flat = None
+
     def copy(self):
+        # Os corpos são tuplas imutáveis: basta recriar os objetos Production
         return GLC(
             list(self.variables),
             list(self.alphabet),
             self.start,
-            [Production(p.lhs, list(p.rhs)) for p in self.productions]
+            [Production.from_ids(p.lhs_id, p.rhs_ids) for p in self.productions]
         )
 
     def __repr__(self):
@@ -47,4 +378,4 @@ class GLC:
         ]
         for p in self.productions:
             lines.append("  " + repr(p))
-        return "\n".join(lines)
\ No newline at end of file
+        return "\n".join(lines)
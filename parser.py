@@ -1,8 +1,54 @@
-from models import Production, GLC
-from typing import List
+from models import Production, GLC, EPSILON
+from typing import Iterable, List, Optional
+from glc_binary import is_binary_grammar, load_grammar
 
 Symbol = str
 
+_END = ""  # marca de fim de símbolo nos nós da trie
+
+
+class SymbolTrie:
+    """
+    Trie dos símbolos declarados (variáveis e terminais), usada para quebrar
+    um corpo em símbolos pelo casamento mais longo (maximal munch). Assim
+    `T_1`, `C_10` ou `Z1` são lidos como um símbolo só. Um caractere que não
+    inicia nenhum símbolo conhecido vira um símbolo de um caractere, como no
+    formato antigo.
+    """
+
+    def __init__(self, symbols: Iterable[Symbol] = ()):
+        self._root = {}
+        for s in symbols:
+            self.add(s)
+
+    def add(self, sym: Symbol):
+        if not sym:
+            return
+        node = self._root
+        for ch in sym:
+            node = node.setdefault(ch, {})
+        node[_END] = True
+
+    def tokenize(self, text: str) -> List[Symbol]:
+        tokens = []
+        root = self._root
+        i, n = 0, len(text)
+        while i < n:
+            node = root
+            j = i
+            end = i + 1
+            while j < n:
+                node = node.get(text[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    end = j
+            tokens.append(text[i:end])
+            i = end
+        return tokens
+
+
 def parse_set(string: str) -> List[Symbol]:
     s = string.strip()
     if s.startswith("{") and s.endswith("}"):
@@ -14,7 +60,12 @@ def parse_set(string: str) -> List[Symbol]:
     return [v.strip() for v in inner.split(",") if v.strip()]
 
 
-def parse_production(line: str):
+def parse_production(line: str, symbols: Optional[SymbolTrie] = None):
+    """
+    Lê uma linha `A -> α | β ...`. Espaços separam símbolos; dentro de cada
+    trecho sem espaços os símbolos são reconhecidos pela trie `symbols`
+    (sem ela, cada caractere é um símbolo).
+    """
     left, right = line.split("->", 1)
     left = left.strip()
     right = right.strip()
@@ -29,57 +80,67 @@ def parse_production(line: str):
     else:
         alternatives = [right]
 
+    if symbols is None:
+        symbols = SymbolTrie()
+
     prods = []
     for alt in alternatives:
         if alt in ('&', 'ε'):
-            symbols = ['&']
+            rhs = ['&']
         else:
-            compact = ''.join(ch for ch in alt if ch not in ' {}')
-            symbols = [c for c in compact]
-        prods.append(Production(Symbol(left), symbols))
+            rhs = []
+            for chunk in alt.replace('{', ' ').replace('}', ' ').split():
+                rhs.extend(symbols.tokenize(chunk))
+        prods.append(Production(Symbol(left), rhs))
 
     return prods
 
 
-def create_grammar(file: str) -> GLC:
-    all_productions: List[Production] = []
+def parse_grammar(lines: Iterable[str]) -> GLC:
+    """
+    Monta a GLC a partir das linhas do arquivo. As definições e os lados
+    esquerdos são lidos antes das produções, para que a trie já conheça
+    todos os símbolos com mais de um caractere.
+    """
+    rules: List[str] = []
     all_variables: List[Symbol] = []
     alphabet: List[str] = []
     start: Symbol = ""
 
-    with open(file, 'r', encoding='utf-8') as archive:
-        for line in archive:
-            line = line.strip()
-
-            if not line or line.startswith('#'):
-                continue
-
-            if "->" in line:
-                parsed = parse_production(line)
-                all_productions.extend(parsed)
-            elif "=" in line:
-                definition, new_set = line.split("=", 1)
-                definition = definition.strip().lower()
-                new_set = new_set.strip()
-
-                if definition in ("variables", "variáveis", "variaveis"):
-                    all_variables = parse_set(new_set)
-                elif definition in ("alphabet", "alfabeto"):
-                    alphabet = parse_set(new_set)
-                elif definition in ("start", "inicial"):
-                    parsed = parse_set(new_set)
-                    if parsed:
-                        start = parsed[0]
-                    else:
-                        start = new_set.strip().strip('{}').strip()
+    for line in lines:
+        line = line.strip()
+
+        if not line or line.startswith('#'):
+            continue
+
+        if "->" in line:
+            rules.append(line)
+        elif "=" in line:
+            definition, new_set = line.split("=", 1)
+            definition = definition.strip().lower()
+            new_set = new_set.strip()
+
+            if definition in ("variables", "variáveis", "variaveis"):
+                all_variables = parse_set(new_set)
+            elif definition in ("alphabet", "alfabeto"):
+                alphabet = parse_set(new_set)
+            elif definition in ("start", "inicial"):
+                parsed = parse_set(new_set)
+                if parsed:
+                    start = parsed[0]
+                else:
+                    start = new_set.strip().strip('{}').strip()
+
+    lhs_names = [line.split("->", 1)[0].strip() for line in rules]
+    symbols = SymbolTrie(all_variables + alphabet + lhs_names)
+
+    all_productions: List[Production] = []
+    for line in rules:
+        all_productions.extend(parse_production(line, symbols))
 
     # para gramáticas reduzidas
     if not all_variables:
-        seen = []
-        for p in all_productions:
-            if p.lhs not in seen:
-                seen.append(p.lhs)
-        all_variables = seen
+        all_variables = list(dict.fromkeys(lhs_names))
 
     if not alphabet:
         vars_set = set(all_variables)
@@ -97,3 +158,36 @@ def create_grammar(file: str) -> GLC:
             start = all_productions[0].lhs
 
     return GLC(all_variables, alphabet, start, all_productions)
+
+
+def create_grammar(file: str) -> GLC:
+    """Lê a gramática do arquivo, em texto ou no formato binário (.glcb)."""
+    if is_binary_grammar(file):
+        return load_grammar(file)
+    with open(file, 'r', encoding='utf-8') as archive:
+        return parse_grammar(archive)
+
+
+# ------------------ Escrita ------------------
+
+def format_grammar(glc: GLC) -> str:
+    """
+    Texto no formato completo, com os símbolos separados por espaço, que
+    create_grammar lê de volta sem ambiguidade (ex.: saída da CNF com T_1).
+    """
+    lines = [
+        "Variaveis = {" + ", ".join(glc.variables) + "}",
+        "Alfabeto = {" + ", ".join(glc.alphabet) + "}",
+        f"Inicial = {glc.start}",
+        "Regras:",
+    ]
+    for A in dict.fromkeys(glc.variables):
+        bodies = [" ".join(p.rhs) if not p.is_epsilon() else EPSILON for p in glc.productions_of(A)]
+        if bodies:
+            lines.append(f"{A} -> " + " | ".join(bodies))
+    return "\n".join(lines) + "\n"
+
+
+def write_grammar(glc: GLC, file: str):
+    with open(file, 'w', encoding='utf-8') as out:
+        out.write(format_grammar(glc))
@@ -0,0 +1,117 @@
+import unittest
+from models import GLC, Production
+from analysis import GrammarAnalysis, transitive_closure, iter_bits, symbol_names
+from cnf import cnf_from_glc
+from benchmark import FAMILIES
+
+def sample_grammar():
+    """S -> AB | C, A -> aA | &, B -> b | A, C -> CD, D -> d, E -> S"""
+    return GLC(['S', 'A', 'B', 'C', 'D', 'E'], ['a', 'b', 'd'], 'S', [
+        Production('S', ['A', 'B']),
+        Production('S', ['C']),
+        Production('A', ['a', 'A']),
+        Production('A', ['&']),
+        Production('B', ['b']),
+        Production('B', ['A']),
+        Production('C', ['C', 'D']),
+        Production('D', ['d']),
+        Production('E', ['S']),
+    ])
+
+def naive_fixpoint(glc, base):
+    """Ponto fixo ingênuo: A entra se algum corpo seu só tem símbolos de `base` ou já no conjunto."""
+    result = set()
+    changed = True
+    while changed:
+        changed = False
+        for p in glc.productions:
+            if p.lhs not in result and all(s in base or s in result for s in p.rhs):
+                result.add(p.lhs)
+                changed = True
+    return result
+
+def naive_reach(graph, A):
+    """Vértices alcançáveis a partir de A em um ou mais passos."""
+    seen = set()
+    stack = list(graph.get(A, ()))
+    while stack:
+        B = stack.pop()
+        if B not in seen:
+            seen.add(B)
+            stack.extend(graph.get(B, ()))
+    return seen
+
+class TestAnalysis(unittest.TestCase):
+
+    def test_sets(self):
+        analysis = GrammarAnalysis(sample_grammar())
+        self.assertEqual(symbol_names(analysis.nullable()), {'S', 'A', 'B', 'E'})
+        self.assertEqual(symbol_names(analysis.generating()), {'S', 'A', 'B', 'D', 'E'})
+        self.assertEqual(symbol_names(analysis.reachable()), {'S', 'A', 'B', 'C', 'D', 'a', 'b', 'd', '&'})
+        self.assertEqual(symbol_names(analysis.useful()), {'S', 'A', 'B', 'a', 'b', '&'})
+        self.assertEqual([str(p) for p in analysis.useful_productions()],
+                         [str(p) for p in sample_grammar().productions if p.lhs in 'SAB' and p.rhs != ['C']])
+
+    def test_unknown_symbol_and_missing_start(self):
+        # 'x' não é variável nem terminal: S -> x nunca gera nada
+        glc = GLC(['S', 'A'], ['a'], 'S', [Production('S', ['x']), Production('A', ['a'])])
+        analysis = GrammarAnalysis(glc)
+        self.assertEqual(symbol_names(analysis.generating()), {'A'})
+        self.assertEqual(analysis.useful(), set())
+        self.assertEqual(analysis.useful_productions(), [])
+
+        analysis = GrammarAnalysis(GLC(['A'], ['a'], 'S', [Production('A', ['a'])]))
+        self.assertIsNone(analysis.start)
+        self.assertEqual(analysis.useful_productions(), [])
+
+    def test_closures(self):
+        analysis = GrammarAnalysis(sample_grammar())
+        pos = analysis.names.index
+        unit = analysis.unit_closure()
+        self.assertEqual(analysis.names_of(unit[pos('E')]), {'E', 'S', 'C'})
+        self.assertEqual(analysis.names_of(unit[pos('B')]), {'B', 'A'})
+        left = analysis.left_corner_closure()
+        self.assertEqual(analysis.names_of(left[pos('S')]), {'A', 'C'})
+        self.assertEqual(analysis.names_of(analysis.left_recursive_bits()), {'C'})
+
+    def test_transitive_closure_cycle(self):
+        # 0 -> 1 -> 2 -> 1, 3 isolado
+        rows = [0b0010, 0b0100, 0b0010, 0]
+        self.assertEqual(transitive_closure(rows), [0b0110, 0b0110, 0b0110, 0])
+        self.assertEqual(transitive_closure(rows, reflexive=True), [0b0111, 0b0110, 0b0110, 0b1000])
+        self.assertEqual(list(iter_bits(0b1010)), [1, 3])
+
+    def test_matches_naive_analyses(self):
+        """Mesmos resultados que pontos fixos e buscas ingênuos nas famílias do benchmark."""
+        for family, build in FAMILIES.items():
+            with self.subTest(family=family):
+                glc = build(8, 0)
+                analysis = GrammarAnalysis(glc)
+                variables = set(analysis.names)
+                self.assertEqual(symbol_names(analysis.nullable()), naive_fixpoint(glc, {'&'}))
+                self.assertEqual(symbol_names(analysis.generating()),
+                                 naive_fixpoint(glc, set(glc.alphabet) | {'&'}))
+
+                uses = {}
+                unit = {}
+                for p in glc.productions:
+                    uses.setdefault(p.lhs, set()).update(s for s in p.rhs if s in variables)
+                    if len(p.rhs) == 1 and p.rhs[0] in variables:
+                        unit.setdefault(p.lhs, set()).add(p.rhs[0])
+                self.assertEqual(symbol_names(analysis.reachable()) & variables,
+                                 naive_reach(uses, glc.start) | {glc.start})
+                rows = analysis.unit_closure()
+                for i, A in enumerate(analysis.names):
+                    self.assertEqual(analysis.names_of(rows[i]), naive_reach(unit, A) | {A})
+
+                cnf = cnf_from_glc(glc, None, epsilon_mode="bin")
+                cnf_analysis = GrammarAnalysis(cnf)
+                left = {}
+                for p in cnf.productions:
+                    if p.rhs[0] in cnf.variables:
+                        left.setdefault(p.lhs, set()).add(p.rhs[0])
+                recursive = {A for A in cnf_analysis.names if A in naive_reach(left, A)}
+                self.assertEqual(cnf_analysis.names_of(cnf_analysis.left_recursive_bits()), recursive)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+import json
+import shutil
+import tempfile
+from batch import collect_inputs, run_batch, normalize_one, summarize, log_names, SUMMARY_FILE
+from utils_budget import Budget
+from models import SYMBOLS
+from utils_log import LOG_PHASE
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.write("g1.txt", "S -> aSb | ab\n")
+        self.write("g2.txt", "S -> SA | a\nA -> b\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def write(self, name, content):
+        path = os.path.join(self.dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def test_collect_inputs(self):
+        """Diretório, glob e manifesto resolvem para a mesma lista de arquivos."""
+        expected = [os.path.join(self.dir, "g1.txt"), os.path.join(self.dir, "g2.txt")]
+        manifest = self.write("lote.list", "# gramáticas\ng1.txt\n\ng2.txt\n")
+
+        self.assertEqual(collect_inputs(self.dir), expected)
+        self.assertEqual(collect_inputs(os.path.join(self.dir, "g*.txt")), expected)
+        self.assertEqual(collect_inputs(manifest), expected)
+
+    def test_run_batch_isolates_failures(self):
+        """Um arquivo com erro vira uma linha de falha sem afetar os demais."""
+        manifest = self.write("lote.list", "g1.txt\ng2.txt\nnao_existe.txt\n")
+        out_dir = os.path.join(self.dir, "saida")
+
+        records = run_batch(manifest, "gnf", out_dir, workers=2, timeout=30)
+        by_file = {os.path.basename(r["file"]): r for r in records}
+
+        self.assertEqual(by_file["g1.txt"]["status"], "ok")
+        self.assertEqual(by_file["g2.txt"]["status"], "ok")
+        self.assertEqual(by_file["nao_existe.txt"]["status"], "error")
+        self.assertTrue(os.path.exists(by_file["g1.txt"]["log"]))
+
+        with open(os.path.join(out_dir, SUMMARY_FILE), encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(len(lines), 3)
+        self.assertIn("falhas: 1", summarize(records))
+
+    def test_same_name_in_different_folders(self):
+        """a/g.txt e b/g.txt gravam logs separados, e --log-delta chega ao log."""
+        os.makedirs(os.path.join(self.dir, "a"))
+        os.makedirs(os.path.join(self.dir, "b"))
+        self.write(os.path.join("a", "g.txt"), "S -> aSb | ab\n")
+        self.write(os.path.join("b", "g.txt"), "S -> SA | a\nA -> b\n")
+        manifest = self.write("lote.list", "a/g.txt\nb/g.txt\n")
+        out_dir = os.path.join(self.dir, "saida")
+
+        records = run_batch(manifest, "cnf", out_dir, workers=1, timeout=30, log_level=LOG_PHASE, log_delta=True)
+        logs = sorted(os.path.relpath(r["log"], out_dir) for r in records)
+        self.assertEqual(logs, [os.path.join("a", "g.cnf.log"), os.path.join("b", "g.cnf.log")])
+        with open(os.path.join(out_dir, "b", "g.cnf.log"), encoding="utf-8") as f:
+            self.assertIn(" (+", f.read())
+
+        self.assertEqual(log_names(["x/g.txt", "x/g.txt"]), ["g", "g.1"])
+
+    def test_budget_exceeded_record(self):
+        """Um estouro de orçamento vira status "budget" com a fase e os tamanhos."""
+        path = os.path.join(self.dir, "g2.txt")
+        record = normalize_one(path, "gnf", self.dir, {}, budget=Budget(max_productions=2))
+        self.assertEqual(record["status"], "budget")
+        self.assertEqual(record["budget"]["limit"], "productions")
+        self.assertIn("phase", record["budget"])
+
+    def test_normalize_one_releases_symbols(self):
+        """As variáveis criadas na conversão não ficam na tabela de símbolos."""
+        path = os.path.join(self.dir, "g2.txt")
+        before = len(SYMBOLS)
+        record = normalize_one(path, "gnf", self.dir, {})
+        self.assertEqual(record["status"], "ok")
+        self.assertEqual(len(SYMBOLS), before)
+
+if __name__ == '__main__':
+    unittest.main()
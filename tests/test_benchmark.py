@@ -0,0 +1,50 @@
+import unittest
+import copy
+from gnf import gnf_from_glc
+from benchmark import FAMILIES, run_case, run_gnf_methods, format_gnf_methods, compare
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_generators_are_seeded(self):
+        for name, gen in FAMILIES.items():
+            a = [p.key for p in gen(6, seed=3).productions]
+            b = [p.key for p in gen(6, seed=3).productions]
+            self.assertEqual(a, b, name)
+
+    def test_run_case_phases(self):
+        result = run_case("dense-nullable", 4, "cnf")
+        phases = [p["phase"] for p in result["phases"]]
+        self.assertEqual(phases, ["useless-initial", "epsilon", "unit", "useless", "terminals+binarize"])
+        for p in result["phases"]:
+            self.assertGreaterEqual(p["seconds"], 0)
+            self.assertIn("peak_kb", p)
+
+        # Na GNF aparecem também as fases da CNF interna
+        gnf = run_case("left-recursive", 4, "gnf", track_memory=False)
+        self.assertEqual([p["phase"] for p in gnf["phases"]], phases + ["rename", "left-recursion",
+                                                                         "back-substitution"])
+        final = gnf_from_glc(FAMILIES["left-recursive"](4, 0), None)
+        self.assertEqual(gnf["phases"][-1]["productions"], final.production_count)
+        self.assertEqual(gnf["phases"][-1]["variables"], len(set(final.variables)))
+        self.assertNotIn("peak_kb", gnf["phases"][-1])
+
+    def test_gnf_methods_side_by_side(self):
+        rows = run_gnf_methods("quick", ["left-recursive"])
+        self.assertEqual(len(rows), 2)
+        for row in rows:
+            self.assertEqual(set(row["methods"]), {"classic", "rosenkrantz"})
+            self.assertGreater(row["methods"]["rosenkrantz"]["productions"], 0)
+        self.assertIn("rosenkrantz", format_gnf_methods(rows).splitlines()[0])
+
+    def test_compare_flags_size_change(self):
+        baseline = [run_case("unit-chain", 10, "cnf", track_memory=False)]
+        self.assertEqual(compare(baseline, baseline), [])
+
+        changed = copy.deepcopy(baseline)
+        changed[0]["phases"][2]["productions"] += 1
+        problems = compare(changed, baseline)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("[unit]", problems[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import unittest
+import os
+import shutil
+import tempfile
+from unittest import mock
+import cache as cache_module
+from models import GLC, Production
+from cache import (
+    canonical_hash, serialize_grammar, deserialize_grammar,
+    NormalizationCache, cached_normalize, CACHE_SUFFIX, TMP_MAX_AGE,
+)
+from utils_log import StepLogger, MemorySink, LOG_SUMMARY
+
+def make_grammar(reverse=False):
+    prods = [
+        Production("S", ["A", "B"]),
+        Production("S", ["a"]),
+        Production("A", ["a", "A"]),
+        Production("A", ["&"]),
+        Production("B", ["b"]),
+    ]
+    variables = ["S", "A", "B"]
+    if reverse:
+        prods.reverse()
+        variables = ["B", "A", "S"]
+    return GLC(variables, ["a", "b"], "S", prods)
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_canonical_hash(self):
+        """A ordem das regras não muda o hash; modo e opções mudam."""
+        h = canonical_hash(make_grammar(), "cnf", {"epsilon_mode": "classic"})
+        self.assertEqual(h, canonical_hash(make_grammar(reverse=True), "cnf", {"epsilon_mode": "classic"}))
+        self.assertNotEqual(h, canonical_hash(make_grammar(), "gnf", {"epsilon_mode": "classic"}))
+        self.assertNotEqual(h, canonical_hash(make_grammar(), "cnf", {"epsilon_mode": "bin"}))
+
+    def test_serialize_roundtrip(self):
+        glc = make_grammar()
+        back = deserialize_grammar(serialize_grammar(glc))
+        self.assertEqual(back.start, glc.start)
+        self.assertEqual(back.variables, glc.variables)
+        self.assertEqual(back.alphabet, glc.alphabet)
+        self.assertEqual([p.key for p in back.productions], [p.key for p in glc.productions])
+
+    def test_hit_skips_conversion(self):
+        """No acerto o resultado vem do cache e o log só registra a leitura."""
+        cache = NormalizationCache(self.dir)
+        first = cached_normalize(make_grammar(), "cnf", {}, cache)
+
+        sink = MemorySink()
+        second = cached_normalize(make_grammar(reverse=True), "cnf", {}, cache, StepLogger(sink, LOG_SUMMARY))
+        self.assertEqual(sorted(p.key for p in second.productions), sorted(p.key for p in first.productions))
+        self.assertEqual(sink.lines[0], "==== Resultado recuperado do cache ====")
+        self.assertNotIn("Gramática Original", sink.getvalue())
+
+    def test_corrupt_entry_is_dropped(self):
+        cache = NormalizationCache(self.dir)
+        key = canonical_hash(make_grammar(), "cnf")
+        with open(os.path.join(self.dir, key + CACHE_SUFFIX), "wb") as f:
+            f.write(b"lixo")
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(os.listdir(self.dir), [])
+
+    def test_eviction_keeps_size_limit(self):
+        """Entradas mais antigas saem primeiro quando o limite é excedido."""
+        glc = make_grammar()
+        size = len(serialize_grammar(glc))
+        cache = NormalizationCache(self.dir, max_bytes=2 * size)
+        for i, key in enumerate(["k1", "k2", "k3"]):
+            cache.put(key, glc)
+            path = os.path.join(self.dir, key + CACHE_SUFFIX)
+            os.utime(path, (1000 + i, 1000 + i))
+        cache.evict()
+
+        self.assertIsNone(cache.get("k1"))
+        self.assertIsNotNone(cache.get("k3"))
+        total = sum(os.path.getsize(os.path.join(self.dir, n)) for n in os.listdir(self.dir))
+        self.assertLessEqual(total, 2 * size)
+
+    def test_version_changes_key(self):
+        """Resultados de uma versão anterior dos algoritmos não são reaproveitados."""
+        h = canonical_hash(make_grammar(), "cnf")
+        with mock.patch.object(cache_module, "CACHE_VERSION", cache_module.CACHE_VERSION + 1):
+            self.assertNotEqual(h, canonical_hash(make_grammar(), "cnf"))
+
+    def test_put_does_not_rescan(self):
+        """Abaixo do limite, só o primeiro put lista o diretório."""
+        cache = NormalizationCache(self.dir)
+        with mock.patch("cache.os.listdir", wraps=os.listdir) as listdir:
+            for key in ["k1", "k2", "k3", "k1"]:
+                cache.put(key, make_grammar())
+        self.assertEqual(listdir.call_count, 1)
+        total = sum(os.path.getsize(os.path.join(self.dir, n)) for n in os.listdir(self.dir))
+        self.assertEqual(cache._total, total)
+
+    def test_tmp_files_are_cleaned(self):
+        """Escrita interrompida não deixa .tmp; sobras antigas saem na varredura."""
+        cache = NormalizationCache(self.dir)
+        with mock.patch("cache.os.replace", side_effect=TimeoutError):
+            with self.assertRaises(TimeoutError):
+                cache.put("k1", make_grammar())
+        self.assertEqual(os.listdir(self.dir), [])
+
+        old = os.path.join(self.dir, "abandonado.tmp")
+        recent = os.path.join(self.dir, "em_andamento.tmp")
+        for path in (old, recent):
+            open(path, "wb").close()
+        past = os.path.getmtime(old) - TMP_MAX_AGE - 1
+        os.utime(old, (past, past))
+        cache.evict()
+        self.assertEqual(os.listdir(self.dir), ["em_andamento.tmp"])
+
+if __name__ == '__main__':
+    unittest.main()
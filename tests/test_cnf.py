@@ -5,7 +5,14 @@ from cnf import (
     remove_unit_productions,
     remove_useless_symbols,
     convert_terminals_and_binarize,
-    remove_duplicate_productions
+    remove_duplicate_productions,
+    remove_empty_productions_binarized,
+    cnf_from_glc,
+    unit_closure,
+    nullable_set,
+    generating_set,
+    reachable_set,
+    EPSILON_MODES
 )
 
 class TestCNF(unittest.TestCase):
@@ -40,6 +47,66 @@ class TestCNF(unittest.TestCase):
         self.assertIn("B -> b", result_set)
         self.assertNotIn("A -> &", result_set)
 
+    def test_remove_empty_productions_binarized_is_linear(self):
+        """Com BIN antes de DEL, 8 anuláveis no mesmo corpo não geram 2^8 variantes."""
+        body = 'ABCDEFGH'
+        prods = [self.create_prod('S', body)]
+        for v in body:
+            prods.append(self.create_prod(v, v.lower()))
+            prods.append(Production(v, ['&']))
+        glc = GLC(['S'] + list(body), list(body.lower()), 'S', prods)
+
+        new_glc = remove_empty_productions_binarized(glc)
+        res_set = self.prods_to_set(new_glc.productions)
+
+        self.assertLess(len(new_glc.productions), 50)
+        self.assertTrue(all(len(p.rhs) <= 2 for p in new_glc.productions))
+        self.assertNotIn("A -> &", res_set)
+        self.assertIn("A -> a", res_set)
+        self.assertEqual([p.lhs for p in new_glc.productions if p.is_epsilon()], ['S'])
+
+    def test_no_empty_production_outside_start(self):
+        """Nos dois modos, a CNF só tem & no inicial, mesmo com C_n anuláveis."""
+        prods = [
+            self.create_prod('S', 'SbSB'), self.create_prod('S', 'a'), Production('S', ['&']),
+            self.create_prod('B', 'CbSb'), Production('B', ['&']),
+            self.create_prod('C', 'aACS'), self.create_prod('C', 'b'), self.create_prod('C', 'a'),
+            self.create_prod('A', 'AAbS'), self.create_prod('A', 'C'), self.create_prod('A', 'a'),
+        ]
+        glc = GLC(['S', 'B', 'C', 'A'], ['a', 'b'], 'S', prods)
+        for mode in EPSILON_MODES:
+            with self.subTest(mode=mode):
+                result = cnf_from_glc(glc, None, epsilon_mode=mode)
+                empty = [p.lhs for p in result.productions if p.is_epsilon()]
+                self.assertEqual(empty, ['S'])
+
+    # =================================================================
+    # TESTES DAS ANÁLISES (anuláveis, geradoras, alcançáveis)
+    # =================================================================
+    def test_nullable_set_indirect(self):
+        prods = [
+            self.create_prod('S', 'AB'),
+            self.create_prod('A', 'BB'),
+            Production('B', ['&']),
+            self.create_prod('C', 'Ca')
+        ]
+        glc = GLC(['S','A','B','C'], ['a'], 'S', prods)
+
+        self.assertEqual(nullable_set(glc), {'S', 'A', 'B'})
+
+    def test_generating_and_reachable_sets(self):
+        prods = [
+            self.create_prod('S', 'aA'),
+            self.create_prod('S', 'B'),
+            self.create_prod('A', 'b'),
+            self.create_prod('B', 'Bb'),
+            self.create_prod('D', 'd')
+        ]
+        glc = GLC(['S','A','B','D'], ['a','b','d'], 'S', prods)
+
+        self.assertEqual(generating_set(glc), {'S', 'A', 'D'})
+        self.assertEqual(reachable_set(glc), {'S', 'A', 'B', 'a', 'b'})
+
     # =================================================================
     # TESTES DE REMOÇÃO DE UNITÁRIAS (A -> B)
     # =================================================================
@@ -127,6 +194,26 @@ class TestCNF(unittest.TestCase):
         new_vars = [v for v in final_glc.variables if "C_" in v or "X" in v] 
         self.assertTrue(len(new_vars) > 0, "Nenhuma variável auxiliar foi criada para binarização")
 
+    def test_binarization_shared_suffixes(self):
+        """Sufixos iguais (ABC) devem reutilizar as mesmas variáveis C_n."""
+        prods = [
+            self.create_prod('S', 'aABC'),
+            self.create_prod('S', 'bABC'),
+            self.create_prod('A', 'a'), self.create_prod('B', 'b'),
+            self.create_prod('C', 'c')
+        ]
+        glc = GLC(['S','A','B','C'], ['a','b','c'], 'S', prods)
+
+        chain_glc = convert_terminals_and_binarize(glc)
+        shared_glc = convert_terminals_and_binarize(glc, share_suffixes=True)
+
+        chain_vars = [v for v in chain_glc.variables if v.startswith("C_")]
+        shared_vars = [v for v in shared_glc.variables if v.startswith("C_")]
+        self.assertEqual(len(chain_vars), 4)
+        self.assertEqual(len(shared_vars), 2)
+        for p in shared_glc.productions:
+            self.assertTrue(len(p.rhs) <= 2, f"Regra longa demais sobrou: {p}")
+
     def test_mixed_terminals_and_variables(self):
         """Testa isolamento de terminais no meio de variáveis: S -> a A b B"""
         prods = [
@@ -165,6 +252,27 @@ class TestCNF(unittest.TestCase):
         self.assertNotIn("A -> B", res_set)
         self.assertNotIn("B -> C", res_set)
 
+    def test_unit_closure_bitsets(self):
+        """Testa o fecho unitário em bitsets: ciclo A-B-C e cadeia S -> A."""
+        prods = [
+            self.create_prod('S', 'A'),
+            self.create_prod('A', 'B'),
+            self.create_prod('B', 'C'),
+            self.create_prod('C', 'A'),
+            self.create_prod('D', 'a')
+        ]
+        glc = GLC(['S','A','B','C','D'], ['a'], 'S', prods)
+
+        names, reach = unit_closure(glc)
+        reached = {
+            v: {names[i] for i in range(len(names)) if reach[k] >> i & 1}
+            for k, v in enumerate(names)
+        }
+
+        self.assertEqual(reached['S'], {'S', 'A', 'B', 'C'})
+        self.assertEqual(reached['B'], {'A', 'B', 'C'})
+        self.assertEqual(reached['D'], {'D'})
+
     def test_full_pipeline_integration(self):
         """Simula o fluxo completo do main.py manualmente"""
                
@@ -199,6 +307,45 @@ class TestCNF(unittest.TestCase):
                 self.assertFalse(p.rhs[0] in glc.alphabet)
                 self.assertFalse(p.rhs[1] in glc.alphabet)
 
+    def test_cnf_from_glc_in_memory(self):
+        """cnf_from_glc trabalha sobre a GLC em memória sem alterá-la."""
+        prods = [
+            self.create_prod('S', 'aSb'),
+            Production('S', ['&'])
+        ]
+        glc = GLC(['S'], ['a', 'b'], 'S', prods)
+        before = self.prods_to_set(glc.productions)
+
+        log = []
+        cnf_glc = cnf_from_glc(glc, log)
+
+        self.assertEqual(self.prods_to_set(glc.productions), before)
+        self.assertTrue(log)
+        for p in cnf_glc.productions:
+            self.assertTrue(len(p.rhs) <= 2)
+
+        self.assertEqual(self.prods_to_set(cnf_from_glc(glc, None).productions),
+                         self.prods_to_set(cnf_glc.productions))
+
+    def test_cnf_from_glc_prunes_useless(self):
+        """Variáveis inalcançáveis ou que não geram nada não chegam à CNF."""
+        prods = [
+            self.create_prod('S', 'aA'),
+            self.create_prod('S', 'b'),
+            self.create_prod('A', 'a'),
+            self.create_prod('D', 'aDb'),
+            self.create_prod('U', 'Ua'),
+            self.create_prod('S', 'U'),
+        ]
+        glc = GLC(['S', 'A', 'D', 'U'], ['a', 'b'], 'S', prods)
+
+        cnf_glc = cnf_from_glc(glc, None)
+        self.assertNotIn('D', cnf_glc.variables)
+        self.assertNotIn('U', cnf_glc.variables)
+        for p in cnf_glc.productions:
+            self.assertNotIn('D', p.rhs)
+            self.assertNotIn('U', p.rhs)
+
 
 if __name__ == '__main__':
     unittest.main()
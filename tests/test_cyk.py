@@ -0,0 +1,74 @@
+import unittest
+import itertools
+import re
+from models import GLC, Production
+from parser import parse_grammar
+from cyk import CYKParser
+from cnf import EPSILON_MODES, BINARIZE_MODES
+
+def expr_grammar():
+    return parse_grammar(["E -> E+T | T", "T -> T*F | F", "F -> (E) | a"])
+
+class TestCYK(unittest.TestCase):
+
+    def test_recognize(self):
+        parser = CYKParser.from_grammar(expr_grammar())
+        self.assertTrue(parser.recognize("a+a*a"))
+        self.assertTrue(parser.recognize("(a+a)*a"))
+        self.assertTrue(parser.recognize(["a", "*", "a"]))
+        self.assertFalse(parser.recognize("(a"))
+        self.assertFalse(parser.recognize("a+"))
+        self.assertFalse(parser.recognize("a-a"))  # '-' não é terminal
+        self.assertFalse(parser.recognize(""))
+
+    def test_recognize_many(self):
+        parser = CYKParser.from_grammar(expr_grammar())
+        words = ["a", "a+", "a", "((a))", "a**a"]
+        self.assertEqual(parser.recognize_many(words), [True, False, True, True, False])
+
+    def test_parse_tree(self):
+        """A árvore é binária e suas folhas reproduzem a palavra."""
+        parser = CYKParser.from_grammar(expr_grammar())
+        tree = parser.parse("a+a*a")
+        self.assertEqual(tree[0], "E")
+
+        def leaves(node):
+            if len(node) == 2:
+                return [node[1]]
+            return leaves(node[1]) + leaves(node[2])
+
+        self.assertEqual("".join(leaves(tree)), "a+a*a")
+        self.assertIsNone(parser.parse("a+*a"))
+
+    def test_empty_word_and_long_input(self):
+        glc = GLC(["S", "A"], ["a"], "S", [
+            Production("S", ["&"]),
+            Production("S", ["A", "A"]),
+            Production("A", ["A", "A"]),
+            Production("A", ["a"]),
+        ])
+        parser = CYKParser(glc)
+        self.assertTrue(parser.recognize(""))
+        self.assertTrue(parser.recognize("a" * 300))
+        self.assertFalse(parser.recognize("a"))
+
+    def test_from_grammar_with_nullable_variables(self):
+        """A, B e as C_n da binarização anuláveis: a CNF só tem & no inicial."""
+        # Linguagem: ab, aab e a?b*
+        language = re.compile(r"ab|aab|a?b*")
+        for epsilon_mode, binarize_mode in itertools.product(EPSILON_MODES, BINARIZE_MODES):
+            with self.subTest(epsilon=epsilon_mode, binarize=binarize_mode):
+                glc = parse_grammar(["S -> aAb | AB", "A -> a | &", "B -> BB | b | &"])
+                parser = CYKParser.from_grammar(glc, epsilon_mode=epsilon_mode, binarize_mode=binarize_mode)
+                self.assertTrue(parser.accepts_empty)
+                for n in range(1, 6):
+                    for word in map("".join, itertools.product("ab", repeat=n)):
+                        self.assertEqual(parser.recognize(word), bool(language.fullmatch(word)), word)
+
+    def test_rejects_non_cnf(self):
+        glc = GLC(["S"], ["a"], "S", [Production("S", ["a", "S", "a"])])
+        with self.assertRaises(ValueError):
+            CYKParser(glc)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import shutil
+import tempfile
+from models import GLC, Production
+from parser import create_grammar
+from glc_binary import save_grammar, load_grammar, read_arrays, is_binary_grammar, np
+
+class TestGlcBinary(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "g.glcb")
+        self.glc = GLC(
+            ["S", "C_10", "T_1"], ["a", "ç"], "S",
+            [
+                Production("S", ["C_10", "T_1"]),
+                Production("S", ["&"]),
+                Production("C_10", ["a"]),
+                Production("T_1", ["ç"]),
+            ],
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_roundtrip(self):
+        save_grammar(self.glc, self.path)
+        self.assertTrue(is_binary_grammar(self.path))
+
+        back = load_grammar(self.path)
+        self.assertEqual(back.start, "S")
+        self.assertEqual(back.variables, self.glc.variables)
+        self.assertEqual(back.alphabet, self.glc.alphabet)
+        self.assertEqual([p.key for p in back.productions], [p.key for p in self.glc.productions])
+
+        # create_grammar reconhece o formato pelo cabeçalho
+        self.assertEqual(len(create_grammar(self.path).productions), 4)
+
+    def test_flat_arrays(self):
+        """Os corpos ficam em um único array, delimitados por rhs_offsets."""
+        save_grammar(self.glc, self.path)
+        arrays = read_arrays(self.path)
+        self.assertEqual(len(arrays), 4)
+        self.assertEqual(list(arrays.rhs_offsets), [0, 2, 3, 4, 5])
+        first = [arrays.names[s] for s in arrays.rhs[0:2]]
+        self.assertEqual(first, ["C_10", "T_1"])
+
+    @unittest.skipIf(np is None, "numpy não instalado")
+    def test_numpy_views(self):
+        save_grammar(self.glc, self.path)
+        arrays = read_arrays(self.path, use_numpy=True)
+        self.assertEqual(arrays.rhs_offsets.tolist(), [0, 2, 3, 4, 5])
+
+    def test_rejects_truncated_file(self):
+        save_grammar(self.glc, self.path)
+        with open(self.path, "rb") as f:
+            data = f.read()
+        with open(self.path, "wb") as f:
+            f.write(data[:-4])
+        with self.assertRaises(ValueError):
+            read_arrays(self.path)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,7 +4,7 @@ from models import GLC, Production
 from gnf import (
     rename_variables_to_Ai,
     substitute_Aj_into_Ai,
-    immediate_left_recursion_elimination_for_A,
+    eliminate_immediate_left_recursion,
     new_var_generator_factory,
     convert_to_gnf
 )
@@ -81,20 +81,31 @@ class TestGNF(unittest.TestCase):
         ]
         
         existing_vars = {'A'}
-        gen = new_var_generator_factory(existing_vars)
         
-        new_prods, created_vars = immediate_left_recursion_elimination_for_A(prods, 'A', gen)
+        new_prods, created_vars = eliminate_immediate_left_recursion(prods, 'A', existing_vars)
         res_set = self.prods_to_set(new_prods)
         
         self.assertEqual(len(created_vars), 1)
         Z = created_vars[0] # Deve ser Z1
+        self.assertEqual(Z, 'Z1')
+        self.assertIn(Z, existing_vars)
         
-        self.assertIn(f"A -> b{Z}", res_set)   # Antes: b {Z}
-        self.assertIn(f"{Z} -> a{Z}", res_set) # Antes: a {Z}
-        self.assertIn(f"{Z} -> &", res_set)
+        # A -> βZ | β e Z -> αZ | α (sem produção vazia)
+        self.assertIn(f"A -> b{Z}", res_set)
+        self.assertIn("A -> b", res_set)
+        self.assertIn(f"{Z} -> a{Z}", res_set)
+        self.assertIn(f"{Z} -> a", res_set)
+        self.assertNotIn(f"{Z} -> &", res_set)
         
         self.assertNotIn("A -> Aa", res_set)
 
+    def test_new_var_generator_skips_existing(self):
+        existing_vars = {'A', 'Z1'}
+        gen = new_var_generator_factory(existing_vars)
+        self.assertEqual(gen(), 'Z2')
+        self.assertEqual(gen(), 'Z3')
+        self.assertIn('Z3', existing_vars)
+
     # =================================================================
     # 4. TESTES DE INTEGRAÇÃO (convert_to_gnf)
     # =================================================================
@@ -0,0 +1,170 @@
+import unittest
+import itertools
+from models import GLC, Production
+from cnf import cnf_from_glc
+from gnf import (
+    gnf_from_glc, left_corner_system, left_corner_gnf, GNF_METHODS,
+    left_corner_graph, left_recursive_components,
+    variable_order, estimate_gnf_size, ORDERING_STRATEGIES, left_factor,
+)
+from utils_metrics import PipelineMetrics
+from gnf_recognizer import GNFRecognizer
+from cyk import CYKParser
+from benchmark import FAMILIES
+
+def left_recursive_grammar():
+    """E -> E+T | T, T -> T*F | F, F -> (E) | a"""
+    return GLC(['E', 'T', 'F'], ['+', '*', '(', ')', 'a'], 'E', [
+        Production('E', ['E', '+', 'T']),
+        Production('E', ['T']),
+        Production('T', ['T', '*', 'F']),
+        Production('T', ['F']),
+        Production('F', ['(', 'E', ')']),
+        Production('F', ['a']),
+    ])
+
+class TestGNFLeftCorner(unittest.TestCase):
+
+    def test_system_only_for_left_corners(self):
+        """Y[B][A] só é criado quando A alcança B pelos cantos à esquerda."""
+        glc = GLC(['S', 'A', 'B'], ['a', 'b'], 'S', [
+            Production('S', ['A', 'B']),
+            Production('A', ['a']),
+            Production('B', ['b']),
+        ])
+        system, y_vars = left_corner_system(glc)
+        self.assertEqual(len(y_vars), 1)
+        Y = y_vars[0]
+        rules = {repr(p) for p in system.productions}
+        self.assertIn(f"S -> a{Y}", rules)
+        self.assertIn(f"{Y} -> B", rules)
+
+    def test_rejects_non_cnf(self):
+        glc = GLC(['S'], ['a'], 'S', [Production('S', ['a', 'S', 'a'])])
+        with self.assertRaises(ValueError):
+            left_corner_system(glc)
+
+    def test_output_is_gnf(self):
+        gnf = left_corner_gnf(cnf_from_glc(left_recursive_grammar(), None))
+        for p in gnf.productions:
+            self.assertIn(p.rhs[0], gnf.alphabet, f"Não está em GNF: {p}")
+            for s in p.rhs[1:]:
+                self.assertNotIn(s, gnf.alphabet)
+
+    def test_same_language_as_classic(self):
+        """Os dois métodos reconhecem as mesmas palavras curtas."""
+        glc = left_recursive_grammar()
+        recognizers = [GNFRecognizer(gnf_from_glc(glc, None, gnf_method=m)) for m in GNF_METHODS]
+        for n in range(1, 6):
+            for word in itertools.product(glc.alphabet, repeat=n):
+                results = {r.recognize(list(word)) for r in recognizers}
+                self.assertEqual(len(results), 1, word)
+        self.assertTrue(recognizers[-1].recognize(list("(a+a)*a")))
+
+    def test_left_recursive_components(self):
+        """SCCs do grafo de cantos em ordem topológica, com o indicador de recursão."""
+        glc = GLC(['S', 'A', 'B', 'C'], ['a', 'b'], 'S', [
+            Production('S', ['A', 'C']),
+            Production('A', ['B', 'A']),
+            Production('B', ['A', 'B']),
+            Production('B', ['b']),
+            Production('C', ['C', 'C']),
+            Production('C', ['a']),
+        ])
+        self.assertEqual(left_corner_graph(glc)['S'], {'A'})
+        components = left_recursive_components(glc)
+        order = [v for component, _ in components for v in component]
+        self.assertLess(order.index('S'), order.index('A'))
+        self.assertEqual(order.index('B'), order.index('A') + 1)
+        flags = {tuple(c): r for c, r in components}
+        self.assertEqual(flags[('S',)], False)
+        self.assertEqual(flags[('A', 'B')], True)
+        self.assertEqual(flags[('C',)], True)
+
+    def test_no_substitution_without_left_recursion(self):
+        """Sem ciclo à esquerda, o laço de ordenação não substitui nada."""
+        glc = GLC(['S', 'A', 'B'], ['a', 'b'], 'S', [
+            Production('S', ['A', 'B']),
+            Production('A', ['B', 'B']),
+            Production('A', ['a']),
+            Production('B', ['b']),
+        ])
+        metrics = PipelineMetrics(substitutions=True)
+        gnf = gnf_from_glc(glc, None, metrics=metrics)
+        kinds = {r["kind"] for r in metrics.substitution_records}
+        self.assertNotIn("substitute", kinds)
+        self.assertNotIn("left-recursion", kinds)
+        for p in gnf.productions:
+            self.assertIn(p.rhs[0], gnf.alphabet)
+
+    def test_ordering_strategies(self):
+        """Toda estratégia respeita a ordem das componentes e preserva a linguagem."""
+        glc = left_recursive_grammar()
+        cnf_glc = cnf_from_glc(glc, None)
+        components = left_recursive_components(cnf_glc)
+        component_of = {v: k for k, (c, _) in enumerate(components) for v in c}
+        graph = left_corner_graph(cnf_glc)
+        words = ["a", "a+a", "(a)*a", "a*a+a", "(a+a)*(a)", "a+", "()"]
+        expected = [GNFRecognizer(gnf_from_glc(glc, None)).recognize(list(w)) for w in words]
+
+        for strategy in ORDERING_STRATEGIES:
+            order = variable_order(cnf_glc, strategy)
+            self.assertEqual(sorted(order), sorted(component_of))
+            rank = {v: k for k, v in enumerate(order)}
+            for A, successors in graph.items():
+                for B in successors:
+                    if component_of[A] != component_of[B]:
+                        self.assertLess(rank[A], rank[B], strategy)
+            gnf = gnf_from_glc(glc, None, gnf_order=strategy)
+            self.assertEqual([GNFRecognizer(gnf).recognize(list(w)) for w in words], expected, strategy)
+
+    def test_best_order_estimate(self):
+        """A estimativa acompanha o tamanho real da GNF, e best escolhe a menor saída real."""
+        glc = FAMILIES["many-variables"](12, 0)
+        cnf_glc = cnf_from_glc(glc, None)
+        real = {}
+        for strategy in ORDERING_STRATEGIES:
+            estimated = estimate_gnf_size(cnf_glc, variable_order(cnf_glc, strategy))
+            real[strategy] = gnf_from_glc(glc, None, gnf_order=strategy).production_count
+            self.assertLessEqual(real[strategy], estimated)
+            self.assertLessEqual(estimated, real[strategy] * 1.05)
+        # As ordens dão saídas bem diferentes (1289 contra 4115 produções)
+        self.assertLess(real["topological"] * 2, real["reverse-postorder"])
+        self.assertEqual(real["best"], min(real.values()))
+
+        with self.assertRaises(ValueError):
+            variable_order(cnf_glc, "nope")
+
+    def test_left_factor(self):
+        """Prefixos comuns viram uma variável F, sem produções vazias."""
+        glc = GLC(['A', 'B', 'C', 'D'], ['a', 'b'], 'A', [
+            Production('A', ['a', 'B', 'C']),
+            Production('A', ['a', 'B', 'D']),
+            Production('A', ['a', 'B']),
+            Production('A', ['b']),
+            Production('B', ['b']),
+            Production('C', ['a']),
+            Production('D', ['b']),
+        ])
+        factored = left_factor(glc)
+        rules = {repr(p) for p in factored.productions}
+        self.assertEqual(factored.variables[-1], 'F1')
+        self.assertTrue({"A -> aB", "A -> aBF1", "A -> b", "F1 -> C", "F1 -> D"} <= rules)
+        self.assertFalse(any(p.is_epsilon() for p in factored.productions))
+
+    def test_left_factor_keeps_language(self):
+        glc = left_recursive_grammar()
+        gnf = gnf_from_glc(glc, None)
+        factored = left_factor(gnf)
+        self.assertLess(sum(len(p.rhs) for p in factored.productions), sum(len(p.rhs) for p in gnf.productions))
+        cyk_gnf = CYKParser.from_grammar(gnf)
+        cyk_factored = CYKParser.from_grammar(factored)
+        words = ["a", "a+a", "(a)*a", "a*a+a", "(a+a)*(a)", "a+", "()"]
+        self.assertEqual(cyk_factored.recognize_many(words), cyk_gnf.recognize_many(words))
+
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            gnf_from_glc(left_recursive_grammar(), None, gnf_method="nope")
+
+if __name__ == '__main__':
+    unittest.main()
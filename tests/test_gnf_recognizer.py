@@ -0,0 +1,49 @@
+import unittest
+from models import GLC, Production
+from parser import parse_grammar
+from cyk import CYKParser
+from gnf_recognizer import GNFRecognizer
+
+def expr_grammar():
+    return parse_grammar(["E -> E+T | T", "T -> T*F | F", "F -> (E) | a"])
+
+class TestGNFRecognizer(unittest.TestCase):
+
+    def test_agrees_with_cyk(self):
+        """Mesma resposta que o CYK sobre a CNF da mesma gramática."""
+        glc = parse_grammar(["S -> aSb | SS | ab"])
+        gnf = GNFRecognizer.from_grammar(glc)
+        cyk = CYKParser.from_grammar(glc)
+        words = ["ab", "aabb", "abab", "aabbab", "", "a", "ba", "aab", "abba", "aaabbb"]
+        self.assertEqual(gnf.recognize_many(words), cyk.recognize_many(words))
+        self.assertEqual([gnf.recognize(w) for w in words], cyk.recognize_many(words))
+
+    def test_stream(self):
+        """Token a token, com volta de prefixo via truncate."""
+        stream = GNFRecognizer.from_grammar(expr_grammar()).stream()
+        for token in "(a+a":
+            self.assertTrue(stream.feed(token))
+        self.assertFalse(stream.accepted)
+        stream.feed(")")
+        self.assertTrue(stream.accepted)
+
+        self.assertFalse(stream.feed(")"))  # nenhuma continuação possível
+        stream.truncate(5)
+        self.assertTrue(stream.accepted)
+        self.assertTrue(stream.feed_text("*a"))
+        self.assertTrue(stream.accepted)
+        self.assertEqual("".join(stream.tokens), "(a+a)*a")
+
+    def test_long_input(self):
+        recognizer = GNFRecognizer.from_grammar(expr_grammar())
+        word = "+".join(["(a*a+a)"] * 200)
+        self.assertTrue(recognizer.recognize(word))
+        self.assertFalse(recognizer.recognize(word + "+"))
+
+    def test_rejects_non_gnf(self):
+        glc = GLC(["S", "A"], ["a"], "S", [Production("S", ["A", "a"]), Production("A", ["a"])])
+        with self.assertRaises(ValueError):
+            GNFRecognizer(glc)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from models import GLC, Production
+from models import GLC, Production, RhsTrie, SymbolTable, SYMBOLS
 
 class TestModels(unittest.TestCase):
 
@@ -30,6 +30,11 @@ class TestModels(unittest.TestCase):
         p_long = Production("S", ["A", "B"])
         self.assertFalse(p_long.is_unit())
 
+        # Com o conjunto de variáveis, o nome não precisa ser maiúsculo
+        variable_ids = {SYMBOLS.intern("S"), SYMBOLS.intern("expr")}
+        self.assertTrue(Production("S", ["expr"]).is_unit(variable_ids))
+        self.assertFalse(Production("S", ["X"]).is_unit(variable_ids))
+
     def test_glc_copy(self):
         """Testa se a cópia da GLC é profunda (deep copy) para produções."""
         p1 = Production("S", ["A"])
@@ -42,5 +47,135 @@ class TestModels(unittest.TestCase):
         self.assertEqual(glc.productions[0].rhs, ["A"])
         self.assertEqual(glc_copy.productions[0].rhs, ["B"])
 
+    def test_symbol_table_intern(self):
+        """Testa se cada símbolo recebe um id inteiro estável."""
+        table = SymbolTable()
+        a = table.intern("A")
+        b = table.intern("b")
+        self.assertNotEqual(a, b)
+        self.assertEqual(table.intern("A"), a)
+        self.assertEqual(table.name(b), "b")
+        self.assertEqual(table.decode(table.encode(["A", "b", "A"])), ["A", "b", "A"])
+        self.assertIsNone(table.lookup("Z"))
+
+    def test_symbol_table_scope(self):
+        """Símbolos internados dentro de scope() são esquecidos ao sair."""
+        table = SymbolTable()
+        a = table.intern("A")
+        with table.scope():
+            table.intern("Z1")
+            self.assertIn("Z1", table)
+        self.assertNotIn("Z1", table)
+        self.assertEqual(len(table), 1)
+        self.assertEqual(table.intern("A"), a)
+        self.assertEqual(table.intern("B"), 1)
+
+    def test_production_compact_storage(self):
+        """Testa se a produção guarda ids em tupla imutável e sem __dict__."""
+        p = Production("S", ["A", "b"])
+        self.assertFalse(hasattr(p, "__dict__"))
+        self.assertIsInstance(p.rhs_ids, tuple)
+        self.assertEqual(p.lhs_id, SYMBOLS.lookup("S"))
+        self.assertEqual(p.rhs, ["A", "b"])
+        self.assertEqual(p.key, Production("S", ["A", "b"]).key)
+
+    def test_glc_copy_shares_rhs(self):
+        """Testa se a cópia reaproveita as tuplas de corpo em vez de copiá-las."""
+        glc = GLC(["S"], ["a"], "S", [Production("S", ["a"])])
+        glc_copy = glc.copy()
+        self.assertIsNot(glc_copy.productions[0], glc.productions[0])
+        self.assertIs(glc_copy.productions[0].rhs_ids, glc.productions[0].rhs_ids)
+
+    def test_glc_production_index(self):
+        """Testa os índices por lado esquerdo, primeiro símbolo e ocorrência."""
+        p1 = Production("S", ["A", "B"])
+        p2 = Production("S", ["a"])
+        p3 = Production("A", ["B", "a"])
+        glc = GLC(["S", "A", "B"], ["a"], "S", [p1, p2, p3])
+
+        self.assertEqual(glc.productions_of("S"), [p1, p2])
+        self.assertEqual(glc.productions_of("B"), [])
+        self.assertEqual(glc.productions_starting_with("B"), [p3])
+        self.assertEqual(set(glc.occurrences_of("B")), {(p1, 1), (p3, 0)})
+
+    def test_glc_index_incremental_update(self):
+        """Testa se add/remove mantêm os índices já construídos."""
+        p1 = Production("S", ["A", "B"])
+        glc = GLC(["S", "A", "B"], ["a"], "S", [p1])
+        self.assertEqual(glc.productions_starting_with("A"), [p1])
+
+        p2 = Production("S", ["A", "a"])
+        glc.add_production(p2)
+        glc.remove_production(p1)
+
+        self.assertEqual(glc.productions, [p2])
+        self.assertEqual(glc.productions_starting_with("A"), [p2])
+        self.assertEqual(glc.occurrences_of("B"), [])
+        self.assertTrue(glc.has_production(Production("S", ["A", "a"])))
+        self.assertFalse(glc.has_production(Production("S", ["A", "B"])))
+    def test_glc_remove_productions_batch(self):
+        """Testa a remoção em lote, inclusive com cópias repetidas."""
+        p1 = Production("S", ["a"])
+        p2 = Production("S", ["a"])
+        p3 = Production("S", ["b"])
+        glc = GLC(["S"], ["a", "b"], "S", [p1, p2, p3])
+        self.assertEqual(len(glc.productions_starting_with("a")), 2)
+
+        glc.remove_productions([p1, p3])
+
+        self.assertEqual(glc.productions, [p2])
+        self.assertTrue(glc.has_production(p1))
+        self.assertEqual(glc.productions_starting_with("a"), [p2])
+        self.assertEqual(glc.productions_starting_with("b"), [])
+
+        glc.remove_productions([p2])
+        self.assertFalse(glc.has_production(p1))
+        self.assertEqual(glc.production_count, 0)
+
+    def test_glc_remove_production_by_value(self):
+        """Um objeto igual, mas não o mesmo, remove uma cópia; ausentes são ignorados."""
+        p1 = Production("S", ["a"])
+        p2 = Production("S", ["a"])
+        glc = GLC(["S"], ["a", "b"], "S", [p1, p2, Production("S", ["b"])])
+        glc.productions_starting_with("a")
+        glc.occurrences_of("a")
+
+        glc.remove_production(Production("S", ["a"]))
+        self.assertEqual(glc.production_count, 2)
+        self.assertTrue(glc.has_production(p1))
+        self.assertEqual(len(glc.productions_starting_with("a")), 1)
+
+        glc.remove_production(Production("S", ["a"]))
+        self.assertEqual([repr(p) for p in glc.productions], ["S -> b"])
+        self.assertFalse(glc.has_production(p1))
+        self.assertEqual(glc.productions_starting_with("a"), [])
+        self.assertEqual(glc.occurrences_of("a"), [])
+
+        glc.remove_productions([Production("S", ["a"]), Production("X", ["b"])])
+        self.assertEqual(glc.production_count, 1)
+        self.assertEqual(len(glc.productions), 1)
+
+    def test_rhs_trie(self):
+        """Prefixos compartilham nós; corpos repetidos não são inseridos de novo."""
+        bodies = [SYMBOLS.encode(b) for b in (["a", "B", "C"], ["a", "B", "D"], ["a", "B"], ["b"])]
+        trie = RhsTrie(bodies)
+        self.assertFalse(trie.add(bodies[0]))
+        self.assertEqual(len(trie), 4)
+        self.assertIn(bodies[2], trie)
+        self.assertNotIn(SYMBOLS.encode(["a"]), trie)
+        # Um corpo vem antes dos que o estendem; irmãos em ordem de inserção
+        self.assertEqual(list(trie), [bodies[2], bodies[0], bodies[1], bodies[3]])
+        # raiz, a, aB, aBC, aBD, b
+        self.assertEqual(trie.node_count(), 6)
+
+        # Percurso pela API pública: a -> B termina um corpo e se ramifica em C e D
+        (a, node_a), (b, node_b) = trie.children(trie.root)
+        self.assertEqual((a, b), (bodies[0][0], bodies[3][0]))
+        self.assertFalse(trie.ends_here(node_a))
+        self.assertTrue(trie.ends_here(node_b))
+        (_, node_aB), = trie.children(node_a)
+        self.assertTrue(trie.ends_here(node_aB))
+        self.assertEqual([s for s, _ in trie.children(node_aB)], [bodies[0][2], bodies[1][2]])
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 import os
-from parser import parse_set, parse_production, create_grammar
+from parser import parse_set, parse_production, parse_grammar, create_grammar, format_grammar, SymbolTrie
 
 class TestParser(unittest.TestCase):
 
@@ -57,5 +57,28 @@ class TestParser(unittest.TestCase):
             if os.path.exists(filename):
                 os.remove(filename)
 
+    def test_multichar_symbols(self):
+        """Símbolos declarados são lidos pelo casamento mais longo."""
+        trie = SymbolTrie(["C_1", "C_10", "T_1", "0"])
+        self.assertEqual(trie.tokenize("C_10T_1"), ["C_10", "T_1"])
+        self.assertEqual(trie.tokenize("C_1x0"), ["C_1", "x", "0"])
+
+        glc = parse_grammar([
+            "Variaveis = {S, Z1, T_1}",
+            "Alfabeto = {id, +}",
+            "S -> S+T_1 | Z1 id",
+            "Z1 -> id",
+            "T_1 -> +",
+        ])
+        self.assertEqual([p.rhs for p in glc.productions_of("S")], [["S", "+", "T_1"], ["Z1", "id"]])
+
+    def test_format_grammar_roundtrip(self):
+        """A gramática escrita por format_grammar é lida de volta igual."""
+        glc = parse_grammar(["C_10 -> T_1 C_2 | a", "T_1 -> a", "C_2 -> b | &"])
+        back = parse_grammar(format_grammar(glc).splitlines())
+        self.assertEqual(back.start, "C_10")
+        self.assertEqual(back.variables, glc.variables)
+        self.assertEqual([p.key for p in back.productions], [p.key for p in glc.productions])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+import unittest
+from models import GLC, Production
+from cnf import cnf_from_glc, estimate_empty_expansion, binarize_long_productions
+from gnf import gnf_from_glc
+from utils_budget import Budget, BudgetExceeded
+from benchmark import FAMILIES
+
+def nullable_grammar(n):
+    """S -> A A ... A (n vezes), A -> a | &: 2^n corpos na remoção de vazias."""
+    return GLC(['S', 'A'], ['a'], 'S', [
+        Production('S', ['A'] * n),
+        Production('A', ['a']),
+        Production('A', ['&']),
+    ])
+
+class TestUtilsBudget(unittest.TestCase):
+
+    def test_estimate_empty_expansion(self):
+        self.assertEqual(estimate_empty_expansion(nullable_grammar(4)), 2 ** 4 + 1)
+
+    def test_epsilon_aborts_before_expanding(self):
+        """A estimativa 2^k interrompe antes de gerar as produções."""
+        with self.assertRaises(BudgetExceeded) as ctx:
+            cnf_from_glc(nullable_grammar(20), None, budget=Budget(max_productions=1000))
+        e = ctx.exception
+        self.assertEqual(e.phase, "epsilon")
+        self.assertEqual(e.limit, "productions")
+        self.assertTrue(e.estimated)
+        self.assertEqual(e.to_dict()["productions"], 3)
+
+        # No modo bin a saída é linear e cabe no mesmo limite
+        cnf_from_glc(nullable_grammar(20), None, epsilon_mode="bin", budget=Budget(max_productions=1000))
+
+    def test_bin_mode_estimate(self):
+        """No modo bin a expansão também é estimada, sobre a gramática binarizada."""
+        glc = FAMILIES["dense-nullable"](10, 0)
+        estimated = estimate_empty_expansion(binarize_long_productions(glc))
+        with self.assertRaises(BudgetExceeded) as ctx:
+            cnf_from_glc(glc, None, epsilon_mode="bin", budget=Budget(max_productions=estimated - 1))
+        self.assertEqual(ctx.exception.phase, "epsilon")
+        self.assertTrue(ctx.exception.estimated)
+
+    def test_unit_closure_aborts_inside_loop(self):
+        """O fecho das unitárias para perto do limite, não depois de emitir tudo."""
+        glc = FAMILIES["unit-chain"](200, 0)
+        full = cnf_from_glc(glc, None)
+        with self.assertRaises(BudgetExceeded) as ctx:
+            cnf_from_glc(glc, None, budget=Budget(max_productions=5000))
+        e = ctx.exception
+        self.assertEqual(e.phase, "unit")
+        self.assertFalse(e.estimated)
+        self.assertLess(e.value, 6000)
+        self.assertLess(e.value, full.production_count)
+
+    def test_new_variables_and_reuse(self):
+        """O limite de variáveis novas aponta a fase; o Budget pode ser reutilizado."""
+        budget = Budget(max_new_variables=2)
+        with self.assertRaises(BudgetExceeded) as ctx:
+            gnf_from_glc(nullable_grammar(6), None, budget=budget)
+        self.assertEqual(ctx.exception.limit, "new_variables")
+        self.assertGreater(ctx.exception.variables_created, 2)
+
+        budget.max_new_variables = None
+        result = gnf_from_glc(nullable_grammar(3), None, budget=budget)
+        self.assertTrue(result.productions)
+
+    def test_seconds(self):
+        with self.assertRaises(BudgetExceeded) as ctx:
+            cnf_from_glc(nullable_grammar(3), None, budget=Budget(max_seconds=-1))
+        self.assertEqual(ctx.exception.limit, "seconds")
+
+if __name__ == '__main__':
+    unittest.main()
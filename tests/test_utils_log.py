@@ -0,0 +1,63 @@
+import unittest
+import os
+from models import GLC, Production
+from utils_log import (
+    StepLogger, FileSink, MemorySink, NullSink,
+    log_step, log_enabled,
+    LOG_OFF, LOG_SUMMARY, LOG_PHASE, LOG_SUBSTITUTION
+)
+
+class TestUtilsLog(unittest.TestCase):
+
+    def make_glc(self, rhs_list):
+        return GLC(['S'], ['a', 'b'], 'S', [Production('S', list(r)) for r in rhs_list])
+
+    def test_list_log_records_everything(self):
+        """Modo antigo (lista): todo passo é registrado, None não registra nada."""
+        log = []
+        log_step(log, "Passo", self.make_glc(['a']), LOG_SUBSTITUTION)
+        self.assertEqual(log[0], "==== Passo ====")
+        self.assertIn("  S -> a", log[1])
+
+        self.assertFalse(log_enabled(None))
+        log_step(None, "Passo", self.make_glc(['a']))
+
+    def test_step_logger_levels(self):
+        """Passos acima do nível configurado não são escritos."""
+        out = MemorySink()
+        log = StepLogger(out, LOG_SUMMARY)
+        log_step(log, "Original", self.make_glc(['a']), LOG_SUMMARY)
+        log_step(log, "Fase", self.make_glc(['b']), LOG_PHASE)
+
+        text = out.getvalue()
+        self.assertIn("==== Original ====", text)
+        self.assertNotIn("Fase", text)
+        self.assertFalse(StepLogger(out, LOG_OFF).enabled(LOG_SUMMARY))
+
+    def test_step_logger_delta(self):
+        """No modo delta só as produções adicionadas/removidas aparecem."""
+        out = MemorySink()
+        log = StepLogger(out, LOG_PHASE, delta=True)
+        log_step(log, "Antes", self.make_glc(['a', 'ab']))
+        log_step(log, "Depois", self.make_glc(['a', 'b']))
+
+        after = out.getvalue().split("==== Depois ====")[1]
+        self.assertIn("  - S -> ab", after)
+        self.assertIn("  + S -> b", after)
+        self.assertNotIn("S -> a\n", after)
+    def test_file_and_null_sinks(self):
+        """FileSink grava no arquivo; NullSink desliga o log por completo."""
+        filename = "temp_test_log.log"
+        try:
+            with FileSink(filename) as sink:
+                log_step(StepLogger(sink), "Passo", self.make_glc(['a']))
+            with open(filename, encoding="utf-8") as f:
+                self.assertIn("==== Passo ====", f.read())
+        finally:
+            if os.path.exists(filename):
+                os.remove(filename)
+
+        self.assertFalse(log_enabled(StepLogger(NullSink()), LOG_SUMMARY))
+
+if __name__ == '__main__':
+    unittest.main()
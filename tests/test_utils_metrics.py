@@ -0,0 +1,58 @@
+import unittest
+from models import GLC, Production
+from cnf import cnf_from_glc
+from gnf import gnf_from_glc
+from utils_metrics import PipelineMetrics
+
+def make_grammar():
+    return GLC(['S', 'A', 'B'], ['a', 'b'], 'S', [
+        Production('S', ['A', 'B', 'A']),
+        Production('S', ['S', 'a']),
+        Production('A', ['a', 'A']),
+        Production('A', ['&']),
+        Production('B', ['A']),
+        Production('B', ['b']),
+    ])
+
+class TestUtilsMetrics(unittest.TestCase):
+
+    def test_cnf_phases(self):
+        """Cada fase registra tempo e produções de entrada/saída encadeadas."""
+        glc = make_grammar()
+        metrics = PipelineMetrics()
+        result = cnf_from_glc(glc, None, metrics=metrics)
+
+        phases = [p["phase"] for p in metrics.phases]
+        self.assertEqual(phases, ["useless-initial", "epsilon", "unit", "useless", "terminals+binarize"])
+        self.assertEqual(metrics.input_productions, 6)
+        self.assertEqual(metrics.output_productions, len(result.productions))
+        self.assertEqual(metrics.phases[0]["productions_in"], 6)
+        for before, after in zip(metrics.phases, metrics.phases[1:]):
+            self.assertEqual(before["productions_out"], after["productions_in"])
+        self.assertGreater(metrics.phases[-1]["variables_created"], 0)
+        self.assertNotIn("peak_kb", metrics.phases[0])
+        self.assertNotIn("substitutions", metrics.to_dict())
+
+    def test_gnf_nested_pipeline_and_substitutions(self):
+        """A CNF interna entra no mesmo registro; substituições são opcionais."""
+        metrics = PipelineMetrics(track_memory=True, substitutions=True)
+        gnf_from_glc(make_grammar(), None, metrics=metrics)
+
+        phases = [p["phase"] for p in metrics.phases]
+        self.assertEqual(phases, ["useless-initial", "epsilon", "unit", "useless",
+                                  "terminals+binarize", "rename", "left-recursion", "back-substitution"])
+        self.assertEqual(metrics.input_productions, 6)
+        self.assertIn("peak_kb", metrics.phases[-1])
+        kinds = {r["kind"] for r in metrics.substitution_records}
+        self.assertIn("left-recursion", kinds)
+        self.assertIn("substitutions", metrics.to_dict())
+
+    def test_callbacks(self):
+        """on_phase recebe cada registro assim que a fase termina."""
+        seen = []
+        metrics = PipelineMetrics(on_phase=lambda r: seen.append(r["phase"]))
+        cnf_from_glc(make_grammar(), None, metrics=metrics)
+        self.assertEqual(seen, ["useless-initial", "epsilon", "unit", "useless", "terminals+binarize"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+"""
+Orçamentos das conversões: limites de produções, de variáveis novas e de
+tempo de parede, verificados a cada fase, a cada substituição da GNF e
+dentro dos laços que emitem produções (fecho das unitárias, expansões da
+GNF).
+
+Os pipelines recebem um `budget` opcional, no mesmo espírito do `metrics`:
+com None nada é verificado e as funções budget_* não fazem nada. Ao passar
+de um limite a conversão é interrompida com BudgetExceeded, que informa a
+fase e os tamanhos até ali, em vez de crescer até esgotar a memória.
+"""
+
+import time
+from typing import Dict, Optional
+
+
+class BudgetExceeded(Exception):
+    """Um limite do Budget foi ultrapassado (ou seria, pela estimativa)."""
+
+    def __init__(self, limit: str, phase: str, value, maximum, productions: int, variables_created: int,
+                 seconds: float, estimated: bool = False):
+        self.limit = limit
+        self.phase = phase
+        self.value = value
+        self.maximum = maximum
+        self.productions = productions
+        self.variables_created = variables_created
+        self.seconds = seconds
+        self.estimated = estimated
+        kind = "estimativa de " if estimated else ""
+        super().__init__(f"{kind}{limit} = {value} passa do limite {maximum} na fase {phase}")
+
+    def to_dict(self) -> Dict:
+        return {
+            "limit": self.limit,
+            "phase": self.phase,
+            "value": self.value,
+            "maximum": self.maximum,
+            "estimated": self.estimated,
+            "productions": self.productions,
+            "variables_created": self.variables_created,
+            "seconds": round(self.seconds, 6),
+        }
+
+
+class Budget:
+    """
+    Limites de uma conversão (None = sem limite).
+
+    - max_productions: produções na gramática de trabalho.
+    - max_new_variables: variáveis criadas além das da gramática original.
+    - max_seconds: tempo de parede desde o início do pipeline.
+    """
+
+    def __init__(self, max_productions: Optional[int] = None, max_new_variables: Optional[int] = None,
+                 max_seconds: Optional[float] = None):
+        self.max_productions = max_productions
+        self.max_new_variables = max_new_variables
+        self.max_seconds = max_seconds
+        self._depth = 0
+        self._started_at = None
+        self._initial_variables = 0
+
+    def start(self, glc):
+        """Início de um pipeline. Pipelines aninhados (CNF dentro da GNF) usam o mesmo relógio."""
+        self._depth += 1
+        if self._depth > 1:
+            return
+        self._started_at = time.perf_counter()
+        self._initial_variables = len(set(glc.variables))
+
+    def finish(self):
+        self._depth -= 1
+
+    def _exceeded(self, limit, phase, value, maximum, productions, glc, estimated=False):
+        created = max(0, len(glc.variables) - self._initial_variables)
+        # O erro encerra o pipeline: os próximos start() recomeçam do zero
+        self._depth = 0
+        return BudgetExceeded(limit, phase, value, maximum, productions, created,
+                              time.perf_counter() - self._started_at, estimated)
+
+    def check(self, phase: str, glc):
+        """Confere os três limites contra o estado atual de `glc`."""
+        productions = glc.production_count
+        if self.max_productions is not None and productions > self.max_productions:
+            raise self._exceeded("productions", phase, productions, self.max_productions, productions, glc)
+        if self.max_new_variables is not None:
+            created = len(glc.variables) - self._initial_variables
+            if created > self.max_new_variables:
+                raise self._exceeded("new_variables", phase, created, self.max_new_variables, productions, glc)
+        if self.max_seconds is not None:
+            elapsed = time.perf_counter() - self._started_at
+            if elapsed > self.max_seconds:
+                raise self._exceeded("seconds", phase, round(elapsed, 6), self.max_seconds, productions, glc)
+
+    def check_running(self, phase: str, glc, productions: int):
+        """
+        Dentro de um laço que emite produções: confere o total emitido até
+        aqui (`productions`) e o tempo, sem percorrer a gramática.
+        """
+        if self.max_productions is not None and productions > self.max_productions:
+            raise self._exceeded("productions", phase, productions, self.max_productions, productions, glc)
+        if self.max_seconds is not None:
+            elapsed = time.perf_counter() - self._started_at
+            if elapsed > self.max_seconds:
+                raise self._exceeded("seconds", phase, round(elapsed, 6), self.max_seconds, productions, glc)
+
+    def check_estimate(self, phase: str, glc, estimated_productions: int):
+        """Antes de rodar uma fase: aborta se a saída estimada já passa do limite."""
+        if self.max_productions is not None and estimated_productions > self.max_productions:
+            raise self._exceeded("productions", phase, estimated_productions, self.max_productions,
+                                 glc.production_count, glc, estimated=True)
+
+
+def budget_start(budget, glc):
+    if budget is not None:
+        budget.start(glc)
+
+
+def budget_finish(budget):
+    if budget is not None:
+        budget.finish()
+
+
+def budget_check(budget, phase: str, glc):
+    if budget is not None:
+        budget.check(phase, glc)
+
+
+def budget_check_running(budget, phase: str, glc, productions: int):
+    if budget is not None:
+        budget.check_running(phase, glc, productions)
+
+
+def budget_check_estimate(budget, phase: str, glc, estimated_productions: int):
+    if budget is not None:
+        budget.check_estimate(phase, glc, estimated_productions)
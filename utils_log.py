@@ -1,3 +1,17 @@
+# Níveis de log (cada nível inclui os anteriores)
+LOG_OFF = 0           # nada é registrado
+LOG_SUMMARY = 1       # gramática original e final
+LOG_PHASE = 2         # cada fase da conversão
+LOG_SUBSTITUTION = 3  # cada substituição/eliminação do laço da GNF
+
+LOG_LEVELS = {
+    "off": LOG_OFF,
+    "summary": LOG_SUMMARY,
+    "phase": LOG_PHASE,
+    "substitution": LOG_SUBSTITUTION,
+}
+
+
 def grammar_as_text(glc):
     lines = []
     lines.append(f"Start: {glc.start}")
@@ -8,7 +22,129 @@ def grammar_as_text(glc):
         lines.append("  " + repr(p))
     return "\n".join(lines)
 
-def log_step(log, title, glc):
+
+# ------------------ Destinos do log ------------------
+
+class FileSink:
+    """Grava o log direto em arquivo, com buffer, à medida que é produzido."""
+
+    def __init__(self, path: str, buffer_size: int = 1 << 16):
+        self._file = open(path, "w", encoding="utf-8", buffering=buffer_size)
+
+    def write(self, text: str):
+        self._file.write(text)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySink:
+    """Guarda o log em memória (útil em testes)."""
+
+    def __init__(self):
+        self._parts = []
+
+    def write(self, text: str):
+        self._parts.append(text)
+
+    def getvalue(self) -> str:
+        return "".join(self._parts)
+
+    @property
+    def lines(self):
+        return self.getvalue().splitlines()
+
+
+class NullSink:
+    """Descarta tudo; o StepLogger nem chega a formatar os passos."""
+
+    def write(self, text: str):
+        pass
+
+
+class StepLogger:
+    """
+    Log de passos com nível, escrito imediatamente em um destino (`sink`):
+    FileSink, MemorySink, NullSink ou qualquer objeto com write().
+
+    Com delta=True, só o primeiro passo traz a gramática completa; os
+    seguintes trazem apenas as produções adicionadas (+) e removidas (-).
+    """
+
+    def __init__(self, sink, level: int = LOG_PHASE, delta: bool = False):
+        self.out = sink
+        self.level = level
+        self.delta = delta
+        self._last_keys = None
+        self._last_variables = None
+
+    def enabled(self, level: int) -> bool:
+        return level <= self.level and not isinstance(self.out, NullSink)
+
+    def step(self, title, glc):
+        self.out.write("==== " + title + " ====\n")
+        if not self.delta or self._last_keys is None:
+            self._write_grammar(glc)
+        else:
+            self._write_delta(glc)
+
+        if self.delta:
+            self._last_keys = {p.key: p for p in glc.productions}
+            self._last_variables = list(glc.variables)
+
+    def _write_grammar(self, glc):
+        # Mesmo texto de grammar_as_text, mas produção a produção, sem montar
+        # uma string com a gramática inteira
+        write = self.out.write
+        write(f"Start: {glc.start}\n")
+        write("Variables: {" + ", ".join(glc.variables) + "}\n")
+        write("Alphabet: {" + ", ".join(glc.alphabet) + "}\n")
+        write("Productions:\n")
+        for p in glc.productions:
+            write("  " + repr(p) + "\n")
+        write("\n")
+
+    def _write_delta(self, glc):
+        current = {p.key: p for p in glc.productions}
+        added = [p for k, p in current.items() if k not in self._last_keys]
+        removed = [p for k, p in self._last_keys.items() if k not in current]
+
+        if list(glc.variables) != self._last_variables:
+            self.out.write("Variables: {" + ", ".join(glc.variables) + "}\n")
+        self.out.write(f"Productions: {len(current)} (+{len(added)} -{len(removed)})\n")
+        for p in removed:
+            self.out.write("  - " + repr(p) + "\n")
+        for p in added:
+            self.out.write("  + " + repr(p) + "\n")
+        self.out.write("\n")
+
+
+def log_enabled(log, level: int = LOG_PHASE) -> bool:
+    """Indica se um passo desse nível seria registrado (None = sem log)."""
+    if log is None:
+        return False
+    if isinstance(log, StepLogger):
+        return log.enabled(level)
+    return True
+
+
+def log_step(log, title, glc, level: int = LOG_PHASE):
+    """
+    Registra um passo. `log` pode ser None (nada é feito), uma lista (modo
+    antigo: tudo é acumulado) ou um StepLogger (respeita nível e delta).
+    O texto da gramática só é montado se o passo for de fato registrado.
+    """
+    if not log_enabled(log, level):
+        return
+    if isinstance(log, StepLogger):
+        log.step(title, glc)
+        return
     log.append("==== " + title + " ====")
     log.append(grammar_as_text(glc))
     log.append("")
@@ -0,0 +1,144 @@
+"""
+Métricas estruturadas das conversões: para cada fase, tempo, produções de
+entrada e saída, variáveis criadas e (opcionalmente) pico de memória; e,
+se pedido, cada substituição do laço da GNF.
+
+Os pipelines recebem um `metrics` opcional, no mesmo espírito do `log`:
+com None nada é medido e as funções metrics_* não fazem nada.
+"""
+
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+
+class PipelineMetrics:
+    """
+    Coletor de métricas de uma conversão.
+
+    - track_memory: mede o pico de memória de cada fase com tracemalloc
+      (deixa a conversão bem mais lenta).
+    - substitutions: registra cada substituição/eliminação da GNF.
+    - on_phase / on_substitution: chamados com o registro assim que ele é
+      produzido (ex.: para alertar quando a saída de uma fase explode).
+    """
+
+    def __init__(self, track_memory: bool = False, substitutions: bool = False,
+                 on_phase: Optional[Callable[[Dict], None]] = None,
+                 on_substitution: Optional[Callable[[Dict], None]] = None):
+        self.track_memory = track_memory
+        self.substitutions = substitutions
+        self.on_phase = on_phase
+        self.on_substitution = on_substitution
+        self.phases: List[Dict] = []
+        self.substitution_records: List[Dict] = []
+        self.input_productions = None
+        self.output_productions = None
+        self.seconds = 0.0
+        self._depth = 0
+        self._started_at = None
+        self._mark = None
+        self._sub_mark = None
+        self._last_productions = 0
+        self._last_variables = set()
+        self._own_tracemalloc = False
+
+    # ------------------ Ciclo de vida ------------------
+
+    def start(self, glc):
+        """Início de um pipeline. Pipelines aninhados (CNF dentro da GNF) só contam uma vez."""
+        self._depth += 1
+        if self._depth > 1:
+            return
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._own_tracemalloc = True
+        self.input_productions = glc.production_count
+        self._last_productions = self.input_productions
+        self._last_variables = set(glc.variables)
+        self._started_at = self._mark = self._sub_mark = time.perf_counter()
+
+    def finish(self, glc):
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        self.seconds = time.perf_counter() - self._started_at
+        self.output_productions = glc.production_count
+        if self._own_tracemalloc:
+            tracemalloc.stop()
+            self._own_tracemalloc = False
+
+    # ------------------ Registros ------------------
+
+    def phase(self, name: str, glc):
+        """Fecha a fase `name`, cuja saída é `glc`."""
+        now = time.perf_counter()
+        productions = glc.production_count
+        variables = set(glc.variables)
+        record = {
+            "phase": name,
+            "seconds": now - self._mark,
+            "productions_in": self._last_productions,
+            "productions_out": productions,
+            "variables_out": len(variables),
+            "variables_created": len(variables - self._last_variables),
+        }
+        if self.track_memory and tracemalloc.is_tracing():
+            record["peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.reset_peak()
+        self.phases.append(record)
+        self._last_productions = productions
+        self._last_variables = variables
+        if self.on_phase:
+            self.on_phase(record)
+        # O custo das contagens acima não entra na próxima fase
+        self._mark = self._sub_mark = time.perf_counter()
+
+    def substitution(self, kind: str, target: str, source: str, glc, created: int = 0):
+        """Uma substituição (ou eliminação de recursão) do laço da GNF."""
+        if not self.substitutions:
+            return
+        now = time.perf_counter()
+        record = {
+            "kind": kind,
+            "target": target,
+            "source": source,
+            "seconds": now - self._sub_mark,
+            "productions": glc.production_count,
+            "variables_created": created,
+        }
+        self.substitution_records.append(record)
+        if self.on_substitution:
+            self.on_substitution(record)
+        self._sub_mark = time.perf_counter()
+
+    def to_dict(self) -> Dict:
+        data = {
+            "seconds": self.seconds,
+            "productions_in": self.input_productions,
+            "productions_out": self.output_productions,
+            "phases": self.phases,
+        }
+        if self.substitutions:
+            data["substitutions"] = self.substitution_records
+        return data
+
+
+def metrics_start(metrics, glc):
+    if metrics is not None:
+        metrics.start(glc)
+
+
+def metrics_finish(metrics, glc):
+    if metrics is not None:
+        metrics.finish(glc)
+
+
+def metrics_phase(metrics, name: str, glc):
+    if metrics is not None:
+        metrics.phase(name, glc)
+
+
+def metrics_substitution(metrics, kind: str, target: str, source: str, glc, created: int = 0):
+    if metrics is not None and metrics.substitutions:
+        metrics.substitution(kind, target, source, glc, created)